@@ -0,0 +1 @@
+"""Micro-benchmarks. Run from the project root, e.g. ``python -m benchmarks.bench_audit_query``."""
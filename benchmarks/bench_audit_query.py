@@ -0,0 +1,96 @@
+"""
+Compare full-scan audit queries (legacy audit_logs.json array) with the
+indexed segment store at several log sizes.
+
+    python -m benchmarks.bench_audit_query --sizes 10000,100000,1000000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from utils.audit import AuditLogger
+
+
+EVENT_TYPES = ["contract_uploaded", "risk_analysis", "compliance_check", "report_generated", "data_access", "error"]
+
+
+def make_events(count: int, sessions: int = 500):
+    rng = random.Random(42)
+    for i in range(count):
+        event = rng.choice(EVENT_TYPES)
+        yield {
+            "id": f"{i:012x}",
+            "timestamp": f"2026-{1 + i * 12 // count:02d}-01T00:00:{i % 60:02d}.{i:06d}Z",
+            "session_id": f"s{rng.randrange(sessions):05d}",
+            "event": event,
+            "severity": "ERROR" if event == "error" else "INFO",
+            "user": "anonymous",
+            "payload": {"filename": f"contract_{i}.pdf", "size_bytes": rng.randrange(10_000, 500_000)},
+        }
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def full_scan(path: str, filters: dict):
+    with open(path, "r", encoding="utf-8") as f:
+        logs = json.load(f)
+    if "event_type" in filters:
+        logs = [log for log in logs if log.get("event") == filters["event_type"]]
+    if "session_id" in filters:
+        logs = [log for log in logs if log.get("session_id") == filters["session_id"]]
+    return len(logs), logs[-20:]
+
+
+def run(size: int, workdir: str):
+    legacy_path = os.path.join(workdir, f"legacy_{size}.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump(list(make_events(size)), f)
+
+    audit = AuditLogger(os.path.join(workdir, f"indexed_{size}.json"), fsync="never")
+    start = time.perf_counter()
+    for entry in make_events(size):
+        audit.store.append(entry)
+    append_s = time.perf_counter() - start
+    start = time.perf_counter()
+    audit.index.sync()
+    build_s = time.perf_counter() - start
+
+    queries = {
+        "event_type": {"event_type": "error"},
+        "session_id": {"session_id": "s00042"},
+    }
+    print(f"\n{size:,} events (append {size / append_s:,.0f} ev/s, index build {build_s:.2f}s)")
+    print(f"  {'filter':<12} {'full scan':>12} {'indexed':>12} {'speedup':>9}")
+    for name, filters in queries.items():
+        scan_s = timed(lambda: full_scan(legacy_path, filters), repeat=1 if size >= 1_000_000 else 3)
+        indexed_s = timed(lambda: (audit.count_events(filters), audit.query_events(filters, limit=20, newest_first=True)))
+        print(f"  {name:<12} {scan_s * 1000:>10.1f}ms {indexed_s * 1000:>10.1f}ms {scan_s / indexed_s:>8.0f}x")
+    audit.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="audit_bench_")
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            run(size, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
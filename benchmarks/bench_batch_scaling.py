@@ -0,0 +1,52 @@
+"""
+Files per second for BatchProcessor with 1, 2, 4 and 8 workers on a folder of
+generated text contracts.
+
+    python -m benchmarks.bench_batch_scaling --files 400 --mode process
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from contract_parser.batch_processor import MODES, BatchProcessor
+
+
+def make_contracts(directory: str, count: int, seed: int = 11):
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        paragraphs = [p for p in f.read().split("\n\n") if p.strip()]
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"contract_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(rng.choice(paragraphs) for _ in range(rng.randint(20, 80))))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--mode", choices=MODES[:2], default="process")
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_contracts(directory, args.files)
+        print(f"{len(paths):,} files, {args.mode} mode, {os.cpu_count()} CPUs")
+        print(f"  {'workers':>7} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            processor = BatchProcessor(workers=workers, mode=args.mode)
+            start = time.perf_counter()
+            for _ in processor.iter_results(paths):
+                pass
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"  {workers:>7} {elapsed:>9.2f} {len(paths) / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Memory held by the clause results of one analyzed contract: a list of clause
+dicts (as the app used to build) against ClauseResults.
+
+    python -m benchmarks.bench_clause_results --copies 200
+"""
+import argparse
+import gc
+import tracemalloc
+
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.clause_results import ClauseResults
+from contract_parser.segmentation import segment_clauses
+
+
+def clause_dicts(document: str, assessor: AdvancedRiskAssessor):
+    results = []
+    for clause in segment_clauses(document):
+        detailed = assessor.score_clause_detailed(clause.text)
+        results.append({
+            "id": clause.index,
+            "text": clause.text[:100] + "...",
+            "full_text": clause.text,
+            "risk": detailed["overall_risk"],
+            "issues": detailed["detailed_issues"],
+            "ambiguities": assessor.detect_ambiguities(clause.text),
+        })
+    return results
+
+
+def retained_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=200, help="copies of the sample contract in the document")
+    args = parser.parse_args()
+
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        document = f.read() * args.copies
+    assessor = AdvancedRiskAssessor()
+    clauses = sum(1 for _ in segment_clauses(document))
+
+    before = retained_bytes(lambda: clause_dicts(document, assessor))
+    after = retained_bytes(lambda: ClauseResults.score(document, assessor))
+    print(f"{clauses:,} clauses, {len(document):,} chars (document itself not counted)")
+    print(f"  clause dicts   {before / 1024:>10,.0f} KiB  {before / clauses:>7,.0f} B/clause")
+    print(f"  ClauseResults  {after / 1024:>10,.0f} KiB  {after / clauses:>7,.0f} B/clause  ({before / after:.0f}x less)")
+
+
+if __name__ == "__main__":
+    main()
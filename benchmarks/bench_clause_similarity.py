@@ -0,0 +1,89 @@
+"""
+Recall and speed of the MinHash/LSH ClauseIndex against a full
+SequenceMatcher scan (ClauseSimilarity.find_similar_clauses), matching every
+clause of generated contracts against a generated clause library.
+
+    python -m benchmarks.bench_clause_similarity --library 3000 --queries 100
+"""
+import argparse
+import random
+import time
+
+from contract_parser.advanced_nlp import ClauseSimilarity
+from contract_parser.segmentation import clause_texts
+from contract_parser.similarity_index import ClauseIndex
+from contract_parser.template_generator import TemplateGenerator
+
+
+def base_clauses():
+    clauses = []
+    for template in TemplateGenerator.TEMPLATES.values():
+        for section in template["sections"]:
+            clauses.extend(section["clauses"])
+    for alternative in TemplateGenerator.ALTERNATIVE_CLAUSES.values():
+        clauses.extend(line.split(": ", 1)[-1].strip("'") for line in alternative)
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        clauses.extend(clause_texts(f.read()))
+    return clauses
+
+
+def mutate(clause: str, rng: random.Random, vocabulary, rate: float) -> str:
+    """Replace, drop or insert about ``rate`` of the words."""
+    words = []
+    for word in clause.split():
+        roll = rng.random()
+        if roll < rate / 3:
+            words.append(rng.choice(vocabulary))
+        elif roll < 2 * rate / 3:
+            continue
+        elif roll < rate:
+            words.extend([word, rng.choice(vocabulary)])
+        else:
+            words.append(word)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--library", type=int, default=3000, help="clauses in the library")
+    parser.add_argument("--queries", type=int, default=100, help="contract clauses to match")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    seeds = base_clauses()
+    vocabulary = sorted({w for clause in seeds for w in clause.split()})
+    library = [mutate(rng.choice(seeds), rng, vocabulary, rng.uniform(0, 0.6)) for _ in range(args.library)]
+    queries = [mutate(rng.choice(library), rng, vocabulary, rng.uniform(0, 0.4)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = ClauseIndex(library)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = index.query_many(queries, args.threshold)
+    lsh = time.perf_counter() - start
+
+    similarity = ClauseSimilarity(args.threshold)
+    start = time.perf_counter()
+    expected = [similarity.find_similar_clauses(query, library) for query in queries]
+    scan = time.perf_counter() - start
+
+    expected_pairs = {(i, m["template_clause"]) for i, matches in enumerate(expected) for m in matches}
+    found_pairs = {(i, m["template_clause"]) for i, matches in enumerate(found) for m in matches}
+    recall = len(expected_pairs & found_pairs) / len(expected_pairs) if expected_pairs else 1.0
+    top_hits = sum(1 for e, f in zip(expected, found) if e and f and e[0]["similarity_score"] == f[0]["similarity_score"])
+    with_matches = sum(1 for e in expected if e)
+    candidates = sum(len(index.candidates(query)) for query in queries) / len(queries)
+
+    print(f"{len(library):,} library clauses, {len(queries):,} queries, threshold {args.threshold}")
+    print(f"  index build        {build:>8.2f} s")
+    print(f"  SequenceMatcher    {scan:>8.2f} s  {len(queries) / scan:>9,.1f} queries/s")
+    print(f"  ClauseIndex        {lsh:>8.2f} s  {len(queries) / lsh:>9,.1f} queries/s  ({scan / lsh:.0f}x)")
+    print(f"  candidates/query   {candidates:>8.1f}")
+    print(f"  recall (pairs)     {recall:>8.1%}  ({len(expected_pairs):,} matching pairs)")
+    print(f"  best match found   {top_hits}/{with_matches}")
+
+
+if __name__ == "__main__":
+    main()
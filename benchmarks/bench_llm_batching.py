@@ -0,0 +1,56 @@
+"""
+Requests and prompt tokens (estimated) needed to explain every high-risk
+clause of a contract, one clause per request against batched requests.
+The model is a local stand-in that answers instantly, so only the request
+shapes are measured.
+
+    python -m benchmarks.bench_llm_batching --copies 20
+"""
+import argparse
+import json
+from types import SimpleNamespace
+
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.clause_results import ClauseResults
+from contract_parser.llm_client import LLMClient
+from contract_parser.summarization import estimate_tokens
+
+
+class CountingModel:
+    """Answers single prompts with text and batched prompts with a JSON array."""
+
+    model_name = "counting-model"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        self.prompts.append(prompt)
+        if "Clauses (JSON):" in prompt:
+            items = json.loads(prompt.split("Clauses (JSON):\n", 1)[1])
+            return SimpleNamespace(text=json.dumps([{"id": item["id"], "explanation": "..."} for item in items]))
+        return SimpleNamespace(text="...")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=20, help="copies of the sample contract in the document")
+    parser.add_argument("--batch-tokens", type=int, default=3000)
+    args = parser.parse_args()
+
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        document = f.read() * args.copies
+    results = ClauseResults.score(document, AdvancedRiskAssessor())
+    clauses = [r.full_text for r in results if r.risk == "High"]
+
+    print(f"{len(clauses):,} high-risk clauses ({sum(estimate_tokens(c) for c in clauses):,} clause tokens)")
+    for label, batched in (("one per request", False), ("batched", True)):
+        model = CountingModel()
+        llm = LLMClient(model=model, requests_per_minute=1e9, cache=None, batch_tokens=args.batch_tokens)
+        llm.explain_clauses(clauses, batched=batched)
+        tokens = sum(estimate_tokens(p) for p in model.prompts)
+        print(f"  {label:<16} {len(model.prompts):>6,} requests  {tokens:>9,} prompt tokens")
+
+
+if __name__ == "__main__":
+    main()
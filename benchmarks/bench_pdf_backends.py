@@ -0,0 +1,64 @@
+"""
+Pages per second for each PDF text backend, and how closely its text matches
+pdfplumber's, on generated contract PDFs of increasing length.
+
+    python -m benchmarks.bench_pdf_backends --pages 5,20,100 --docs 3
+"""
+import argparse
+import difflib
+import io
+import random
+import time
+
+from fpdf import FPDF
+
+from contract_parser.parsers import PDF_BACKENDS, PdfPlumberBackend
+
+
+def make_pdf(pages: int, seed: int) -> bytes:
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        paragraphs = [" ".join(p.split()) for p in f.read().split("\n\n") if p.strip()]
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=10)
+    for number in range(1, pages + 1):
+        pdf.add_page()
+        pdf.set_font("Helvetica", style="B", size=12)
+        pdf.cell(0, 8, f"Schedule {number}", new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("Helvetica", size=10)
+        for _ in range(rng.randint(3, 6)):
+            paragraph = rng.choice(paragraphs).encode("latin-1", "ignore").decode("latin-1")
+            pdf.multi_cell(0, 5, paragraph, new_x="LMARGIN", new_y="NEXT")
+            pdf.ln(2)
+    return bytes(pdf.output())
+
+
+def similarity(reference: str, text: str) -> float:
+    """Word-sequence similarity (0-1), insensitive to line wrapping and spacing."""
+    return difflib.SequenceMatcher(None, reference.split(), text.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="5,20,100")
+    parser.add_argument("--docs", type=int, default=3, help="documents per size")
+    args = parser.parse_args()
+
+    print(f"backends: {', '.join(PDF_BACKENDS)}")
+    print(f"  {'pages':>5} {'backend':<12} {'pages/s':>9} {'similarity':>11}")
+    for pages in [int(n) for n in args.pages.split(",")]:
+        corpus = [make_pdf(pages, seed) for seed in range(args.docs)]
+        reference = {}
+        for name, backend in PDF_BACKENDS.items():
+            texts, start = [], time.perf_counter()
+            for data in corpus:
+                texts.append("\n".join(backend.page_texts(io.BytesIO(data))))
+            rate = pages * len(corpus) / (time.perf_counter() - start)
+            if backend is PdfPlumberBackend:
+                reference = texts
+            score = sum(similarity(r, t) for r, t in zip(reference, texts)) / len(texts)
+            print(f"  {pages:>5} {name:<12} {rate:>9,.1f} {score:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
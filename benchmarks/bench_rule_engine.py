@@ -0,0 +1,70 @@
+"""
+Clauses per second for RiskAssessor.score_clause and
+AdvancedRiskAssessor.score_clause_detailed, before (one IGNORECASE regex
+search per rule) and after (RuleEngine).
+
+    python -m benchmarks.bench_rule_engine --clauses 20000
+"""
+import argparse
+import random
+import re
+import time
+
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.risk_assessor import RiskAssessor
+
+
+def make_clauses(count: int, seed: int = 7):
+    with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+        vocabulary = f.read().split()
+    vocabulary += ["the", "of", "and", "party", "shall", "within", "days", "written", "notice", "agreement"] * 10
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(10, 120))) for _ in range(count)]
+
+
+def legacy_score_clause(assessor: RiskAssessor, clause: str):
+    weights = {"Low": 1, "Medium": 2, "High": 3}
+    reasons, max_score = [], 0
+    for pattern, level, reason in assessor.rules:
+        if pattern.search(clause):
+            reasons.append(reason)
+            max_score = max(max_score, weights[level])
+    if re.search(r"\b(liquidated damages|damages|penalty)\b", clause, re.I):
+        max_score = max(max_score, 3)
+    return max_score, reasons
+
+
+def legacy_score_clause_detailed(assessor: AdvancedRiskAssessor, clause: str):
+    return [rule["name"] for rule in assessor.detailed_rules if re.search(rule["pattern"], clause, re.IGNORECASE)]
+
+
+def rate(fn, clauses) -> float:
+    fn(clauses[0])
+    start = time.perf_counter()
+    for clause in clauses:
+        fn(clause)
+    return len(clauses) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clauses", type=int, default=20000)
+    args = parser.parse_args()
+
+    clauses = make_clauses(args.clauses)
+    basic, advanced = RiskAssessor(), AdvancedRiskAssessor()
+
+    cases = [
+        ("RiskAssessor.score_clause", lambda c: legacy_score_clause(basic, c), basic.score_clause),
+        ("AdvancedRiskAssessor.score_clause_detailed", lambda c: legacy_score_clause_detailed(advanced, c), advanced.score_clause_detailed),
+    ]
+    print(f"{len(clauses):,} clauses")
+    print(f"  {'':<45} {'before':>12} {'after':>12} {'speedup':>8}")
+    for name, before, after in cases:
+        after_rate = rate(after, clauses)
+        before_rate = rate(before, clauses)
+        print(f"  {name:<45} {before_rate:>10,.0f}/s {after_rate:>10,.0f}/s {after_rate / before_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cost of the stage timers: a full analysis of the sample contract with timing
+off and on, and the per-call overhead of a ``@timed`` function in both modes.
+
+    python -m benchmarks.bench_stage_timing --copies 20 --repeat 5
+"""
+import argparse
+import time
+
+from contract_parser.advanced_nlp import EntityExtractor
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.analysis_session import AnalysisSession
+from contract_parser.compliance_checker import ComplianceChecker
+from utils.profiling import timed, timer
+
+CALLS = 200_000
+
+
+def analyze(data: bytes, assessor: AdvancedRiskAssessor):
+    session = AnalysisSession(data, "contract.txt", risk_assessor=assessor, entity_extractor=EntityExtractor(),
+                              compliance_checker=ComplianceChecker())
+    for stage in ("classification", "entities", "clause_results", "compliance_report", "clause_classes"):
+        getattr(session, stage)
+
+
+def noop():
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=20, help="copies of the sample contract in the document")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open("data/sample_contract_en.txt", "rb") as f:
+        data = f.read() * args.copies
+    assessor = AdvancedRiskAssessor()
+    analyze(data, assessor)  # warm up
+    wrapped = timed("noop")(noop)
+
+    enabled = timer.enabled
+    try:
+        for label, on in (("timing off", False), ("timing on", True)):
+            timer.enabled = on
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                analyze(data, assessor)
+                best = min(best, time.perf_counter() - start)
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                wrapped()
+            per_call = (time.perf_counter() - start) / CALLS
+            print(f"  {label:<11} analysis {best * 1000:>8.1f} ms   @timed call {per_call * 1e9:>6.0f} ns")
+    finally:
+        timer.enabled = enabled
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        noop()
+    print(f"  {'plain call':<11} {'':>20}   {(time.perf_counter() - start) / CALLS * 1e9:>19.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Contract Parser Package
 Comprehensive contract analysis using NLP, risk assessment, and compliance checking.
 """
 
-from .parsers import parse_file
+from .parsers import parse_file, iter_chunks, TextChunk
 from .nlp import ContractNLP
 from .risk_assessor import RiskAssessor
 from .advanced_nlp import (
@@ -11,6 +11,7 @@ from .advanced_nlp import (
     ClauseSimilarity,
     ContractClassifier,
     EntityExtractor,
+    DocumentContext,
 )
 from .advanced_risk_assessor import AdvancedRiskAssessor
 from .compliance_checker import ComplianceChecker
@@ -22,12 +23,15 @@ __author__ = "Contract Analysis Bot Team"
 
 __all__ = [
     "parse_file",
+    "iter_chunks",
+    "TextChunk",
     "ContractNLP",
     "RiskAssessor",
     "HindiNormalizer",
     "ClauseSimilarity",
     "ContractClassifier",
     "EntityExtractor",
+    "DocumentContext",
     "AdvancedRiskAssessor",
     "ComplianceChecker",
     "TemplateGenerator",
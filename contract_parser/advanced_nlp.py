@@ -1,6 +1,12 @@
 import re
+import hashlib
+from collections import OrderedDict
+from threading import Lock
 from typing import List, Dict, Tuple
 from difflib import SequenceMatcher
+from contract_parser.keyword_index import keyword_index
+from contract_parser.similarity_index import ClauseIndex
+from utils.profiling import timed
 import nltk
 from nltk.tokenize import sent_tokenize
 
@@ -10,6 +16,64 @@ except LookupError:
     nltk.download('punkt', quiet=True)
 
 
+def split_sentences(text: str) -> List[str]:
+    """NLTK sentence segmentation, or a punctuation split if punkt is unavailable."""
+    try:
+        return sent_tokenize(text)
+    except LookupError:
+        return [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s]
+
+
+class DocumentContext:
+    """Per-document analysis state shared by the extractors.
+
+    Sentences are segmented once per document, and extractors can memoize
+    their own results on the context. Contexts are cached by content hash, so
+    every extractor called on the same text reuses them.
+    """
+
+    CACHE_SIZE = 32
+    _cache: "OrderedDict[str, DocumentContext]" = OrderedDict()
+    _cache_lock = Lock()
+
+    def __init__(self, text: str, digest: str = None):
+        self.text = text
+        self.digest = digest or self.content_hash(text)
+        self.results: Dict = {}
+        self._sentences = None
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @classmethod
+    def for_text(cls, text: str) -> "DocumentContext":
+        """Cached context for the text."""
+        digest = cls.content_hash(text)
+        with cls._cache_lock:
+            context = cls._cache.get(digest)
+            if context is not None:
+                cls._cache.move_to_end(digest)
+                return context
+        context = cls(text, digest)
+        with cls._cache_lock:
+            cls._cache[digest] = context
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return context
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @property
+    def sentences(self) -> List[str]:
+        if self._sentences is None:
+            self._sentences = split_sentences(self.text)
+        return self._sentences
+
+
 class HindiNormalizer:
     """Handles Hindi to English transliteration and normalization for multilingual contracts."""
 
@@ -51,8 +115,13 @@ class ClauseSimilarity:
     def find_similar_clauses(self, clause: str, template_clauses: List[str]) -> List[Dict]:
         """Find similar clauses from a template."""
         results = []
+        matcher = SequenceMatcher(None, clause.lower())
         for tmpl_clause in template_clauses:
-            score = self.similarity_score(clause, tmpl_clause)
+            matcher.set_seq2(tmpl_clause.lower())
+            # cheap upper bounds of ratio() first
+            if matcher.real_quick_ratio() < self.threshold or matcher.quick_ratio() < self.threshold:
+                continue
+            score = matcher.ratio()
             if score >= self.threshold:
                 results.append({
                     "template_clause": tmpl_clause,
@@ -60,6 +129,16 @@ class ClauseSimilarity:
                 })
         return sorted(results, key=lambda x: x["similarity_score"], reverse=True)
 
+    @staticmethod
+    def build_index(template_clauses: List[str]) -> ClauseIndex:
+        """MinHash/LSH index of a clause library, for ``find_similar_clauses_bulk``."""
+        return ClauseIndex(template_clauses)
+
+    def find_similar_clauses_bulk(self, clauses: List[str], index: ClauseIndex) -> List[List[Dict]]:
+        """``find_similar_clauses`` for every clause of a contract against an
+        indexed library, comparing each clause only with LSH candidates."""
+        return index.query_many(clauses, self.threshold)
+
 
 class ContractClassifier:
     """Classify contract type based on content."""
@@ -74,12 +153,13 @@ class ContractClassifier:
     }
 
     @classmethod
+    @timed("classification")
     def classify(cls, text: str) -> Dict:
         """Classify the contract type."""
-        text_lower = text.lower()
+        keywords = keyword_index(text)
         scores = {}
-        for ctype, keywords in cls.TYPES.items():
-            count = sum(text_lower.count(kw) for kw in keywords)
+        for ctype, type_keywords in cls.TYPES.items():
+            count = sum(keywords.count(kw) for kw in type_keywords)
             scores[ctype] = count
         if not any(scores.values()):
             return {"type": "unknown", "confidence": 0}
@@ -92,6 +172,7 @@ class EntityExtractor:
     """Advanced NER for legal contracts."""
 
     @staticmethod
+    @timed("entities.parties")
     def extract_parties(text: str) -> List[str]:
         """Extract party names."""
         parties = []
@@ -105,6 +186,7 @@ class EntityExtractor:
         return list(set(p for p in parties if len(p) > 3))
 
     @staticmethod
+    @timed("entities.dates")
     def extract_dates(text: str) -> List[str]:
         """Extract dates from text."""
         date_patterns = [
@@ -118,6 +200,7 @@ class EntityExtractor:
         return list(set(dates))
 
     @staticmethod
+    @timed("entities.amounts")
     def extract_amounts(text: str) -> List[Dict]:
         """Extract monetary amounts."""
         amounts = []
@@ -174,35 +257,40 @@ class EntityExtractor:
                 payments.append({"term": match.strip(), "type": term_type})
         return payments
 
-    @staticmethod
-    def extract_obligations(text: str) -> List[str]:
+    MODALITY_KEYWORDS = {
+        "obligations": ["shall", "must", "required to", "obliged to", "responsible for"],
+        "rights": ["right to", "entitled to", "may", "permitted to", "may choose"],
+        "prohibitions": ["shall not", "cannot", "prohibited", "no right to", "not permitted"],
+    }
+    MODALITY_LIMIT = 50
+
+    @classmethod
+    def extract_modalities(cls, text: str) -> Dict[str, List[str]]:
+        """Extract obligation, right and prohibition sentences in one pass."""
+        context = DocumentContext.for_text(text)
+        modalities = context.results.get("modalities")
+        if modalities is None:
+            modalities = {kind: [] for kind in cls.MODALITY_KEYWORDS}
+            for sent in context.sentences:
+                sent_lower = sent.lower()
+                for kind, keywords in cls.MODALITY_KEYWORDS.items():
+                    found = modalities[kind]
+                    if len(found) < cls.MODALITY_LIMIT and any(kw in sent_lower for kw in keywords):
+                        found.append(sent.strip())
+            context.results["modalities"] = modalities
+        return {kind: list(found) for kind, found in modalities.items()}
+
+    @classmethod
+    def extract_obligations(cls, text: str) -> List[str]:
         """Extract obligation phrases."""
-        obligations = []
-        keywords = ["shall", "must", "required to", "obliged to", "responsible for"]
-        sentences = sent_tokenize(text)
-        for sent in sentences:
-            if any(kw in sent.lower() for kw in keywords):
-                obligations.append(sent.strip())
-        return obligations[:50]  # limit to first 50
+        return cls.extract_modalities(text)["obligations"]
 
-    @staticmethod
-    def extract_rights(text: str) -> List[str]:
+    @classmethod
+    def extract_rights(cls, text: str) -> List[str]:
         """Extract rights phrases."""
-        rights = []
-        keywords = ["right to", "entitled to", "may", "permitted to", "may choose"]
-        sentences = sent_tokenize(text)
-        for sent in sentences:
-            if any(kw in sent.lower() for kw in keywords):
-                rights.append(sent.strip())
-        return rights[:50]
+        return cls.extract_modalities(text)["rights"]
 
-    @staticmethod
-    def extract_prohibitions(text: str) -> List[str]:
+    @classmethod
+    def extract_prohibitions(cls, text: str) -> List[str]:
         """Extract prohibition phrases."""
-        prohibitions = []
-        keywords = ["shall not", "cannot", "prohibited", "no right to", "not permitted"]
-        sentences = sent_tokenize(text)
-        for sent in sentences:
-            if any(kw in sent.lower() for kw in keywords):
-                prohibitions.append(sent.strip())
-        return prohibitions[:50]
+        return cls.extract_modalities(text)["prohibitions"]
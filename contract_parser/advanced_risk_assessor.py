@@ -1,10 +1,52 @@
 from typing import List, Dict, Tuple
 import re
+from contract_parser.rule_engine import RuleEngine
 
 
 class AdvancedRiskAssessor:
     """Enhanced risk assessor with detailed scoring, ambiguity detection, and recommendations."""
 
+    AMBIGUITY_RULES = [
+        # Undefined "best efforts"
+        {
+            "pattern": r"best efforts|commercially reasonable",
+            "type": "Undefined Standard",
+            "phrase": "best efforts / commercially reasonable",
+            "problem": "Not defined; open to interpretation",
+            "suggestion": "Define explicitly: 'using reasonable efforts consistent with industry standards'",
+        },
+        # Time references without specificity
+        {
+            "pattern": r"\bsoon\b|\basap\b|promptly|immediately",
+            "type": "Vague Timeline",
+            "phrase": "soon / ASAP / promptly",
+            "problem": "No specific timeframe given",
+            "suggestion": "Specify: 'within [X] days' or 'within [X] business days'",
+        },
+        # Conditional obligations without clarity
+        {
+            "pattern": r"if.*then|subject to|depending on|as applicable",
+            "type": "Conditional Obligation",
+            "phrase": "if-then / subject to",
+            "problem": "Conditions may be ambiguous or too flexible",
+            "suggestion": "Clearly specify all conditions and consequences",
+        },
+    ]
+
+    # issues not raised by a pattern rule
+    LONG_CLAUSE_ISSUE = {
+        "name": "Overly Long Clause",
+        "risk_level": "Low",
+        "reason": "Clause is unusually long; may contain multiple obligations",
+        "recommendation": "Break into sub-clauses for clarity",
+    }
+    QUOTED_TERMS_ISSUE = {
+        "name": "Many Quoted Terms",
+        "risk_level": "Low",
+        "reason": "Multiple quoted terms suggest special definitions needed",
+        "recommendation": "Add a definitions section or use defined terms consistently",
+    }
+
     def __init__(self):
         self.detailed_rules = [
             # High Risk Rules
@@ -88,83 +130,61 @@ class AdvancedRiskAssessor:
                 "recommendation": "Use precise terms: 'shall', 'must'; define 'best efforts'",
             },
         ]
+        self.rule_engine = RuleEngine([rule["pattern"] for rule in self.detailed_rules])
+        self.ambiguity_engine = RuleEngine([rule["pattern"] for rule in self.AMBIGUITY_RULES])
+        # every issue and ambiguity a clause can report, referenced by index
+        self.issue_table = [self.QUOTED_TERMS_ISSUE, self.LONG_CLAUSE_ISSUE] + [
+            {key: rule[key] for key in ("name", "risk_level", "reason", "recommendation")}
+            for rule in self.detailed_rules
+        ]
+        self.ambiguity_table = [
+            {key: rule[key] for key in ("type", "phrase", "problem", "suggestion")}
+            for rule in self.AMBIGUITY_RULES
+        ]
 
-    def score_clause_detailed(self, clause: str) -> Dict:
-        """Score a clause with detailed analysis."""
-        issues = []
+    def score_clause_ids(self, clause: str) -> Tuple[str, List[int]]:
+        """Overall risk and the ``issue_table`` indices of the clause's issues."""
+        rule_offset = 2  # issue_table starts with the two issues above
+        issue_ids = []
         max_risk = "Low"
 
-        for rule in self.detailed_rules:
-            if re.search(rule["pattern"], clause, re.IGNORECASE):
-                issues.append({
-                    "name": rule["name"],
-                    "risk_level": rule["risk_level"],
-                    "reason": rule["reason"],
-                    "recommendation": rule["recommendation"],
-                })
-                # Update max risk
-                if rule["risk_level"] == "High":
-                    max_risk = "High"
-                elif rule["risk_level"] == "Medium" and max_risk != "High":
-                    max_risk = "Medium"
+        for i in self.rule_engine.scan(clause):
+            issue_ids.append(i + rule_offset)
+            # Update max risk
+            risk_level = self.detailed_rules[i]["risk_level"]
+            if risk_level == "High":
+                max_risk = "High"
+            elif risk_level == "Medium" and max_risk != "High":
+                max_risk = "Medium"
 
         # Additional checks for very long clauses (often sign of poor drafting)
         if len(clause) > 1000:
-            issues.insert(0, {
-                "name": "Overly Long Clause",
-                "risk_level": "Low",
-                "reason": "Clause is unusually long; may contain multiple obligations",
-                "recommendation": "Break into sub-clauses for clarity",
-            })
+            issue_ids.insert(0, 1)
 
         # Check for ambiguous/undefined terms
         undefined_terms = re.findall(r'"([^"]+)"|\'([^\']+)\'', clause)
         if undefined_terms and len(undefined_terms) > 3:
-            issues.insert(0, {
-                "name": "Many Quoted Terms",
-                "risk_level": "Low",
-                "reason": "Multiple quoted terms suggest special definitions needed",
-                "recommendation": "Add a definitions section or use defined terms consistently",
-            })
+            issue_ids.insert(0, 0)
 
+        return max_risk, issue_ids
+
+    def score_clause_detailed(self, clause: str) -> Dict:
+        """Score a clause with detailed analysis."""
+        max_risk, issue_ids = self.score_clause_ids(clause)
+        issues = [dict(self.issue_table[i]) for i in issue_ids]
         return {
             "overall_risk": max_risk,
             "issues_found": len(issues),
             "detailed_issues": issues,
         }
 
+    def ambiguity_ids(self, clause: str) -> List[int]:
+        """``ambiguity_table`` indices of the ambiguous phrasing in a clause."""
+        return self.ambiguity_engine.scan(clause)
+
     def detect_ambiguities(self, clause: str) -> List[Dict]:
         """Detect ambiguous phrasing in a clause."""
-        ambiguities = []
-
-        # Undefined "best efforts"
-        if re.search(r"best efforts|commercially reasonable", clause, re.IGNORECASE):
-            ambiguities.append({
-                "type": "Undefined Standard",
-                "phrase": "best efforts / commercially reasonable",
-                "problem": "Not defined; open to interpretation",
-                "suggestion": "Define explicitly: 'using reasonable efforts consistent with industry standards'",
-            })
-
-        # Time references without specificity
-        if re.search(r"\bsoon\b|\basap\b|promptly|immediately", clause, re.IGNORECASE):
-            ambiguities.append({
-                "type": "Vague Timeline",
-                "phrase": "soon / ASAP / promptly",
-                "problem": "No specific timeframe given",
-                "suggestion": "Specify: 'within [X] days' or 'within [X] business days'",
-            })
-
-        # Conditional obligations without clarity
-        if re.search(r"if.*then|subject to|depending on|as applicable", clause, re.IGNORECASE):
-            ambiguities.append({
-                "type": "Conditional Obligation",
-                "phrase": "if-then / subject to",
-                "problem": "Conditions may be ambiguous or too flexible",
-                "suggestion": "Clearly specify all conditions and consequences",
-            })
-
-        return ambiguities
+        return [dict(self.ambiguity_table[i]) for i in self.ambiguity_ids(clause)]
 
     def aggregate_risk(self, clause_scores: List[str]) -> str:
         """Aggregate clause-level scores to contract risk."""
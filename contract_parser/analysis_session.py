@@ -0,0 +1,129 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from contract_parser.advanced_nlp import ContractClassifier, EntityExtractor, HindiNormalizer
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.clause_classifier import ClauseClassifier
+from contract_parser.compliance_checker import ComplianceChecker
+from contract_parser.parsers import parse_bytes
+from contract_parser.clause_results import ClauseResults
+from utils.cache import text_kind
+from utils.profiling import timer
+
+
+class AnalysisSession:
+    """The analysis of one uploaded contract, computed stage by stage, once.
+
+    A session is identified by the SHA-256 of the uploaded bytes and the
+    language. Each stage (parsing, classification, entities, clause scoring,
+    compliance, clause classification) runs the first time its result is
+    read and is memoized on the session; with a ``cache`` (utils.cache) the
+    stage results are also shared across sessions and restarts. UIs keep the
+    session between reruns and only re-render from it.
+
+    ``timings`` holds the wall time of each session stage and ``trace`` the
+    (stage, seconds) pairs of the pipeline functions they ran (utils.profiling),
+    with nested stages listed before the stage that contains them.
+    """
+
+    def __init__(self, data: bytes, filename: str, language: str = "English",
+                 risk_assessor: Optional[AdvancedRiskAssessor] = None,
+                 entity_extractor: Optional[EntityExtractor] = None,
+                 compliance_checker: Optional[ComplianceChecker] = None, cache=None):
+        self.data = data
+        self.filename = filename
+        self.language = language
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.key = self.session_key(data, language)
+        self.risk_assessor = risk_assessor or AdvancedRiskAssessor()
+        self.entity_extractor = entity_extractor or EntityExtractor()
+        self.compliance_checker = compliance_checker or ComplianceChecker()
+        self.cache = cache
+        self.timings: Dict[str, float] = {}
+        self.trace: List[Tuple[str, float]] = []
+        self._results: Dict[str, Any] = {}
+        self._flags = set()
+
+    @staticmethod
+    def session_key(data: bytes, language: str = "English") -> str:
+        return f"{hashlib.sha256(data).hexdigest()}:{language}"
+
+    def _stage(self, name: str, compute: Callable[[], Any], data=None, kind: Optional[str] = None) -> Any:
+        try:
+            return self._results[name]
+        except KeyError:
+            pass
+        start = time.perf_counter()
+        with timer.trace(self.trace):
+            if self.cache is not None:
+                value = self.cache.get_or_compute(
+                    self.text if data is None else data, kind or f"session:{name}", compute
+                )
+            else:
+                value = compute()
+        self.timings[name] = time.perf_counter() - start
+        self._results[name] = value
+        return value
+
+    def first_time(self, flag: str) -> bool:
+        """True only the first time it is called with this flag, e.g. to log an event once."""
+        if flag in self._flags:
+            return False
+        self._flags.add(flag)
+        return True
+
+    # ------------------------------------------------------------------ stages
+
+    @property
+    def raw_text(self) -> str:
+        """Text as parsed from the file."""
+        return self._stage(
+            "raw_text", lambda: parse_bytes(self.data, self.filename), data=self.data, kind=text_kind(self.filename)
+        )
+
+    @property
+    def text(self) -> str:
+        """Text the analysis runs on (normalized for Hindi)."""
+        if "text" not in self._results:
+            raw_text = self.raw_text
+            self._results["text"] = HindiNormalizer.normalize(raw_text) if self.language == "Hindi" else raw_text
+        return self._results["text"]
+
+    @property
+    def classification(self) -> Dict:
+        return self._stage("classification", lambda: ContractClassifier.classify(self.text))
+
+    @property
+    def entities(self) -> Dict:
+        """Parties, dates and amounts."""
+        return self._stage("entities", lambda: {
+            "parties": self.entity_extractor.extract_parties(self.text),
+            "dates": self.entity_extractor.extract_dates(self.text),
+            "amounts": self.entity_extractor.extract_amounts(self.text),
+        })
+
+    @property
+    def clause_results(self) -> ClauseResults:
+        """Every clause with its risk level, issues and ambiguities."""
+        if "clause_results" not in self._results:
+            state = self._stage("clauses", lambda: ClauseResults.score(self.text, self.risk_assessor).to_state())
+            self._results["clause_results"] = ClauseResults.from_state(self.text, state, self.risk_assessor)
+        return self._results["clause_results"]
+
+    @property
+    def contract_risk(self) -> str:
+        if "contract_risk" not in self._results:
+            self._results["contract_risk"] = self.risk_assessor.aggregate_risk(self.clause_results.risk_levels())
+        return self._results["contract_risk"]
+
+    @property
+    def compliance_report(self) -> Dict:
+        return self._stage("compliance_report", lambda: self.compliance_checker.generate_compliance_report(self.text))
+
+    @property
+    def clause_classes(self) -> List[Dict]:
+        """Category of each of the first 50 clauses."""
+        return self._stage("clause_classes", lambda: ClauseClassifier.classify_clauses_batch(
+            [c["full_text"] for c in self.clause_results[:50]]
+        ))
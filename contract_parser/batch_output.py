@@ -0,0 +1,186 @@
+from typing import Dict, Iterator, List, Tuple
+import hashlib
+import json
+import os
+
+
+# result fields BatchSummary needs, kept in memory for every recorded file
+SUMMARY_FIELDS = (
+    "status", "error", "overall_risk", "contract_type",
+    "compliance_issues", "parties_count", "high_risk_clauses",
+)
+
+
+class BatchSummary:
+    """Batch summary statistics, updated one contract result at a time.
+
+    ``summary()`` returns the same shape as computing the statistics over the
+    full list of results. Results can be removed again, so a contract that is
+    re-analyzed replaces its earlier result.
+    """
+
+    def __init__(self):
+        self.processed_count = 0
+        self.failed_count = 0
+        self.analyzed = 0
+        self.high_risk = 0
+        self.medium_risk = 0
+        self.contract_types: Dict[str, int] = {}
+        self.compliance_issues = 0
+        self.parties = 0
+        self.high_risk_clauses = 0
+
+    def add(self, result: Dict):
+        self._update(result, 1)
+
+    def remove(self, result: Dict):
+        self._update(result, -1)
+
+    def _update(self, result: Dict, sign: int):
+        if "error" in result:
+            self.failed_count += sign
+        else:
+            self.processed_count += sign
+        if result.get("status") != "Processed":
+            return
+        self.analyzed += sign
+        if result.get("overall_risk") == "High":
+            self.high_risk += sign
+        elif result.get("overall_risk") == "Medium":
+            self.medium_risk += sign
+        ctype = result.get("contract_type", "unknown")
+        self.contract_types[ctype] = self.contract_types.get(ctype, 0) + sign
+        if not self.contract_types[ctype]:
+            del self.contract_types[ctype]
+        self.compliance_issues += sign * result.get("compliance_issues", 0)
+        self.parties += sign * result.get("parties_count", 0)
+        self.high_risk_clauses += sign * result.get("high_risk_clauses", 0)
+
+    def summary(self) -> Dict:
+        if not self.analyzed:
+            return {"status": "No contracts processed"}
+        return {
+            "total_analyzed": self.analyzed,
+            "high_risk_contracts": self.high_risk,
+            "medium_risk_contracts": self.medium_risk,
+            "low_risk_contracts": self.analyzed - self.high_risk - self.medium_risk,
+            "contract_type_distribution": dict(self.contract_types),
+            "average_compliance_issues": round(self.compliance_issues / self.analyzed, 2),
+            "average_parties_per_contract": round(self.parties / self.analyzed, 1),
+            "total_high_risk_clauses": self.high_risk_clauses,
+        }
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BatchResultsLog:
+    """Per-contract batch results streamed to a JSON-Lines file.
+
+    Each line is one contract result with a ``source`` record of the input
+    file (absolute path, size and mtime, plus its SHA-256 when
+    ``checkpoint_key="hash"``), so the results file is also the checkpoint:
+    reopening it tells which files are already done. A file is done if its
+    path, size and mtime are unchanged (``"stat"``), or if a file with the
+    same content was already analyzed (``"hash"``), and that analysis
+    succeeded; failed files are retried and the retry replaces the failed
+    result. A line torn by a crash is dropped when the log is reopened.
+    """
+
+    def __init__(self, path: str, checkpoint_key: str = "stat"):
+        if checkpoint_key not in ("stat", "hash"):
+            raise ValueError("checkpoint_key must be 'stat' or 'hash'")
+        self.path = path
+        self.checkpoint_key = checkpoint_key
+        self.summary = BatchSummary()
+        # absolute path -> (source, summary fields of its latest result)
+        self.entries: Dict[str, Tuple[Dict, Dict]] = {}
+        self.hashes = set()
+        self._load()
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+        for line in complete.splitlines():
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            source = result.pop("source", None)
+            if source:
+                self._record(result, source)
+
+    def _record(self, result: Dict, source: Dict):
+        previous = self.entries.get(source["path"])
+        if previous is not None:
+            self.summary.remove(previous[1])
+        fields = {k: result[k] for k in SUMMARY_FIELDS if k in result}
+        self.entries[source["path"]] = (source, fields)
+        self.summary.add(fields)
+        if source.get("sha256") and fields.get("status") == "Processed":
+            self.hashes.add(source["sha256"])
+
+    def source(self, file_path: str) -> Dict:
+        """Identity of an input file as recorded in the log."""
+        path = os.path.abspath(file_path)
+        source = {"path": path}
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return source
+        source.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if self.checkpoint_key == "hash":
+            source["sha256"] = file_sha256(path)
+        return source
+
+    def is_done(self, source: Dict) -> bool:
+        if "size" not in source:
+            return False
+        if self.checkpoint_key == "hash":
+            return source["sha256"] in self.hashes
+        recorded = self.entries.get(source["path"])
+        return recorded is not None and recorded[1].get("status") == "Processed" and all(
+            recorded[0].get(k) == source[k] for k in ("size", "mtime_ns")
+        )
+
+    def append(self, result: Dict, source: Dict):
+        """Write one contract result and count it in the summary."""
+        self._handle.write(json.dumps({**result, "source": source}, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        self._record(result, source)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every result line in the file, oldest first."""
+        if not self._handle.closed:
+            self._handle.flush()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def latest_results(self) -> List[Dict]:
+        """The latest result of every recorded file (what the summary
+        counts), without its source record."""
+        latest: Dict[str, Dict] = {}
+        for result in self:
+            source = result.pop("source", None)
+            if source:
+                latest[source["path"]] = result
+        return list(latest.values())
+
+    def close(self):
+        self._handle.close()
@@ -1,69 +1,264 @@
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional
 import os
 import json
+import signal
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import datetime
-from contract_parser.parsers import parse_file
+from contract_parser.parsers import parse_bytes
+from contract_parser.segmentation import segment_clauses
+from contract_parser.batch_output import BatchResultsLog, BatchSummary
 from contract_parser.advanced_nlp import ContractClassifier, EntityExtractor
 from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
 from contract_parser.compliance_checker import ComplianceChecker
+from utils.cache import shared_cache, text_kind
+
+
+MODES = ("process", "thread", "serial")
+
+
+class FileTimeoutError(TimeoutError):
+    """Processing a single file took longer than the per-file timeout."""
+
+
+def default_workers() -> int:
+    """Default pool size: one worker per CPU."""
+    return os.cpu_count() or 1
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    """Raise FileTimeoutError in the block after `seconds`.
+
+    Uses SIGALRM, so it only takes effect in the main thread on POSIX, which
+    is where process-pool workers and serial runs execute tasks.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise FileTimeoutError(f"Timed out after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# BatchProcessor used by the tasks of a pool worker process
+_worker_processor = None
+
+
+def _init_worker(timeout: Optional[float], use_cache: bool):
+    global _worker_processor
+    _worker_processor = BatchProcessor(mode="serial", timeout=timeout, use_cache=use_cache)
+
+
+def _process_chunk(file_paths: List[str]) -> List[Dict]:
+    return [_worker_processor.process_file(path) for path in file_paths]
 
 
 class BatchProcessor:
-    """Process multiple contracts in batch mode."""
+    """Process multiple contracts in batch mode.
+
+    Files are spread over a pool of workers (``mode="process"`` by default,
+    ``"thread"`` or ``"serial"`` otherwise) in chunks of ``chunk_size`` files.
+    Results come back in submission order, and a file that fails, times out
+    or crashes its worker process only produces a "Failed" record for that
+    file. ``timeout`` limits the seconds spent on each file; it is enforced in
+    process and serial mode on POSIX systems.
 
-    def __init__(self):
+    Per-file results are cached by content hash (see utils.cache), so a
+    contract seen before is not analyzed again; pass ``use_cache=False`` to
+    always recompute.
+    """
+
+    def __init__(self, workers: Optional[int] = None, mode: str = "process",
+                 chunk_size: Optional[int] = None, timeout: Optional[float] = None,
+                 batch_id: Optional[str] = None, use_cache: bool = True):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.workers = max(1, workers or default_workers())
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.cache = shared_cache() if use_cache else None
         self.classifier = ContractClassifier()
         self.entity_extractor = EntityExtractor()
         self.risk_assessor = AdvancedRiskAssessor()
         self.compliance_checker = ComplianceChecker()
-        self.batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.batch_id = batch_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.results = []
 
-    def process_batch(self, file_paths: List[str], output_dir: str = "batch_results") -> Dict:
-        """Process multiple contract files and generate batch report."""
+    def process_batch(self, file_paths: List[str], output_dir: str = "batch_results",
+                      keep_results: bool = True, checkpoint_key: str = "stat") -> Dict:
+        """Process multiple contract files and generate batch report.
+
+        Each contract result is appended to ``batch_analysis_<batch_id>.jsonl``
+        as soon as it is ready. Running the same batch_id again resumes: files
+        already recorded there (see BatchResultsLog) are skipped. The report
+        covers the whole batch so far (``total_files``, the counts, the
+        summary and ``contracts``, read back from the log); ``run`` has the
+        counts of this call alone. With ``keep_results=False`` the report
+        leaves out the per-contract list, so memory does not grow with the
+        batch.
+        """
         
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+
+        results_file = os.path.join(output_dir, f"batch_analysis_{self.batch_id}.jsonl")
+        log = BatchResultsLog(results_file, checkpoint_key)
         
         batch_results = {
             "batch_id": self.batch_id,
             "timestamp": datetime.now().isoformat(),
-            "total_files": len(file_paths),
+            "total_files": 0,
             "processed_count": 0,
             "failed_count": 0,
+            "results_file": results_file,
             "contracts": [],
-            "summary": {}
+            "summary": {},
+            "run": {},
         }
 
-        for file_path in file_paths:
-            try:
-                contract_result = self._process_single_contract(file_path)
-                batch_results["contracts"].append(contract_result)
-                batch_results["processed_count"] += 1
-            except Exception as e:
-                batch_results["failed_count"] += 1
-                batch_results["contracts"].append({
-                    "file": os.path.basename(file_path),
-                    "status": "Failed",
-                    "error": str(e)
-                })
-
-        # Generate batch summary
-        batch_results["summary"] = self._generate_batch_summary(batch_results["contracts"])
-
-        # Save batch results
+        sources = [log.source(path) for path in file_paths]
+        pending = [(path, source) for path, source in zip(file_paths, sources) if not log.is_done(source)]
+        run = BatchSummary()
+
+        try:
+            for (path, source), contract_result in zip(pending, self.iter_results(p for p, _ in pending)):
+                log.append(contract_result, source)
+                run.add(contract_result)
+            if keep_results:
+                batch_results["contracts"] = log.latest_results()
+        finally:
+            log.close()
+
+        batch_results["total_files"] = len(log.entries)
+        batch_results["processed_count"] = log.summary.processed_count
+        batch_results["failed_count"] = log.summary.failed_count
+        batch_results["summary"] = log.summary.summary()
+        batch_results["run"] = {
+            "files": len(file_paths),
+            "skipped_count": len(file_paths) - len(pending),
+            "processed_count": run.processed_count,
+            "failed_count": run.failed_count,
+        }
+        if not keep_results:
+            del batch_results["contracts"]
+
+        # Save batch report (per-contract results are in results_file)
         output_file = os.path.join(output_dir, f"batch_analysis_{self.batch_id}.json")
+        report = {k: v for k, v in batch_results.items() if k != "contracts"}
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(batch_results, f, indent=2, ensure_ascii=False)
+            json.dump(report, f, indent=2, ensure_ascii=False)
 
         return batch_results
 
+    def iter_results(self, file_paths: Iterable[str]) -> Iterator[Dict]:
+        """Yield one result per file, in the order the files were given."""
+        file_paths = list(file_paths)
+        if self.mode == "serial":
+            for path in file_paths:
+                yield self.process_file(path)
+            return
+
+        chunk_size = self.chunk_size or max(1, min(8, len(file_paths) // (self.workers * 4)))
+        chunks = deque(file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size))
+        in_flight = deque()
+        executor = self._make_executor(self.workers)
+        try:
+            while chunks or in_flight:
+                while chunks and len(in_flight) < self.workers * 2:
+                    chunk = chunks.popleft()
+                    in_flight.append((chunk, self._submit(executor, chunk)))
+                chunk, future = in_flight.popleft()
+                try:
+                    results = future.result()
+                except BrokenProcessPool:
+                    # a worker died; every in-flight chunk was lost with it
+                    suspects = chunk + [path for pending, _ in in_flight for path in pending]
+                    in_flight.clear()
+                    executor.shutdown(wait=False)
+                    yield from self._retry_one_by_one(suspects)
+                    executor = self._make_executor(self.workers)
+                    continue
+                except Exception as e:
+                    results = [self._failed(path, str(e)) for path in chunk]
+                yield from results
+        finally:
+            # cancel_futures=True would do this, but needs Python 3.9
+            for _, future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def process_file(self, file_path: str) -> Dict:
+        """Process one file, turning any error into a "Failed" record."""
+        try:
+            with _time_limit(self.timeout):
+                return self._process_single_contract(file_path)
+        except Exception as e:
+            return self._failed(file_path, str(e))
+
+    @staticmethod
+    def _failed(file_path: str, error: str) -> Dict:
+        return {
+            "file": os.path.basename(file_path),
+            "status": "Failed",
+            "error": error
+        }
+
+    def _make_executor(self, workers: int) -> Executor:
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=workers)
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.timeout, self.use_cache))
+
+    def _submit(self, executor: Executor, chunk: List[str]):
+        if self.mode == "thread":
+            return executor.submit(lambda paths: [self.process_file(p) for p in paths], chunk)
+        return executor.submit(_process_chunk, chunk)
+
+    def _retry_one_by_one(self, file_paths: List[str]) -> Iterator[Dict]:
+        """Rerun files one at a time in a fresh worker to find the one that crashed it."""
+        executor = None
+        for path in file_paths:
+            executor = executor or self._make_executor(1)
+            try:
+                yield executor.submit(_process_chunk, [path]).result()[0]
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                executor = None
+                yield self._failed(path, "Worker process exited unexpectedly")
+        if executor:
+            executor.shutdown()
+
     def _process_single_contract(self, file_path: str) -> Dict:
         """Process a single contract file."""
         
-        # Parse file
         with open(file_path, "rb") as f:
-            raw_text = parse_file(f)
+            data = f.read()
+        if self.cache is None:
+            return self._analyze_contract(data, file_path)
+        result = self.cache.get_or_compute(data, "batch", lambda: self._analyze_contract(data, file_path))
+        return {**result, "file": os.path.basename(file_path)}
+
+    def _analyze_contract(self, data: bytes, file_path: str) -> Dict:
+        """Parse and analyze the contents of a contract file."""
+        
+        # Parse file
+        if self.cache is not None:
+            raw_text = self.cache.get_or_compute(data, text_kind(file_path), lambda: parse_bytes(data, file_path))
+        else:
+            raw_text = parse_bytes(data, file_path)
         
         if not raw_text or len(raw_text) < 100:
             return {
@@ -81,17 +276,15 @@ class BatchProcessor:
         amounts = EntityExtractor.extract_amounts(raw_text)
         obligations = EntityExtractor.extract_obligations(raw_text)
 
-        # Risk assessment (sample - first 100 clauses)
-        clauses = raw_text.split("\n\n")[:100]
+        # Risk assessment over every clause
         clause_risks = []
         high_count = 0
 
-        for clause in clauses:
-            if len(clause.strip()) > 20:
-                score = self.risk_assessor.score_clause_detailed(clause)
-                if score["overall_risk"] == "High":
-                    high_count += 1
-                clause_risks.append(score["overall_risk"])
+        for clause in segment_clauses(raw_text):
+            score = self.risk_assessor.score_clause_detailed(clause.text)
+            if score["overall_risk"] == "High":
+                high_count += 1
+            clause_risks.append(score["overall_risk"])
 
         contract_risk = self.risk_assessor.aggregate_risk(clause_risks)
 
@@ -118,32 +311,10 @@ class BatchProcessor:
 
     def _generate_batch_summary(self, contracts: List[Dict]) -> Dict:
         """Generate summary statistics for batch."""
-        processed = [c for c in contracts if c.get("status") == "Processed"]
-        
-        if not processed:
-            return {"status": "No contracts processed"}
-
-        high_risk_count = sum(1 for c in processed if c.get("overall_risk") == "High")
-        medium_risk_count = sum(1 for c in processed if c.get("overall_risk") == "Medium")
-        
-        contract_types = {}
-        for c in processed:
-            ctype = c.get("contract_type", "unknown")
-            contract_types[ctype] = contract_types.get(ctype, 0) + 1
-
-        avg_compliance_issues = sum(c.get("compliance_issues", 0) for c in processed) / len(processed) if processed else 0
-        avg_parties = sum(c.get("parties_count", 0) for c in processed) / len(processed) if processed else 0
-
-        return {
-            "total_analyzed": len(processed),
-            "high_risk_contracts": high_risk_count,
-            "medium_risk_contracts": medium_risk_count,
-            "low_risk_contracts": len(processed) - high_risk_count - medium_risk_count,
-            "contract_type_distribution": contract_types,
-            "average_compliance_issues": round(avg_compliance_issues, 2),
-            "average_parties_per_contract": round(avg_parties, 1),
-            "total_high_risk_clauses": sum(c.get("high_risk_clauses", 0) for c in processed),
-        }
+        summary = BatchSummary()
+        for contract in contracts:
+            summary.add(contract)
+        return summary.summary()
 
     def compare_contracts(self, contracts_data: List[Dict]) -> Dict:
         """Compare multiple contracts for similarities and differences."""
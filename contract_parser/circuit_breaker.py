@@ -0,0 +1,140 @@
+from collections import deque
+from threading import Lock
+from typing import Dict, Optional
+import time
+
+import numpy as np
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Circuit breaker for a slow or failing backend (the LLM API).
+
+    Closed, calls go through and their outcome and latency are kept for the
+    last ``window`` calls. The circuit opens after ``failure_threshold``
+    consecutive failures, or once at least ``min_calls`` are in the window
+    and the share of failures reaches ``error_rate_threshold`` (calls slower
+    than ``slow_call_seconds``, if set, count as failures for this). Open,
+    ``allow()`` refuses every call for ``open_seconds``; then the circuit is
+    half-open and lets ``half_open_probes`` calls through at a time. A probe
+    that succeeds closes the circuit, one that fails opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, error_rate_threshold: float = 0.5, window: int = 20,
+                 min_calls: int = 10, open_seconds: float = 30.0, half_open_probes: int = 1,
+                 slow_call_seconds: Optional[float] = None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)  # True for a failed (or too slow) call
+        self._latencies = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now; every allowed call must
+        be followed by ``record_success``, ``record_failure`` or ``record_abandoned``."""
+        with self._lock:
+            if self.state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self._close()
+                return
+            slow = self.slow_call_seconds is not None and latency > self.slow_call_seconds
+            self._outcomes.append(slow)
+            self._check()
+
+    def record_failure(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self._latencies.append(latency)
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(True)
+            self._check()
+
+    def record_abandoned(self):
+        """An allowed call was cancelled before it finished; frees its probe slot."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _check(self):
+        if self.state != CLOSED:
+            return
+        if self.consecutive_failures >= self.failure_threshold:
+            self._open()
+        elif len(self._outcomes) >= self.min_calls and self.error_rate() >= self.error_rate_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._probes = 0
+
+    def error_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 latency in seconds over the window."""
+        if not self._latencies:
+            return {}
+        values = np.percentile(np.fromiter(self._latencies, dtype=float), [50, 95, 99])
+        return {name: round(float(value), 4) for name, value in zip(("p50", "p95", "p99"), values)}
+
+    def snapshot(self) -> Dict:
+        """State and counters for monitoring."""
+        with self._lock:
+            snapshot = {
+                "state": self.state,
+                "calls": self.calls,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "consecutive_failures": self.consecutive_failures,
+                "error_rate": round(self.error_rate(), 3),
+                "latency": self.latency_percentiles(),
+            }
+            if self.state == OPEN:
+                snapshot["retry_in"] = round(max(0.0, self._opened_at + self.open_seconds - self._clock()), 1)
+            return snapshot
@@ -1,6 +1,8 @@
 from typing import Dict, List
 import re
 
+from utils.profiling import timed
+
 
 class ClauseClassifier:
     """Classify extracted clauses into standard categories."""
@@ -109,6 +111,7 @@ class ClauseClassifier:
         }
 
     @classmethod
+    @timed("clause_classification")
     def classify_clauses_batch(cls, clauses: List[str]) -> List[Dict]:
         """Classify multiple clauses."""
         results = []
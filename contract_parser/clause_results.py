@@ -0,0 +1,226 @@
+from array import array
+from dataclasses import FrozenInstanceError
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from contract_parser.segmentation import segment_clauses
+from utils.profiling import timed, timer
+
+RISK_LEVELS = ("Low", "Medium", "High")
+PREVIEW_CHARS = 100
+
+
+class ClauseResults:
+    """Risk results for every clause of one document, stored column-wise.
+
+    Clause text is kept as offsets into ``document``; issues and ambiguities
+    as indices into the assessor's ``issue_table`` and ``ambiguity_table``;
+    section numbers and headings as indices into a table of distinct labels.
+    Items are ``ClauseResult`` views that read like the clause dicts the app
+    used to build (``result["risk"]``, ``result["issues"]``, ...); the dicts
+    themselves are only built by ``to_dicts()``.
+    """
+
+    __slots__ = (
+        "document", "issue_table", "ambiguity_table", "starts", "ends", "risks",
+        "issue_ids", "issue_bounds", "ambiguity_ids", "ambiguity_bounds",
+        "sections", "headings", "labels", "_label_ids",
+    )
+
+    def __init__(self, document: str, issue_table: Sequence[Dict], ambiguity_table: Sequence[Dict]):
+        self.document = document
+        self.issue_table = issue_table
+        self.ambiguity_table = ambiguity_table
+        self.starts = array("I")
+        self.ends = array("I")
+        self.risks = array("B")
+        # ids of clause i are issue_ids[issue_bounds[i]:issue_bounds[i + 1]]
+        self.issue_ids = array("H")
+        self.issue_bounds = array("I", [0])
+        self.ambiguity_ids = array("H")
+        self.ambiguity_bounds = array("I", [0])
+        # index into labels, -1 for none
+        self.sections = array("i")
+        self.headings = array("i")
+        self.labels: List[str] = []
+        self._label_ids: Dict[str, int] = {}
+
+    @classmethod
+    @timed("risk_scoring")
+    def score(cls, document: str, assessor) -> "ClauseResults":
+        """Segment the document and score every clause with an
+        ``AdvancedRiskAssessor``."""
+        results = cls(document, assessor.issue_table, assessor.ambiguity_table)
+        for clause in timer.iterate("clause_split", segment_clauses(document)):
+            risk, issue_ids = assessor.score_clause_ids(clause.text)
+            results.append(
+                clause.start, clause.end, risk, issue_ids,
+                assessor.ambiguity_ids(clause.text), clause.section, clause.heading,
+            )
+        return results
+
+    def _label(self, label: Optional[str]) -> int:
+        if label is None:
+            return -1
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        return label_id
+
+    def append(self, start: int, end: int, risk: str, issue_ids: Sequence[int], ambiguity_ids: Sequence[int],
+               section: Optional[str] = None, heading: Optional[str] = None):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.risks.append(RISK_LEVELS.index(risk))
+        self.issue_ids.extend(issue_ids)
+        self.issue_bounds.append(len(self.issue_ids))
+        self.ambiguity_ids.extend(ambiguity_ids)
+        self.ambiguity_bounds.append(len(self.ambiguity_ids))
+        self.sections.append(self._label(section))
+        self.headings.append(self._label(heading))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["ClauseResult", List["ClauseResult"]]:
+        if isinstance(index, slice):
+            return [ClauseResult(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ClauseResult(self, index)
+
+    def __iter__(self) -> Iterator["ClauseResult"]:
+        for index in range(len(self)):
+            yield ClauseResult(self, index)
+
+    def risk_levels(self) -> List[str]:
+        return [RISK_LEVELS[risk] for risk in self.risks]
+
+    def to_dicts(self) -> List[Dict]:
+        """Every clause in the dict shape of ``ClauseResult.to_dict``."""
+        return [result.to_dict() for result in self]
+
+    def to_state(self) -> Dict:
+        """JSON-serializable form for the analysis cache (without the document)."""
+        return {
+            "starts": self.starts.tolist(),
+            "ends": self.ends.tolist(),
+            "risks": self.risks.tolist(),
+            "issue_ids": self.issue_ids.tolist(),
+            "issue_bounds": self.issue_bounds.tolist(),
+            "ambiguity_ids": self.ambiguity_ids.tolist(),
+            "ambiguity_bounds": self.ambiguity_bounds.tolist(),
+            "sections": self.sections.tolist(),
+            "headings": self.headings.tolist(),
+            "labels": self.labels,
+        }
+
+    @classmethod
+    def from_state(cls, document: str, state: Dict, assessor) -> "ClauseResults":
+        results = cls(document, assessor.issue_table, assessor.ambiguity_table)
+        for name in ("starts", "ends", "risks", "issue_ids", "ambiguity_ids", "sections", "headings"):
+            getattr(results, name).extend(state[name])
+        results.issue_bounds = array("I", state["issue_bounds"])
+        results.ambiguity_bounds = array("I", state["ambiguity_bounds"])
+        results.labels = list(state["labels"])
+        results._label_ids = {label: i for i, label in enumerate(results.labels)}
+        return results
+
+
+class ClauseResult:
+    """One clause of a ``ClauseResults``, read on access.
+
+    Supports ``result[key]`` and ``result.get(key)`` with the keys of the
+    clause dicts: id, text (preview), full_text, start, end, section,
+    heading, risk, issues and ambiguities. Immutable; two results are equal
+    if they are the same clause of the same ``ClauseResults``.
+    """
+
+    # slots by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ("results", "index")
+
+    KEYS = ("id", "text", "full_text", "start", "end", "section", "heading", "risk", "issues", "ambiguities")
+
+    def __init__(self, results: ClauseResults, index: int):
+        object.__setattr__(self, "results", results)
+        object.__setattr__(self, "index", index)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __repr__(self) -> str:
+        return f"ClauseResult(index={self.index})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.results is other.results and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.results), self.index))
+
+    @property
+    def id(self) -> int:
+        return self.index
+
+    @property
+    def start(self) -> int:
+        return self.results.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        return self.results.ends[self.index]
+
+    @property
+    def full_text(self) -> str:
+        return self.results.document[self.start:self.end]
+
+    @property
+    def text(self) -> str:
+        """The first characters of the clause, as shown in lists."""
+        return self.results.document[self.start:min(self.end, self.start + PREVIEW_CHARS)] + "..."
+
+    @property
+    def section(self) -> Optional[str]:
+        label = self.results.sections[self.index]
+        return self.results.labels[label] if label >= 0 else None
+
+    @property
+    def heading(self) -> Optional[str]:
+        label = self.results.headings[self.index]
+        return self.results.labels[label] if label >= 0 else None
+
+    @property
+    def risk(self) -> str:
+        return RISK_LEVELS[self.results.risks[self.index]]
+
+    @property
+    def issues(self) -> List[Dict]:
+        results = self.results
+        bounds = results.issue_bounds
+        return [dict(results.issue_table[i]) for i in results.issue_ids[bounds[self.index]:bounds[self.index + 1]]]
+
+    @property
+    def ambiguities(self) -> List[Dict]:
+        results = self.results
+        bounds = results.ambiguity_bounds
+        return [
+            dict(results.ambiguity_table[i])
+            for i in results.ambiguity_ids[bounds[self.index]:bounds[self.index + 1]]
+        ]
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.KEYS}
@@ -1,5 +1,7 @@
 import re
 from typing import List, Dict
+from contract_parser.keyword_index import keyword_index
+from utils.profiling import timed
 
 
 class ComplianceChecker:
@@ -101,10 +103,10 @@ class ComplianceChecker:
     def check_compliance(cls, text: str) -> List[Dict]:
         """Check contract for generic compliance issues."""
         issues = []
-        text_lower = text.lower()
+        keywords = keyword_index(text)
 
         for rule in cls.COMPLIANCE_RULES:
-            found = any(kw.lower() in text_lower for kw in rule["keywords"])
+            found = keywords.any(rule["keywords"])
             if not found:
                 issues.append({
                     "rule": rule["name"],
@@ -128,10 +130,10 @@ class ComplianceChecker:
     def check_india_specific_compliance(cls, text: str) -> List[Dict]:
         """Check India-specific legal compliance."""
         issues = []
-        text_lower = text.lower()
+        keywords = keyword_index(text)
 
         for rule in cls.INDIA_SPECIFIC_RULES:
-            found = any(kw.lower() in text_lower for kw in rule["keywords"])
+            found = keywords.any(rule["keywords"])
             
             issues.append({
                 "rule": rule["name"],
@@ -148,15 +150,16 @@ class ComplianceChecker:
     def check_indian_law_references(cls, text: str) -> List[str]:
         """Check for references to Indian laws."""
         references = []
-        text_lower = text.lower()
+        keywords = keyword_index(text)
 
-        for law, keywords in cls.INDIAN_LAW_KEYWORDS.items():
-            if any(kw.lower() in text_lower for kw in keywords):
+        for law, law_keywords in cls.INDIAN_LAW_KEYWORDS.items():
+            if keywords.any(law_keywords):
                 references.append(law.title())
 
         return references
 
     @classmethod
+    @timed("compliance")
     def generate_compliance_report(cls, text: str) -> Dict:
         """Generate comprehensive compliance report."""
         generic_issues = cls.check_compliance(text)
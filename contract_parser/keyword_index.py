@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+RECENT_DOCUMENTS = 32
+
+
+class KeywordIndex:
+    """Keyword lookups against one document, shared by every keyword table.
+
+    The document is lowercased once, on the first lookup, and each keyword
+    is searched for at most once, however many rules, checks or classifiers
+    ask about it. Matching is case-insensitive substring matching, as
+    ``kw.lower() in text.lower()``.
+
+    A per-keyword C substring search, done only for the keywords asked
+    about, is faster here than one combined pass over the text: a regex
+    alternation or trie backtracks at every position, a pure-Python
+    Aho-Corasick automaton steps through every character in Python, and
+    an eager pass cannot stop at a rule's first match.
+    """
+
+    __slots__ = ("text", "_lowered", "present", "counts")
+
+    def __init__(self, text: str, present: Optional[Dict[str, bool]] = None,
+                 counts: Optional[Dict[str, int]] = None):
+        self.text = text
+        self._lowered = None
+        self.present: Dict[str, bool] = {} if present is None else present
+        self.counts: Dict[str, int] = {} if counts is None else counts
+
+    @property
+    def lowered(self) -> str:
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return self._lowered
+
+    def __contains__(self, keyword: str) -> bool:
+        keyword = keyword.lower()
+        found = self.present.get(keyword)
+        if found is None:
+            found = self.present[keyword] = keyword in self.lowered
+        return found
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        """True if at least one of the keywords occurs."""
+        return any(kw in self for kw in keywords)
+
+    def count(self, keyword: str) -> int:
+        """Non-overlapping occurrences of the keyword, as ``str.count``."""
+        keyword = keyword.lower()
+        n = self.counts.get(keyword)
+        if n is None:
+            n = self.counts[keyword] = self.lowered.count(keyword) if keyword in self else 0
+        return n
+
+
+# answers found so far for recent documents, by the text's (cached) hash and
+# length; the texts are not kept
+_recent: "OrderedDict[Tuple[int, int], Tuple[Dict[str, bool], Dict[str, int]]]" = OrderedDict()
+_recent_lock = Lock()
+
+
+def keyword_index(text: str) -> KeywordIndex:
+    """Shared index for a document, so the classifier and every compliance
+    check on the same text reuse each other's lookups. The answers for
+    recent documents are kept without the texts and reused by later indexes
+    of the same text."""
+    key = (hash(text), len(text))
+    with _recent_lock:
+        answers = _recent.get(key)
+        if answers is None:
+            answers = _recent[key] = ({}, {})
+            while len(_recent) > RECENT_DOCUMENTS:
+                _recent.popitem(last=False)
+        else:
+            _recent.move_to_end(key)
+    return KeywordIndex(text, *answers)
+
+
+def clear_keyword_indexes():
+    """Forget the answers for recent documents."""
+    with _recent_lock:
+        _recent.clear()
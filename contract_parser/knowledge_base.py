@@ -2,6 +2,9 @@ from typing import List, Dict
 import json
 from datetime import datetime
 
+# minimum TF-IDF cosine for a knowledge-base issue to count as related
+ISSUE_MIN_SCORE = 0.1
+
 
 class ContractKnowledgeBase:
     """Knowledge base of common contract issues faced by Indian SMEs."""
@@ -125,19 +128,17 @@ class ContractKnowledgeBase:
         return cls.COMMON_ISSUES.get(issue_name, {})
 
     @classmethod
-    def get_similar_issues(cls, risk_pattern: str) -> List[Dict]:
+    def get_similar_issues(cls, risk_pattern: str, top_k: int = 3) -> List[Dict]:
         """Find similar issues from knowledge base based on pattern."""
-        similar = []
-        risk_lower = risk_pattern.lower()
-        
-        for issue_key, issue_data in cls.COMMON_ISSUES.items():
-            if any(keyword in risk_lower for keyword in issue_data["title"].lower().split()):
-                similar.append({
-                    "key": issue_key,
-                    "data": issue_data
-                })
-        
-        return similar
+        return [
+            {"key": match["key"], "data": cls.COMMON_ISSUES[match["key"]]}
+            for match in cls._matching_issues([risk_pattern], top_k)[0]
+        ]
+
+    @staticmethod
+    def _matching_issues(texts: List[str], top_k: int) -> List[List[Dict]]:
+        from contract_parser.reference_index import reference_index
+        return reference_index().search(texts, top_k, sources=["issue"], min_score=ISSUE_MIN_SCORE)
 
     @classmethod
     def get_high_impact_issues(cls) -> List[Dict]:
@@ -167,19 +168,18 @@ class ContractKnowledgeBase:
         }
 
     @classmethod
-    def suggest_from_knowledge_base(cls, clause_text: str, detected_issues: List[Dict]) -> List[Dict]:
+    def suggest_from_knowledge_base(cls, clause_text: str, detected_issues: List[Dict], top_k: int = 3) -> List[Dict]:
         """Suggest solutions based on detected issues matching knowledge base."""
         suggestions = []
-        clause_lower = clause_text.lower()
-        
-        for issue_key, issue_data in cls.COMMON_ISSUES.items():
-            if any(keyword in clause_lower for keyword in issue_data["title"].lower().split()):
-                suggestions.append({
-                    "issue": issue_data["title"],
-                    "description": issue_data["description"],
-                    "solution": issue_data["solution"],
-                    "sample_fix": issue_data["sample_fix"],
-                    "based_on": "Knowledge Base"
-                })
+        for match in cls._matching_issues([clause_text], top_k)[0]:
+            issue_data = cls.COMMON_ISSUES[match["key"]]
+            suggestions.append({
+                "issue": issue_data["title"],
+                "description": issue_data["description"],
+                "solution": issue_data["solution"],
+                "sample_fix": issue_data["sample_fix"],
+                "based_on": "Knowledge Base",
+                "score": match["score"],
+            })
         
         return suggestions
@@ -0,0 +1,96 @@
+from typing import Dict, List, Sequence
+import json
+import re
+
+from contract_parser.summarization import estimate_tokens
+
+BATCH_TOKENS = 3000
+MAX_BATCH_CLAUSES = 20
+
+_JSON_FORMAT = """Return only a JSON array with one object per clause, in the same order, in the form
+[{{"id": "<clause id>", "{field}": "<plain text>"}}]
+
+Clauses (JSON):
+{items}"""
+
+EXPLAIN_BATCH_PROMPT = """Analyze each legal clause below and, for each one, provide:
+1. Simple explanation (2-3 sentences)
+2. Key obligations (if any)
+3. Key rights (if any)
+4. Potential risks (if any)
+5. Recommendation for SME
+
+""" + _JSON_FORMAT.replace("{field}", "explanation")
+
+ALTERNATIVE_BATCH_PROMPT = """For each legal clause below (with its risk level), suggest a more balanced alternative
+wording that protects both parties fairly and is SME-friendly. For each one provide:
+1. Problem with original
+2. Suggested alternative
+3. Why it's better
+
+""" + _JSON_FORMAT.replace("{field}", "suggestion")
+
+RISK_BATCH_PROMPT = """Why is each legal clause below risky? Provide brief risk reasoning for each one,
+formatted as: [Risk Category]: [Specific Concern]
+
+""" + _JSON_FORMAT.replace("{field}", "reasoning")
+
+# prompt kind -> (batch prompt, answer field of each array item)
+BATCH_PROMPTS = {
+    "explain": (EXPLAIN_BATCH_PROMPT, "explanation"),
+    "alternative": (ALTERNATIVE_BATCH_PROMPT, "suggestion"),
+    "risk": (RISK_BATCH_PROMPT, "reasoning"),
+}
+
+
+def format_items(items: Sequence[Dict]) -> str:
+    return json.dumps(list(items), ensure_ascii=False, indent=1)
+
+
+def pack_batches(items: Sequence[Dict], template: str, max_tokens: int = BATCH_TOKENS,
+                 max_items: int = MAX_BATCH_CLAUSES) -> List[List[Dict]]:
+    """Group clause items, in order, into batches whose prompt stays within
+    ``max_tokens`` (estimated) and ``max_items`` clauses; a clause too long
+    for any batch gets one of its own."""
+    overhead = estimate_tokens(template.format(items="[]"))
+    batches, current, size = [], [], overhead
+    for item in items:
+        item_tokens = estimate_tokens(format_items([item]))
+        if current and (size + item_tokens > max_tokens or len(current) == max_items):
+            batches.append(current)
+            current, size = [], overhead
+        current.append(item)
+        size += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text: str, field: str, ids: Sequence[str]) -> Dict[str, str]:
+    """Valid answers of a batched response, by clause id.
+
+    Accepts the JSON array bare or in a Markdown code fence. Items that are
+    not objects, have an unknown or repeated id, or lack a non-empty string
+    ``field`` are dropped, as is everything when the array does not parse.
+    """
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+    expected = set(ids)
+    answers: Dict[str, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        clause_id, answer = item.get("id"), item.get(field)
+        if clause_id in expected and clause_id not in answers and isinstance(answer, str) and answer.strip():
+            answers[clause_id] = answer.strip()
+    return answers
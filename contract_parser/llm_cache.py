@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from contract_parser.similarity_index import ClauseIndex, normalize
+from utils.cache import DEFAULT_DIRECTORY, AnalysisCache
+
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# LLM answers do not depend on the rule tables, so the store gets a fixed fingerprint
+STORE_FINGERPRINT = "llm-responses"
+
+
+def template_version(template: str) -> str:
+    """Version of a prompt template: any edit to its wording gives a new one."""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+class LLMResponseCache:
+    """Disk-backed cache of LLM responses for recurring clause text.
+
+    Responses are keyed by a namespace (model name, prompt kind, template
+    version and any extra prompt parameter such as the risk level) and the
+    normalized input text, so the same boilerplate clause is answered once
+    across contracts and reruns. Entries expire after ``ttl`` seconds and the
+    store evicts least recently used entries beyond ``max_bytes``.
+
+    With ``near_duplicate`` set to a similarity threshold (e.g. 0.95), a miss
+    falls back to the most similar cached text of the namespace, found with a
+    MinHash ``ClauseIndex``, so trivially reworded boilerplate still hits.
+    It is off by default: "30 days" and "60 days" are near-duplicates too.
+    """
+
+    def __init__(self, directory: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES,
+                 near_duplicate: Optional[float] = None, clock=time.time):
+        self.store = AnalysisCache(directory, max_bytes, fingerprint=STORE_FINGERPRINT)
+        self.ttl = ttl
+        self.near_duplicate = near_duplicate
+        self._clock = clock
+        self._lock = Lock()
+        # namespace -> (index of cached texts, key of each text); loaded on first near-duplicate lookup
+        self._indexes: Optional[Dict[str, Tuple[ClauseIndex, Dict[str, str]]]] = None
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def namespace(model: str, kind: str, template: str, variant: str = "") -> str:
+        return f"{model}:{kind}:{template_version(template)}:{variant}"
+
+    def _get_key(self, key: str) -> Optional[str]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry["created"] > self.ttl:
+            self.expired += 1
+            try:
+                os.remove(self.store._path(key))
+            except OSError:
+                pass
+            return None
+        return entry["response"]
+
+    def get(self, namespace: str, text: str) -> Optional[str]:
+        """Cached response for the text, or None."""
+        normalized = normalize(text)
+        response = self._get_key(self.store.key(normalized, namespace))
+        if response is None and self.near_duplicate is not None:
+            response = self._get_near_duplicate(namespace, normalized)
+            if response is not None:
+                self.near_hits += 1
+                return response
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def _get_near_duplicate(self, namespace: str, normalized: str) -> Optional[str]:
+        with self._lock:
+            if self._indexes is None:
+                self._load_indexes()
+            if namespace not in self._indexes:
+                return None
+            index, keys = self._indexes[namespace]
+            matches = index.query(normalized, self.near_duplicate, top_k=1)
+            if not matches:
+                return None
+            key = keys[matches[0]["template_clause"]]
+        return self._get_key(key)
+
+    def _load_indexes(self):
+        self._indexes = {}
+        for entry in self.store._entries():
+            # read directly: a scan must not count as use for the LRU order
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self._index(value["namespace"], value["text"], entry.name[:-len(".json")])
+
+    def _index(self, namespace: str, normalized: str, key: str):
+        if namespace not in self._indexes:
+            self._indexes[namespace] = (ClauseIndex(), {})
+        index, keys = self._indexes[namespace]
+        if normalized not in keys:
+            index.add(normalized)
+        keys[normalized] = key
+
+    def put(self, namespace: str, text: str, response: str):
+        normalized = normalize(text)
+        key = self.store.key(normalized, namespace)
+        self.store.put(key, {
+            "namespace": namespace,
+            "text": normalized,
+            "response": response,
+            "created": self._clock(),
+        })
+        with self._lock:
+            if self._indexes is not None:
+                self._index(namespace, normalized, key)
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.store.clear()
+        with self._lock:
+            self._indexes = None
+
+
+_shared = None
+_shared_lock = Lock()
+
+
+def shared_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide LLM response cache, configured by environment variables.
+
+    Stored in ``$CONTRACT_CACHE_DIR/llm``. ``LLM_CACHE_TTL_DAYS`` (default 30),
+    ``LLM_CACHE_MAX_MB`` (default 64) and ``LLM_CACHE_NEAR_DUPLICATE`` (a
+    similarity threshold, default off); ``LLM_CACHE=off`` (or
+    ``CONTRACT_CACHE=off``) disables it, in which case None is returned.
+    """
+    global _shared
+    if any(os.environ.get(name, "").lower() in ("off", "0", "false") for name in ("CONTRACT_CACHE", "LLM_CACHE")):
+        return None
+    with _shared_lock:
+        directory = os.path.join(os.environ.get("CONTRACT_CACHE_DIR", DEFAULT_DIRECTORY), "llm")
+        if _shared is None or _shared.store.directory != directory:
+            near_duplicate = os.environ.get("LLM_CACHE_NEAR_DUPLICATE")
+            _shared = LLMResponseCache(
+                directory,
+                ttl=float(os.environ.get("LLM_CACHE_TTL_DAYS", DEFAULT_TTL / 86400)) * 86400,
+                max_bytes=int(float(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+                near_duplicate=float(near_duplicate) if near_duplicate else None,
+            )
+        return _shared
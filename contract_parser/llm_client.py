@@ -1,16 +1,213 @@
+import asyncio
+import contextvars
+import functools
 import os
-from typing import Optional
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+from contract_parser.llm_batch import BATCH_PROMPTS, BATCH_TOKENS, format_items, pack_batches, parse_batch_response
+from contract_parser.circuit_breaker import CircuitBreaker, CircuitOpenError
+from contract_parser.llm_cache import shared_llm_cache
+from contract_parser.summarization import SUMMARY_CHUNK_TOKENS, estimate_tokens, pack_texts, summary_chunks
+from utils.profiling import timed, timer
+
+T = TypeVar("T")
+_SHARED = object()
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 2
+
+SUMMARIZE_PROMPT = "Summarize this legal text in simple business English (max {max_length} words):\n\n{text}"
+# words per chunk summary in the map step of long-contract summaries
+CHUNK_SUMMARY_WORDS = 120
+
+CHUNK_SUMMARY_PROMPT = """This is one part of a longer contract. Summarize it in simple business English
+(max {max_length} words). Keep every obligation, payment term, deadline, liability and termination right.
+
+{text}"""
+
+REDUCE_PROMPT = """These are summaries of consecutive parts of one contract. Combine them into a single summary
+in simple business English (max {max_length} words), keeping the most important obligations and risks.
+
+{text}"""
+
+EXPLAIN_PROMPT = """Analyze this legal clause and provide:
+1. Simple explanation (2-3 sentences)
+2. Key obligations (if any)
+3. Key rights (if any)
+4. Potential risks (if any)
+5. Recommendation for SME
+
+Clause: {clause}"""
+
+ALTERNATIVE_PROMPT = """For this {risk_level}-risk legal clause, suggest a more balanced alternative wording
+that protects both parties fairly and is SME-friendly:
+
+Original: {clause}
+
+Provide:
+1. Problem with original
+2. Suggested alternative
+3. Why it's better"""
+
+RISK_PROMPT = """Why is this legal clause risky? Provide brief risk reasoning:
+
+{clause}
+
+Format: [Risk Category]: [Specific Concern]"""
+
+# clause tasks answered one clause per prompt or many per batched prompt (llm_batch)
+CLAUSE_PROMPTS = {"explain": EXPLAIN_PROMPT, "alternative": ALTERNATIVE_PROMPT, "risk": RISK_PROMPT}
+
+
+class IncompleteAnswerError(Exception):
+    """Raised by a stream that failed after part of the answer was yielded;
+    the partial answer is not cached."""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter, shared by every thread and event loop.
+
+    Tokens refill at ``rate`` per second up to ``capacity`` (the burst size).
+    Each request takes one token; when none are left, the request waits
+    until its token has refilled.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before it may be used."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    # already inside an event loop (e.g. a notebook): run it on a worker thread,
+    # in a copy of this context so stage traces still see the calls
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(contextvars.copy_context().run, asyncio.run, awaitable).result()
+
+
+async def to_thread(func, *args, **kwargs):
+    """Run a blocking call on the loop's default executor, in a copy of the
+    current context (``asyncio.to_thread``, which needs Python 3.9)."""
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+def iterate_sync(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Iterate an async generator from synchronous code (outside any running
+    event loop), handing out each item as soon as it is produced."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(iterator.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        if hasattr(loop, "shutdown_default_executor"):  # Python 3.9+
+            loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
 
 
 class LLMClient:
-    """Gemini API client for legal contract analysis with fallback to rule-based analysis."""
-    
-    def __init__(self):
+    """Gemini API client for legal contract analysis with fallback to rule-based analysis.
+
+    Every method has an async variant (``aexplain_clause``, ...) and the
+    ``explain_clauses``/``suggest_alternatives`` batch methods run many
+    clauses concurrently. Requests are limited to ``max_concurrency`` in
+    flight per event loop and ``requests_per_minute`` across the process,
+    each attempt is cut off after ``timeout`` seconds, and failed attempts
+    are retried ``max_retries`` times with jittered exponential backoff
+    before falling back to the rule-based answer. The sync methods are
+    wrappers around the async ones.
+
+    Texts longer than ``summary_chunk_tokens`` are summarized map-reduce:
+    split along clause boundaries into chunks within the budget, the chunks
+    summarized concurrently, and the chunk summaries combined (in rounds,
+    if they exceed the budget themselves). Chunk summaries are cached like
+    any answer, so after an edit only the changed chunks are sent again.
+
+    With ``batched=True`` the batch methods pack many clauses into each
+    request (within ``batch_tokens``) and ask for a JSON array of answers
+    keyed by clause id; clauses whose answer is missing or invalid are
+    retried one by one.
+
+    Every model call goes through ``breaker``, a ``CircuitBreaker``: while
+    the model keeps failing the circuit opens and calls fall back to the
+    rule-based answers at once, until a probe call succeeds again.
+    ``breaker.snapshot()`` exposes its state and counters.
+
+    ``stream_summary`` and ``stream_explanation`` yield the answer in chunks
+    as the model produces them; the time to the first chunk of each streamed
+    model answer is kept in ``first_token_times``.
+
+    ``model`` replaces the Gemini model with any object that has
+    ``generate_content(prompt)`` (and optionally ``generate_content_async``)
+    returning a response with a ``text`` attribute. Model answers are kept in
+    ``cache`` (an ``LLMResponseCache``, by default the shared one; None to
+    disable), so recurring clause text is only sent once.
+    """
+
+    def __init__(self, model=None, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None,
+                 timeout: float = DEFAULT_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 0.5, backoff_cap: float = 8.0, cache=_SHARED,
+                 summary_chunk_tokens: int = SUMMARY_CHUNK_TOKENS, batch_tokens: int = BATCH_TOKENS,
+                 breaker: Optional[CircuitBreaker] = None):
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model_name = "gemini-1.5-flash"  # or gemini-pro for stronger reasoning
         self.client = None
-        
-        if self.api_key:
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        requests_per_minute = requests_per_minute or float(
+            os.getenv("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE))
+        self.rate_limit = TokenBucket(requests_per_minute / 60.0, capacity=self.max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.cache = shared_llm_cache() if cache is _SHARED else cache
+        self.first_token_times = deque(maxlen=100)
+        self.summary_chunk_tokens = summary_chunk_tokens
+        self.batch_tokens = batch_tokens
+        self.breaker = breaker or CircuitBreaker()
+
+        if model is not None:
+            self.client = model
+            self.model_name = getattr(model, "model_name", type(model).__name__)
+            self.available = True
+        elif self.api_key:
             try:
                 import google.generativeai as genai
                 genai.configure(api_key=self.api_key)
@@ -22,91 +219,387 @@ class LLMClient:
         else:
             self.available = False
 
-    def summarize(self, prompt: str, max_length: int = 500) -> str:
-        """Summarize contract or clause in plain English."""
+    def _semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one loop; sync wrappers start a new loop per call
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _call_model(self, prompt: str) -> str:
+        generate_async = getattr(self.client, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt)
+        else:
+            response = await to_thread(self.client.generate_content, prompt)
+        return response.text
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    @timed("llm")
+    async def agenerate(self, prompt: str) -> str:
+        """Send one prompt, respecting the limits; raises once all retries fail."""
+        semaphore = self._semaphore()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt))
+            async with semaphore:
+                # checked once a slot is free, so queued calls see a circuit that opened meanwhile
+                if not self.breaker.allow():
+                    raise CircuitOpenError("LLM circuit is open")
+                started = time.perf_counter()
+                try:
+                    await self.rate_limit.acquire()
+                    started = time.perf_counter()
+                    text = await asyncio.wait_for(self._call_model(prompt), self.timeout)
+                except Exception:
+                    self.breaker.record_failure(time.perf_counter() - started)
+                    if attempt == self.max_retries:
+                        raise
+                except BaseException:
+                    self.breaker.record_abandoned()
+                    raise
+                else:
+                    self.breaker.record_success(time.perf_counter() - started)
+                    return text
+
+    def _namespace(self, kind: str, template: str, variant: str = "") -> str:
+        """Cache namespace of a prompt kind. The answers to a clause task are
+        cached per clause whether they came from a single or a batched prompt,
+        under a version of both templates, so either path reuses the other's."""
+        if kind in CLAUSE_PROMPTS:
+            template = CLAUSE_PROMPTS[kind] + BATCH_PROMPTS[kind][0]
+        return self.cache.namespace(self.model_name, kind, template, variant)
+
+    async def _generate(self, kind: str, template: str, subject: str, variant: str = "", **fields) -> str:
+        """Model answer for a prompt template about ``subject`` (the clause or
+        text), served from the cache when possible."""
+        if self.cache is None:
+            return await self.agenerate(template.format(**fields))
+        namespace = self._namespace(kind, template, variant)
+        response = self.cache.get(namespace, subject)
+        if response is None:
+            response = await self.agenerate(template.format(**fields))
+            try:
+                self.cache.put(namespace, subject, response)
+            except OSError:
+                pass  # a full or read-only disk only costs the cache
+        return response
+
+    async def _stream_model(self, prompt: str) -> AsyncIterator[str]:
+        generate_async = getattr(self.client, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt, stream=True)
+            async for chunk in response:
+                yield chunk.text
+        else:
+            chunks = iter(await to_thread(self.client.generate_content, prompt, stream=True))
+            while True:
+                chunk = await to_thread(next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk.text
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the answer to one prompt in chunks, with the limits of
+        ``agenerate``. The timeout applies to each wait for the next chunk;
+        failed attempts are only retried until the first chunk has arrived."""
+        semaphore = self._semaphore()
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt))
+            async with semaphore:
+                if not self.breaker.allow():
+                    raise CircuitOpenError("LLM circuit is open")
+                # the breaker sees the latency to the first chunk
+                recorded = False
+                first_chunk_latency = None
+                attempt_started = time.perf_counter()
+                chunks = self._stream_model(prompt)
+                try:
+                    await self.rate_limit.acquire()
+                    attempt_started = time.perf_counter()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                        except StopAsyncIteration:
+                            self.breaker.record_success(
+                                time.perf_counter() - attempt_started if first_chunk_latency is None
+                                else first_chunk_latency)
+                            recorded = True
+                            if timer.enabled:
+                                timer.record("llm.stream", time.perf_counter() - started)
+                            return
+                        if first_chunk_latency is None:
+                            first_chunk_latency = time.perf_counter() - attempt_started
+                            self.first_token_times.append(time.perf_counter() - started)
+                            if timer.enabled:
+                                timer.record("llm.first_token", self.first_token_times[-1])
+                        yield chunk
+                except Exception:
+                    self.breaker.record_failure(
+                        time.perf_counter() - attempt_started if first_chunk_latency is None else first_chunk_latency)
+                    recorded = True
+                    if first_chunk_latency is not None or attempt == self.max_retries:
+                        raise
+                finally:
+                    if not recorded:
+                        self.breaker.record_abandoned()
+                    await chunks.aclose()
+
+    async def _stream(self, kind: str, template: str, subject: str, variant: str = "", **fields) -> AsyncIterator[str]:
+        """``_generate`` in chunks; the answer is cached once complete."""
+        namespace = self._namespace(kind, template, variant) if self.cache is not None else None
+        if namespace is not None:
+            response = self.cache.get(namespace, subject)
+            if response is not None:
+                yield response
+                return
+        parts = []
+        async for chunk in self.astream(template.format(**fields)):
+            parts.append(chunk)
+            yield chunk
+        if namespace is not None:
+            try:
+                self.cache.put(namespace, subject, "".join(parts))
+            except OSError:
+                pass
+
+    async def _stream_or_fallback(self, chunks: AsyncIterator[str], fallback: str) -> AsyncIterator[str]:
+        streamed = False
+        try:
+            async for chunk in chunks:
+                streamed = True
+                yield chunk
+        except Exception as e:
+            # after a partial answer there is nothing sensible to append
+            if streamed:
+                raise IncompleteAnswerError("the answer broke off while streaming") from e
+            yield fallback
+
+    async def astream_summary(self, prompt: str, max_length: int = 500) -> AsyncIterator[str]:
+        fallback = self._fallback_summarize(prompt[:1200])
+        if not self.available:
+            yield fallback
+            return
+        if self._is_long(prompt):
+            try:
+                text = "\n\n".join(await self._chunk_summaries(prompt))
+            except Exception:
+                yield fallback
+                return
+            chunks = self._stream("reduce", REDUCE_PROMPT, text, str(max_length), max_length=max_length, text=text)
+        else:
+            chunks = self._stream("summarize", SUMMARIZE_PROMPT, prompt, str(max_length),
+                                  max_length=max_length, text=prompt)
+        async for chunk in self._stream_or_fallback(chunks, fallback):
+            yield chunk
+
+    async def astream_explanation(self, clause: str) -> AsyncIterator[str]:
+        fallback = self._fallback_explain(clause)["explanation"]
+        if not self.available:
+            yield fallback
+            return
+        chunks = self._stream("explain", EXPLAIN_PROMPT, clause, clause=clause)
+        async for chunk in self._stream_or_fallback(chunks, fallback):
+            yield chunk
+
+    async def _summarize_chunk(self, chunk: str) -> str:
+        try:
+            return await self._generate("summarize_chunk", CHUNK_SUMMARY_PROMPT, chunk, str(CHUNK_SUMMARY_WORDS),
+                                        max_length=CHUNK_SUMMARY_WORDS, text=chunk)
+        except Exception:
+            # keep the rest of the summary; this part is represented by its opening
+            return chunk.strip()[:300] + "..."
+
+    async def _combine(self, texts: List[str], max_length: int) -> str:
+        text = "\n\n".join(texts)
+        return await self._generate("reduce", REDUCE_PROMPT, text, str(max_length), max_length=max_length, text=text)
+
+    async def _chunk_summaries(self, prompt: str) -> List[str]:
+        """Map step: summaries of the chunks of a long text, combined in rounds
+        until they fit the chunk budget together."""
+        summaries = list(await asyncio.gather(*(
+            self._summarize_chunk(chunk) for chunk in summary_chunks(prompt, self.summary_chunk_tokens)
+        )))
+        while estimate_tokens("\n\n".join(summaries)) > self.summary_chunk_tokens:
+            groups = pack_texts(summaries, self.summary_chunk_tokens)
+            if len(groups) == len(summaries):
+                break  # no two summaries fit together; the final step takes them as they are
+            summaries = list(await asyncio.gather(*(
+                self._combine([group], CHUNK_SUMMARY_WORDS) for group in groups
+            )))
+        return summaries
+
+    def _is_long(self, prompt: str) -> bool:
+        return estimate_tokens(prompt) > self.summary_chunk_tokens
+
+    async def asummarize(self, prompt: str, max_length: int = 500) -> str:
         if not self.available:
             return self._fallback_summarize(prompt[:1200])
-        
         try:
-            response = self.client.generate_content(
-                f"Summarize this legal text in simple business English (max {max_length} words):\n\n{prompt[:3000]}"
-            )
-            return response.text
-        except Exception as e:
+            if self._is_long(prompt):
+                return await self._combine(await self._chunk_summaries(prompt), max_length)
+            return await self._generate("summarize", SUMMARIZE_PROMPT, prompt, str(max_length),
+                                        max_length=max_length, text=prompt)
+        except Exception:
             return self._fallback_summarize(prompt[:1200])
 
-    def explain_clause(self, clause: str) -> dict:
-        """Explain a clause in simple language with key points."""
+    async def aexplain_clause(self, clause: str) -> dict:
         if not self.available:
             return self._fallback_explain(clause)
-        
         try:
-            prompt = f"""Analyze this legal clause and provide:
-1. Simple explanation (2-3 sentences)
-2. Key obligations (if any)
-3. Key rights (if any) 
-4. Potential risks (if any)
-5. Recommendation for SME
-
-Clause: {clause}"""
-            
-            response = self.client.generate_content(prompt)
-            text = response.text
-            
+            text = await self._generate("explain", EXPLAIN_PROMPT, clause, clause=clause)
             return {
                 "explanation": text,
                 "source": "Gemini API",
                 "available": True
             }
-        except Exception as e:
+        except Exception:
             return self._fallback_explain(clause)
 
-    def suggest_alternative(self, clause: str, risk_level: str) -> dict:
-        """Suggest alternative wording for a problematic clause."""
+    async def asuggest_alternative(self, clause: str, risk_level: str) -> dict:
         if not self.available:
             return self._fallback_alternative(clause, risk_level)
-        
         try:
-            prompt = f"""For this {risk_level}-risk legal clause, suggest a more balanced alternative wording 
-that protects both parties fairly and is SME-friendly:
-
-Original: {clause}
-
-Provide:
-1. Problem with original
-2. Suggested alternative
-3. Why it's better"""
-            
-            response = self.client.generate_content(prompt)
+            text = await self._generate("alternative", ALTERNATIVE_PROMPT, clause, risk_level,
+                                        risk_level=risk_level, clause=clause)
             return {
-                "suggestion": response.text,
+                "suggestion": text,
                 "source": "Gemini API",
                 "available": True
             }
-        except Exception as e:
+        except Exception:
             return self._fallback_alternative(clause, risk_level)
 
-    def risk_reasoning(self, clause: str) -> str:
-        """Generate detailed risk reasoning using LLM."""
+    async def arisk_reasoning(self, clause: str) -> str:
         if not self.available:
             return "Risk assessment based on keyword matching (LLM unavailable)"
-        
         try:
-            prompt = f"""Why is this legal clause risky? Provide brief risk reasoning:
+            return await self._generate("risk", RISK_PROMPT, clause, clause=clause)
+        except Exception:
+            return "Risk assessment based on keyword matching (LLM error)"
 
-{clause}
+    async def _abatch(self, kind: str, clauses: Sequence[str], risk_levels: Optional[Sequence[str]] = None
+                      ) -> List[Optional[str]]:
+        """Answers for many clauses from batched prompts, in input order; None
+        where a clause got no valid answer."""
+        template, field = BATCH_PROMPTS[kind]
+        answers: List[Optional[str]] = [None] * len(clauses)
+        namespaces, items = [], []
+        for i, clause in enumerate(clauses):
+            item = {"id": f"c{i}", "clause": clause}
+            if risk_levels is not None:
+                item["risk_level"] = risk_levels[i]
+            namespace = None
+            if self.cache is not None:
+                namespace = self._namespace(kind, template, item.get("risk_level", ""))
+                answers[i] = self.cache.get(namespace, clause)
+            namespaces.append(namespace)
+            if answers[i] is None:
+                items.append(item)
 
-Format: [Risk Category]: [Specific Concern]"""
-            
-            response = self.client.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return "Risk assessment based on keyword matching (LLM error)"
+        async def send(batch: List[Dict]) -> Dict[str, str]:
+            try:
+                text = await self.agenerate(template.format(items=format_items(batch)))
+            except Exception:
+                return {}
+            return parse_batch_response(text, field, [item["id"] for item in batch])
+
+        batches = pack_batches(items, template, self.batch_tokens)
+        for batch, parsed in zip(batches, await asyncio.gather(*(send(batch) for batch in batches))):
+            for item in batch:
+                i = int(item["id"][1:])
+                answers[i] = parsed.get(item["id"])
+                if answers[i] is not None and namespaces[i] is not None:
+                    try:
+                        self.cache.put(namespaces[i], item["clause"], answers[i])
+                    except OSError:
+                        pass
+        return answers
+
+    async def aexplain_clauses(self, clauses: Sequence[str], batched: bool = False) -> List[dict]:
+        if not (batched and self.available):
+            return list(await asyncio.gather(*(self.aexplain_clause(clause) for clause in clauses)))
+        answers = await self._abatch("explain", clauses)
+        retried = iter(await asyncio.gather(*(
+            self.aexplain_clause(clause) for clause, answer in zip(clauses, answers) if answer is None
+        )))
+        return [
+            {"explanation": answer, "source": "Gemini API", "available": True} if answer is not None else next(retried)
+            for answer in answers
+        ]
+
+    async def asuggest_alternatives(self, clauses: Sequence[str], risk_levels: Sequence[str],
+                                    batched: bool = False) -> List[dict]:
+        if not (batched and self.available):
+            return list(await asyncio.gather(*(
+                self.asuggest_alternative(clause, risk_level) for clause, risk_level in zip(clauses, risk_levels)
+            )))
+        answers = await self._abatch("alternative", clauses, risk_levels)
+        retried = iter(await asyncio.gather(*(
+            self.asuggest_alternative(clause, risk_level)
+            for clause, risk_level, answer in zip(clauses, risk_levels, answers) if answer is None
+        )))
+        return [
+            {"suggestion": answer, "source": "Gemini API", "available": True} if answer is not None else next(retried)
+            for answer in answers
+        ]
+
+    async def arisk_reasonings(self, clauses: Sequence[str], batched: bool = False) -> List[str]:
+        if not (batched and self.available):
+            return list(await asyncio.gather(*(self.arisk_reasoning(clause) for clause in clauses)))
+        answers = await self._abatch("risk", clauses)
+        retried = iter(await asyncio.gather(*(
+            self.arisk_reasoning(clause) for clause, answer in zip(clauses, answers) if answer is None
+        )))
+        return [answer if answer is not None else next(retried) for answer in answers]
+
+    def summarize(self, prompt: str, max_length: int = 500) -> str:
+        """Summarize contract or clause in plain English."""
+        return run_sync(self.asummarize(prompt, max_length))
+
+    def explain_clause(self, clause: str) -> dict:
+        """Explain a clause in simple language with key points."""
+        return run_sync(self.aexplain_clause(clause))
+
+    def suggest_alternative(self, clause: str, risk_level: str) -> dict:
+        """Suggest alternative wording for a problematic clause."""
+        return run_sync(self.asuggest_alternative(clause, risk_level))
+
+    def risk_reasoning(self, clause: str) -> str:
+        """Generate detailed risk reasoning using LLM."""
+        return run_sync(self.arisk_reasoning(clause))
+
+    def explain_clauses(self, clauses: Sequence[str], batched: bool = False) -> List[dict]:
+        """``explain_clause`` for many clauses at once, results in input order."""
+        return run_sync(self.aexplain_clauses(clauses, batched))
+
+    def suggest_alternatives(self, clauses: Sequence[str], risk_levels: Sequence[str],
+                             batched: bool = False) -> List[dict]:
+        """``suggest_alternative`` for many clauses at once, results in input order."""
+        return run_sync(self.asuggest_alternatives(clauses, risk_levels, batched))
+
+    def risk_reasonings(self, clauses: Sequence[str], batched: bool = False) -> List[str]:
+        """``risk_reasoning`` for many clauses at once, results in input order."""
+        return run_sync(self.arisk_reasonings(clauses, batched))
+
+    def stream_summary(self, prompt: str, max_length: int = 500) -> Iterator[str]:
+        """``summarize`` as chunks of text, yielded as they arrive."""
+        return iterate_sync(self.astream_summary(prompt, max_length))
+
+    def stream_explanation(self, clause: str) -> Iterator[str]:
+        """The explanation of ``explain_clause`` as chunks of text, yielded as they arrive."""
+        return iterate_sync(self.astream_explanation(clause))
 
     def _fallback_summarize(self, text: str) -> str:
         """Fallback when Gemini API unavailable."""
         return f"""📝 Summary (Rule-based, Gemini API unavailable):
-        
+
 Key excerpt: {text[:300]}...
 
 To enable AI-powered summaries:
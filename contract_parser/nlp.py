@@ -1,36 +1,90 @@
 import spacy
 from spacy.tokens import Doc
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 import re
 
+from contract_parser.segmentation import clause_texts
+from utils.profiling import timed
+
+
+# pipeline components each output of process_text needs; the rest are disabled
+OUTPUT_COMPONENTS = {
+    "clauses": set(),
+    "entities": {"tok2vec", "ner", "entity_ruler"},
+    "sentences": {"tok2vec", "parser", "senter", "sentencizer"},
+}
+
+
+def split_text(text: str, chunk_chars: int) -> Iterator[str]:
+    """Split text into pieces of at most ``chunk_chars`` characters, preferring
+    to cut after a line break, then after a space. The pieces join back to
+    the text."""
+    start = 0
+    while len(text) - start > chunk_chars:
+        limit = start + chunk_chars
+        cut = text.rfind("\n", start, limit) + 1 or text.rfind(" ", start, limit) + 1 or limit
+        yield text[start:cut]
+        start = cut
+    yield text[start:]
+
 
 class ContractNLP:
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", chunk_chars: int = 100_000,
+                 batch_size: int = 4, n_process: int = 1):
         try:
             self.nlp = spacy.load(model_name)
         except Exception:
             # fallback: blank English model
             self.nlp = spacy.blank("en")
+        self.chunk_chars = chunk_chars
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    def disabled_components(self, outputs: Optional[Iterable[str]]) -> List[str]:
+        """Pipeline components not needed for the requested outputs."""
+        if outputs is None:
+            return []
+        needed = set()
+        for output in outputs:
+            if output not in OUTPUT_COMPONENTS:
+                raise ValueError(f"Unknown output: {output}")
+            needed |= OUTPUT_COMPONENTS[output]
+        return [name for name in self.nlp.pipe_names if name not in needed]
+
+    @timed("spacy")
+    def process_text(self, text: str, outputs: Optional[Iterable[str]] = None) -> Doc:
+        """Run the pipeline over the text.
 
-    def process_text(self, text: str) -> Doc:
+        ``outputs`` names what the Doc is used for ("clauses", "entities",
+        "sentences"); components none of them need are skipped. By default
+        the full pipeline runs. Texts longer than ``chunk_chars`` are split
+        at line breaks and processed with ``nlp.pipe`` (``batch_size``,
+        ``n_process``), then merged into one Doc with the same text, so
+        entity offsets refer to the whole document and ``nlp.max_length``
+        does not limit document size.
+        """
         # Basic cleaning and normalization
         text = text.replace("\r\n", "\n")
-        return self.nlp(text)
+        disable = self.disabled_components(outputs)
+        if len(text) <= self.chunk_chars:
+            return self.nlp(text, disable=disable)
+        docs = list(self.nlp.pipe(
+            split_text(text, self.chunk_chars),
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+            disable=disable,
+        ))
+        return Doc.from_docs(docs, ensure_whitespace=False)
 
     def extract_entities(self, doc: Doc) -> List[Dict]:
         entities = []
         for ent in doc.ents:
-            entities.append({"text": ent.text, "label": ent.label_})
+            entities.append({"text": ent.text, "label": ent.label_, "start": ent.start_char, "end": ent.end_char})
         # naive extractions for amounts and dates if spacy misses
-        amounts = re.findall(r"\bRs\.?\s*[0-9,]+\b|\bINR\s*[0-9,]+\b|\b[0-9,]+\s*(?:rupees|Rs)\b", doc.text)
-        for a in amounts:
-            entities.append({"text": a, "label": "MONEY"})
+        for match in re.finditer(r"\bRs\.?\s*[0-9,]+\b|\bINR\s*[0-9,]+\b|\b[0-9,]+\s*(?:rupees|Rs)\b", doc.text):
+            entities.append({"text": match.group(), "label": "MONEY", "start": match.start(), "end": match.end()})
         return entities
 
     def extract_clauses(self, doc: Doc) -> List[str]:
-        # simple heuristic: split on line breaks and semicolons, keep length > 20
-        raw = doc.text
-        parts = re.split(r"\n{1,}|;|\.\s{2,}", raw)
-        clauses = [p.strip() for p in parts if len(p.strip()) > 20]
-        # limit to first 200 clauses for performance
-        return clauses[:200]
+        # see contract_parser.segmentation for offsets, sections and headings
+        return clause_texts(doc.text)
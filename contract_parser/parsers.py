@@ -1,26 +1,199 @@
 import io
-from typing import Union
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from pdfplumber import open as pdf_open
 import docx
 
+from utils.profiling import timed
 
-def parse_pdf(file_stream) -> str:
-    text_parts = []
-    with pdf_open(file_stream) as pdf:
-        for page in pdf.pages:
-            text_parts.append(page.extract_text() or "")
-    return "\n".join(text_parts)
+try:
+    import pypdfium2
+except ImportError:  # optional fast PDF backend
+    pypdfium2 = None
+
+
+# PDFs with at least this many pages are split across processes when workers > 1
+PARALLEL_MIN_PAGES = 64
+PAGES_PER_TASK = 16
+
+
+class TextChunk(NamedTuple):
+    """One page (PDF), paragraph (DOCX) or block of lines (text) of a document.
+
+    ``start`` and ``end`` are offsets into the full document text, as
+    returned by ``parse_file``; consecutive chunks are separated by a newline
+    when ``start`` is one past the previous ``end``.
+    """
+    text: str
+    start: int
+    end: int
+    index: int
+    kind: str  # "page", "paragraph" or "lines"
+
+
+def _chunks(texts: Iterable[str], kind: str, separator: int = 1) -> Iterator[TextChunk]:
+    start = 0
+    for index, text in enumerate(texts):
+        end = start + len(text)
+        yield TextChunk(text, start, end, index, kind)
+        start = end + separator
+
+
+def join_chunks(chunks: Iterable[TextChunk]) -> str:
+    """Full document text from its chunks."""
+    parts, position = [], 0
+    for chunk in chunks:
+        parts.append("\n" * (chunk.start - position))
+        parts.append(chunk.text)
+        position = chunk.end
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------- PDF
+
+class PdfPlumberBackend:
+    """Text from pdfplumber's character-level layout analysis. Slow, but the
+    reference output."""
+
+    name = "pdfplumber"
+
+    @staticmethod
+    def page_count(source) -> int:
+        with pdf_open(source) as pdf:
+            return len(pdf.pages)
+
+    @staticmethod
+    def page_texts(source, first: int = 0, last: Optional[int] = None) -> Iterator[str]:
+        pages = list(range(first + 1, last + 1)) if last is not None else None
+        with pdf_open(source, pages=pages) as pdf:
+            for page in pdf.pages[first if pages is None else 0:]:
+                yield page.extract_text() or ""
+                # drop the page's parsed layout objects before moving on
+                page.close()
+
+
+class PdfiumBackend:
+    """Plain text from PDFium's text layer (pypdfium2), without layout analysis."""
+
+    name = "pypdfium2"
+
+    @staticmethod
+    def page_count(source) -> int:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def page_texts(source, first: int = 0, last: Optional[int] = None) -> Iterator[str]:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            for i in range(first, len(pdf) if last is None else last):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_bounded()
+                textpage.close()
+                page.close()
+                yield text.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+        finally:
+            pdf.close()
+
+
+PDF_BACKENDS = {PdfPlumberBackend.name: PdfPlumberBackend}
+if pypdfium2 is not None:
+    PDF_BACKENDS[PdfiumBackend.name] = PdfiumBackend
+
+# "auto" uses the fast backend (if installed) for PDFs of at least this many pages
+FAST_BACKEND_MIN_PAGES = 20
+
+
+def pdf_backend_setting() -> str:
+    """PDF backend from ``CONTRACT_PDF_BACKEND``: "auto" (default), "pdfplumber" or "pypdfium2"."""
+    return os.environ.get("CONTRACT_PDF_BACKEND", "auto").lower()
+
+
+def _resolve_backend(backend: str, data: Optional[bytes]) -> Tuple[type, Optional[int]]:
+    """Backend class and, if it had to be counted, the page count."""
+    if backend != "auto":
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown or unavailable PDF backend: {backend}")
+        return PDF_BACKENDS[backend], None
+    if PdfiumBackend.name not in PDF_BACKENDS or data is None:
+        return PdfPlumberBackend, None
+    page_count = PdfiumBackend.page_count(data)
+    if page_count >= FAST_BACKEND_MIN_PAGES:
+        return PdfiumBackend, page_count
+    return PdfPlumberBackend, page_count
+
+
+_worker_pdf_data: Optional[bytes] = None
+
+
+def _init_pdf_worker(data: bytes):
+    global _worker_pdf_data
+    _worker_pdf_data = data
+
+
+def _extract_page_range(backend: str, first: int, last: int) -> List[str]:
+    return list(PDF_BACKENDS[backend].page_texts(io.BytesIO(_worker_pdf_data), first, last))
+
+
+def _parallel_pdf_page_texts(data: bytes, backend: type, page_count: int, workers: int) -> Iterator[str]:
+    ranges = [(first, min(first + PAGES_PER_TASK, page_count)) for first in range(0, page_count, PAGES_PER_TASK)]
+    with ProcessPoolExecutor(workers, initializer=_init_pdf_worker, initargs=(data,)) as pool:
+        for texts in pool.map(_extract_page_range, [backend.name] * len(ranges), *zip(*ranges)):
+            yield from texts
+
+
+def iter_pdf_chunks(file_stream, workers: int = 1, backend: Optional[str] = None) -> Iterator[TextChunk]:
+    """Yield the text of a PDF one page at a time.
+
+    Only the current page is held in memory. ``backend`` is a name in
+    ``PDF_BACKENDS`` or "auto" (default: ``pdf_backend_setting()``); "auto"
+    picks the fast pypdfium2 backend for PDFs of at least
+    ``FAST_BACKEND_MIN_PAGES`` pages and pdfplumber otherwise. With
+    ``workers > 1``, PDFs of at least ``PARALLEL_MIN_PAGES`` pages are
+    extracted by a pool of processes, ``PAGES_PER_TASK`` pages per task,
+    still yielded in order.
+    """
+    backend = (backend or pdf_backend_setting()).lower()
+    data = None
+    if workers > 1 or backend == "auto":
+        data = file_stream.read()
+        file_stream = io.BytesIO(data)
+    backend_class, page_count = _resolve_backend(backend, data)
+    if workers > 1:
+        if page_count is None:
+            page_count = backend_class.page_count(io.BytesIO(data))
+        if page_count >= PARALLEL_MIN_PAGES:
+            return _chunks(_parallel_pdf_page_texts(data, backend_class, page_count, workers), "page")
+    return _chunks(backend_class.page_texts(file_stream), "page")
+
+
+def parse_pdf(file_stream, workers: int = 1, backend: Optional[str] = None) -> str:
+    return join_chunks(iter_pdf_chunks(file_stream, workers, backend))
+
+
+# ---------------------------------------------------------------- DOCX
+
+def iter_docx_chunks(file_stream) -> Iterator[TextChunk]:
+    """Yield the paragraphs of a DOCX document."""
+    # python-docx needs a seekable file; read a copy only if the stream is not
+    if not (hasattr(file_stream, "seekable") and file_stream.seekable()):
+        file_stream = io.BytesIO(file_stream.read())
+    document = docx.Document(file_stream)
+    return _chunks((p.text for p in document.paragraphs), "paragraph")
 
 
 def parse_docx(file_stream) -> str:
-    # python-docx expects a path or a file-like object
-    document = docx.Document(io.BytesIO(file_stream.read()))
-    paragraphs = [p.text for p in document.paragraphs]
-    return "\n".join(paragraphs)
+    return join_chunks(iter_docx_chunks(file_stream))
 
 
-def parse_txt(file_stream) -> str:
-    raw = file_stream.read()
+# ---------------------------------------------------------------- text
+
+def _decode(raw: Union[str, bytes]) -> str:
     if isinstance(raw, bytes):
         try:
             raw = raw.decode("utf-8")
@@ -29,16 +202,60 @@ def parse_txt(file_stream) -> str:
     return raw
 
 
-def parse_file(uploaded_file) -> str:
-    # uploaded_file is a Streamlit UploadedFile with .read() and .type
-    content_type = uploaded_file.type
-    uploaded_file.seek(0)
-    if content_type == "application/pdf" or uploaded_file.name.lower().endswith(".pdf"):
-        uploaded_file.seek(0)
-        return parse_pdf(uploaded_file)
-    if content_type in ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",) or uploaded_file.name.lower().endswith(".docx"):
-        uploaded_file.seek(0)
-        return parse_docx(uploaded_file)
-    # fallback to text
+def iter_txt_chunks(file_stream) -> Iterator[TextChunk]:
+    """Yield a text file as blocks of lines ending at blank lines.
+
+    Chunks keep their line endings, so they are contiguous.
+    """
+    text = _decode(file_stream.read())
+    block, start, index = [], 0, 0
+    for line in text.splitlines(keepends=True):
+        block.append(line)
+        if not line.strip():
+            chunk = "".join(block)
+            yield TextChunk(chunk, start, start + len(chunk), index, "lines")
+            block, start, index = [], start + len(chunk), index + 1
+    if block:
+        chunk = "".join(block)
+        yield TextChunk(chunk, start, start + len(chunk), index, "lines")
+
+
+def parse_txt(file_stream) -> str:
+    return _decode(file_stream.read())
+
+
+# ---------------------------------------------------------------- any file
+
+def _file_kind(uploaded_file) -> str:
+    content_type = getattr(uploaded_file, "type", None)
+    name = uploaded_file.name.lower()
+    if content_type == "application/pdf" or name.endswith(".pdf"):
+        return "pdf"
+    if content_type in ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",) or name.endswith(".docx"):
+        return "docx"
+    return "txt"
+
+
+def iter_chunks(uploaded_file, workers: int = 1, backend: Optional[str] = None) -> Iterator[TextChunk]:
+    """Stream a file's text as chunks with offsets, picking the parser from
+    its content type or name. ``workers`` and ``backend`` apply to PDFs."""
+    # uploaded_file is a Streamlit UploadedFile with .read() and .type, or an open file
+    kind = _file_kind(uploaded_file)
     uploaded_file.seek(0)
-    return parse_txt(uploaded_file)
+    if kind == "pdf":
+        return iter_pdf_chunks(uploaded_file, workers, backend)
+    if kind == "docx":
+        return iter_docx_chunks(uploaded_file)
+    return iter_txt_chunks(uploaded_file)
+
+
+def parse_bytes(data: bytes, filename: str, workers: int = 1, backend: Optional[str] = None) -> str:
+    """Parse the raw bytes of a file, picking the parser from the file name."""
+    stream = io.BytesIO(data)
+    stream.name = filename
+    return parse_file(stream, workers, backend)
+
+
+@timed("parse")
+def parse_file(uploaded_file, workers: int = 1, backend: Optional[str] = None) -> str:
+    return join_chunks(iter_chunks(uploaded_file, workers, backend))
@@ -0,0 +1,205 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+import json
+import math
+import os
+import re
+import tempfile
+
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9]+")
+# function words plus words that appear in nearly every clause and carry no topic
+STOP_WORDS = frozenset("""
+a an and any are as at be been by can for from has have if in into is it its may not of on or
+other such than that the their them then there these this those to under upon was were which
+will with within without shall must all each either both party parties agreement clause clauses
+contract
+""".split())
+
+SOURCES = ("template", "alternative", "issue")
+INDEX_FILE = "reference_index.npz"
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def reference_documents() -> List[Dict]:
+    """One document per template clause, alternative clause and known issue."""
+    from contract_parser.knowledge_base import ContractKnowledgeBase
+    from contract_parser.template_generator import TemplateGenerator
+
+    documents = []
+    for template_key, template in TemplateGenerator.TEMPLATES.items():
+        for section in template["sections"]:
+            for clause in section["clauses"]:
+                documents.append({
+                    "source": "template",
+                    "key": template_key,
+                    "title": f"{template['title']}: {section['heading']}",
+                    "text": clause,
+                    "body": f"{section['heading']} {clause}",
+                })
+    for clause_key, lines in TemplateGenerator.ALTERNATIVE_CLAUSES.items():
+        documents.append({
+            "source": "alternative",
+            "key": clause_key,
+            "title": clause_key.replace("_", " ").title(),
+            "text": lines[1],
+            "body": f"{clause_key.replace('_', ' ')} " + " ".join(lines),
+        })
+    for issue_key, issue in ContractKnowledgeBase.COMMON_ISSUES.items():
+        documents.append({
+            "source": "issue",
+            "key": issue_key,
+            "title": issue["title"],
+            "text": issue["description"],
+            "body": " ".join(issue[field] for field in ("title", "description", "example", "risk", "solution", "sample_fix")),
+        })
+    return documents
+
+
+class ReferenceIndex:
+    """TF-IDF index over the templates, alternative clauses and known issues.
+
+    Documents are stored as an L2-normalized sparse (CSR) term matrix with
+    sublinear term frequencies. ``search`` vectorizes a whole batch of
+    clauses into one sparse query matrix and scores it against every
+    document with a single sparse-dense product, so the cost of a batch is
+    proportional to its total number of distinct terms. The index is saved
+    with numpy and reloaded while the ruleset fingerprint is unchanged.
+    """
+
+    def __init__(self, documents: List[Dict], vocabulary: List[str], idf: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, fingerprint: str = ""):
+        self.documents = documents
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.indptr, self.indices, self.data = indptr, indices, data
+        self.fingerprint = fingerprint
+        # documents as columns of a dense terms x documents matrix, for the product
+        self._doc_columns = np.zeros((len(vocabulary), len(documents)), dtype=np.float32)
+        rows = np.repeat(np.arange(len(documents)), np.diff(indptr))
+        self._doc_columns[indices, rows] = data
+        self._source_mask = {
+            source: np.array([d["source"] == source for d in documents]) for source in SOURCES
+        }
+
+    @classmethod
+    def build(cls, documents: Optional[List[Dict]] = None, fingerprint: str = "") -> "ReferenceIndex":
+        documents = reference_documents() if documents is None else documents
+        counts = [Counter(tokenize(d["body"])) for d in documents]
+        vocabulary = sorted(set().union(*counts))
+        term_ids = {term: i for i, term in enumerate(vocabulary)}
+        df = np.zeros(len(vocabulary), dtype=np.float64)
+        for doc_counts in counts:
+            df[[term_ids[t] for t in doc_counts]] += 1
+        idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+        indptr, indices, data = cls._vectorize(counts, term_ids, idf)
+        return cls(documents, vocabulary, idf, indptr, indices, data, fingerprint)
+
+    @staticmethod
+    def _vectorize(counts: Sequence[Counter], term_ids: Dict[str, int], idf: np.ndarray):
+        """CSR arrays of L2-normalized TF-IDF rows."""
+        indptr, indices, data = [0], [], []
+        for doc_counts in counts:
+            ids = [term_ids[t] for t in doc_counts if t in term_ids]
+            weights = np.array([1 + math.log(doc_counts[t]) for t in doc_counts if t in term_ids], dtype=np.float32)
+            if ids:
+                weights *= idf[ids]
+                weights /= np.linalg.norm(weights)
+            indices.extend(ids)
+            data.extend(weights.tolist())
+            indptr.append(len(indices))
+        return (np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                np.array(data, dtype=np.float32))
+
+    def scores(self, texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every text (rows) with every document (columns)."""
+        indptr, indices, data = self._vectorize([Counter(tokenize(t)) for t in texts], self.term_ids, self.idf)
+        result = np.zeros((len(texts), len(self.documents)), dtype=np.float32)
+        if len(indices):
+            # sparse queries x dense documents: weight each query term's document row, sum per query
+            contributions = self._doc_columns[indices] * data[:, None]
+            nonempty = np.flatnonzero(np.diff(indptr))
+            result[nonempty] = np.add.reduceat(contributions, indptr[nonempty], axis=0)
+        return result
+
+    def search(self, texts: Sequence[str], top_k: int = 3, sources: Optional[Iterable[str]] = None,
+               min_score: float = 0.05) -> List[List[Dict]]:
+        """Top ``top_k`` reference documents for each text, best first.
+
+        ``sources`` restricts results to "template", "alternative" and/or
+        "issue" documents.
+        """
+        scores = self.scores(texts)
+        if sources is not None:
+            allowed = np.zeros(len(self.documents), dtype=bool)
+            for source in sources:
+                allowed |= self._source_mask[source]
+            scores[:, ~allowed] = 0
+        k = min(top_k, len(self.documents))
+        if k <= 0:
+            return [[] for _ in texts]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            ranked = sorted(candidates, key=lambda i: (-row[i], i))
+            results.append([
+                {**{key: self.documents[i][key] for key in ("source", "key", "title", "text")},
+                 "score": round(float(row[i]), 4)}
+                for i in ranked if row[i] >= min_score
+            ])
+        return results
+
+    def save(self, path: str):
+        meta = json.dumps({
+            "fingerprint": self.fingerprint,
+            "documents": self.documents,
+            "vocabulary": self.vocabulary,
+        })
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, meta=np.array(meta), idf=self.idf, indptr=self.indptr, indices=self.indices, data=self.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceIndex":
+        with np.load(path, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays["meta"]))
+            return cls(meta["documents"], meta["vocabulary"], arrays["idf"], arrays["indptr"],
+                       arrays["indices"], arrays["data"], meta["fingerprint"])
+
+    @classmethod
+    def load_or_build(cls, path: str) -> "ReferenceIndex":
+        """The saved index if it matches the current ruleset, else a fresh one (saved for next time)."""
+        from contract_parser.ruleset import ruleset_fingerprint
+        fingerprint = ruleset_fingerprint()
+        try:
+            index = cls.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(fingerprint=fingerprint)
+        try:
+            index.save(path)
+        except OSError:
+            pass  # a read-only disk only costs the rebuild
+        return index
+
+
+def default_index_path() -> str:
+    from utils.cache import DEFAULT_DIRECTORY
+    return os.path.join(os.environ.get("CONTRACT_CACHE_DIR", DEFAULT_DIRECTORY), INDEX_FILE)
+
+
+@lru_cache(maxsize=1)
+def reference_index() -> ReferenceIndex:
+    """Process-wide reference index, loaded from (or saved to) the cache directory."""
+    return ReferenceIndex.load_or_build(default_index_path())
@@ -1,5 +1,6 @@
 from typing import Tuple, List
 import re
+from contract_parser.rule_engine import RuleEngine
 
 
 class RiskAssessor:
@@ -17,19 +18,22 @@ class RiskAssessor:
             (re.compile(r"intellectual property|ip transfer|assign of ip|assigns? rights", re.I), "High", "IP transfer or assignment clause"),
             (re.compile(r"confidenti|non ?disclos", re.I), "Low", "Confidentiality / NDA clause"),
         ]
+        # heuristics: long indemnities or monetary penalties increase score
+        self.escalation_pattern = r"\b(liquidated damages|damages|penalty)\b"
+        self.engine = RuleEngine([p.pattern for p, _, _ in self.rules] + [self.escalation_pattern])
 
     def score_clause(self, clause: str) -> Tuple[str, List[str]]:
         reasons = []
         weights = {"Low": 1, "Medium": 2, "High": 3}
         max_score = 0
-        for pattern, level, reason in self.rules:
-            if pattern.search(clause):
-                reasons.append(reason)
-                max_score = max(max_score, weights[level])
-
-        # heuristics: long indemnities or monetary penalties increase score
-        if re.search(r"\b(liquidated damages|damages|penalty)\b", clause, re.I):
-            max_score = max(max_score, 3)
+        escalation = len(self.rules)
+        for i in self.engine.scan(clause):
+            if i == escalation:
+                max_score = 3
+                continue
+            _, level, reason = self.rules[i]
+            reasons.append(reason)
+            max_score = max(max_score, weights[level])
 
         if max_score == 3:
             return "High", reasons
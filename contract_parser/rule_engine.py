@@ -0,0 +1,40 @@
+from typing import List, Sequence
+import re
+
+
+class RuleEngine:
+    """Match a table of regex rules against clauses, folding case once per clause.
+
+    Rules are precompiled case-sensitively and run against the lowercased
+    clause. ``re.IGNORECASE`` disables the literal-prefix search that makes
+    keyword-style patterns fast, so this is several times quicker than
+    searching each rule with the flag. Patterns containing uppercase characters
+    (e.g. ``\\B`` or ``\\S``) keep ``re.IGNORECASE`` and see the original text.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._compiled = []
+        self._folded = []
+        for pattern in self.patterns:
+            folded = pattern == pattern.lower()
+            self._compiled.append(re.compile(pattern) if folded else re.compile(pattern, re.IGNORECASE))
+            self._folded.append(folded)
+        self._all_folded = all(self._folded)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def scan(self, text: str) -> List[int]:
+        """Indices of every rule that matches the text, in rule-table order."""
+        lowered = text.lower()
+        if self._all_folded:
+            return [i for i, pattern in enumerate(self._compiled) if pattern.search(lowered)]
+        return [
+            i for i, pattern in enumerate(self._compiled)
+            if pattern.search(lowered if self._folded[i] else text)
+        ]
+
+    def scan_many(self, texts: Sequence[str]) -> List[List[int]]:
+        """Rule hits for each text."""
+        return [self.scan(text) for text in texts]
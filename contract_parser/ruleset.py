@@ -0,0 +1,48 @@
+from functools import lru_cache
+import hashlib
+import json
+import os
+
+
+# bump to invalidate cached analyses after a change the fingerprint cannot see
+RULESET_VERSION = 1
+
+
+def rule_tables() -> dict:
+    """Every rule and keyword table that shapes analysis results."""
+    from contract_parser import __version__
+    from contract_parser.advanced_nlp import ContractClassifier, EntityExtractor
+    from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+    from contract_parser.clause_classifier import ClauseClassifier
+    from contract_parser.compliance_checker import ComplianceChecker
+    from contract_parser.risk_assessor import RiskAssessor
+
+    return {
+        "version": [__version__, RULESET_VERSION],
+        "risk_rules": [(p.pattern, level, reason) for p, level, reason in RiskAssessor().rules],
+        "detailed_rules": AdvancedRiskAssessor().detailed_rules,
+        "ambiguity_rules": AdvancedRiskAssessor.AMBIGUITY_RULES,
+        "compliance_rules": ComplianceChecker.COMPLIANCE_RULES,
+        "india_rules": ComplianceChecker.INDIA_SPECIFIC_RULES,
+        "law_keywords": ComplianceChecker.INDIAN_LAW_KEYWORDS,
+        "clause_categories": ClauseClassifier.CLAUSE_CATEGORIES,
+        "contract_types": ContractClassifier.TYPES,
+        "modalities": EntityExtractor.MODALITY_KEYWORDS,
+    }
+
+
+@lru_cache(maxsize=1)
+def ruleset_fingerprint() -> str:
+    """Short digest of the rule tables and the analysis source code.
+
+    Cached analysis results are keyed by it, so editing a rule table (or any
+    module of this package) makes earlier entries unreachable.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(rule_tables(), sort_keys=True, default=str).encode("utf-8"))
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(package_dir, name), "rb") as f:
+                digest.update(name.encode("utf-8") + b"\0" + f.read())
+    return digest.hexdigest()[:16]
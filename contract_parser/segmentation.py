@@ -0,0 +1,110 @@
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+import re
+
+
+# clause boundaries: line breaks, semicolons, and a full stop followed by 2+ spaces
+BOUNDARY = re.compile(r"\n+|;|\.\s{2,}")
+# "1.", "4.2", "Section 3", "Article 5.1)" at the start of a line
+SECTION_NUMBER = re.compile(r"(?:(?:section|clause|article)\s+)?(\d+(?:\.\d+)*)[.):]?(?:\s+|$)", re.IGNORECASE)
+# "Payment Terms:" after a section number
+INLINE_HEADING = re.compile(r"([A-Z][\w&/,'\- ]{1,60}?):\s+")
+
+MIN_CLAUSE_CHARS = 20
+MAX_HEADING_CHARS = 80
+
+
+class Clause(NamedTuple):
+    """One clause of a document: ``text`` is ``document[start:end]``."""
+    index: int
+    start: int
+    end: int
+    text: str
+    section: Optional[str]  # e.g. "4.2"
+    heading: Optional[str]  # e.g. "Payment Terms"
+
+
+def heading_text(line: str) -> Optional[str]:
+    """The heading if the line is one: short, no closing punctuation, mostly
+    Latin script or with a significant (4+ letter) Latin word, and either in
+    capitals or with its significant words capitalized."""
+    if len(line) > MAX_HEADING_CHARS or line[-1] in ".;,\u0964":
+        return None
+    title = line.rstrip(":").strip()
+    words = re.findall(r"[A-Za-z]+", title)
+    if not words or len(words) > 10:
+        return None
+    significant = [w for w in words if len(w) > 3]
+    # a Hindi sentence mentioning "Party A" or "Rs" is not a heading
+    if not significant and 2 * sum(map(len, words)) < sum(c.isalpha() for c in title):
+        return None
+    if title.isupper() or all(w[0].isupper() for w in significant):
+        return title
+    return None
+
+
+def _pieces(text: str) -> Iterator[Tuple[int, int, bool, bool]]:
+    """Start and end of the text between boundaries, and whether the piece
+    starts and ends a line."""
+    position, line_start = 0, True
+    for boundary in BOUNDARY.finditer(text):
+        line_end = "\n" in boundary.group()
+        yield position, boundary.start(), line_start, line_end
+        position, line_start = boundary.end(), line_end
+    yield position, len(text), line_start, True
+
+
+def segment_clauses(text: str, min_chars: int = MIN_CLAUSE_CHARS) -> Iterator[Clause]:
+    """Split a document into clauses in one pass over the text.
+
+    Clauses are the pieces between line breaks, semicolons and sentence ends
+    followed by two or more spaces, stripped, keeping pieces longer than
+    ``min_chars``. Each clause carries its offsets, the section number in
+    force (from a numbered line such as ``4.2`` or ``Section 4``) and the
+    current heading (a heading line such as ``PAYMENT TERMS``, or an inline
+    ``4. Payment Terms: ...``). A heading line is also a clause if its text
+    is longer than ``min_chars``, since an all-caps or title-case line may
+    as well be an operative sentence. There is no limit on the number of
+    clauses.
+    """
+    section = heading = None
+    index = 0
+    for piece_start, piece_end, at_line_start, line_end in _pieces(text):
+        piece = text[piece_start:piece_end]
+        lstripped = piece.lstrip()
+        if not lstripped:
+            continue
+        piece_start += len(piece) - len(lstripped)
+        piece = lstripped.rstrip()
+        piece_end = piece_start + len(piece)
+
+        if at_line_start:
+            numbered = SECTION_NUMBER.match(piece)
+            if numbered:
+                number = numbered.group(1)
+                if section is None or number.split(".")[0] != section.split(".")[0]:
+                    heading = None
+                section = number
+                rest = piece[numbered.end():]
+                title = heading_text(rest) if rest and line_end else None
+                inline = INLINE_HEADING.match(rest) if title is None and rest else None
+                if title is not None or not rest:
+                    heading = title or heading
+                    if title is None or len(title) <= min_chars:
+                        continue
+                elif inline:
+                    heading = inline.group(1).strip()
+            elif line_end:
+                title = heading_text(piece)
+                if title is not None:
+                    section, heading = None, title
+                    if len(title) <= min_chars:
+                        continue
+
+        if piece_end - piece_start > min_chars:
+            yield Clause(index, piece_start, piece_end, piece, section, heading)
+            index += 1
+
+
+def clause_texts(text: str, min_chars: int = MIN_CLAUSE_CHARS) -> List[str]:
+    """Text of every clause of the document."""
+    return [clause.text for clause in segment_clauses(text, min_chars)]
@@ -0,0 +1,114 @@
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Sequence
+import re
+import zlib
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize(text: str) -> str:
+    """Lowercased text with whitespace runs collapsed, as compared by the index."""
+    return re.sub(r"\s+", " ", text.lower()).strip()
+
+
+def shingles(text: str, size: int) -> np.ndarray:
+    """32-bit hashes of the distinct character ``size``-grams of normalized text."""
+    if len(text) <= size:
+        grams = {text}
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class ClauseIndex:
+    """MinHash/LSH index for finding similar clauses in a clause library.
+
+    Each clause is reduced to its character shingles and a MinHash signature
+    of ``bands * rows`` hash functions. Clauses sharing any band of ``rows``
+    signature values land in the same bucket and become candidates. Only the
+    candidates are scored, with the same SequenceMatcher ratio as
+    ``ClauseSimilarity``, so a query costs a handful of exact comparisons
+    instead of one per library clause. Pairs with little shingle overlap can
+    be missed; ``benchmarks/bench_clause_similarity.py`` measures
+    the recall against a full scan.
+    """
+
+    def __init__(self, clauses: Iterable[str] = (), shingle_size: int = 4, bands: int = 48, rows: int = 2,
+                 seed: int = 1):
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.RandomState(seed)
+        num_perm = bands * rows
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.clauses: List[str] = []
+        self._lowered: List[str] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self.add_many(clauses)
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def signature(self, normalized: str) -> np.ndarray:
+        """MinHash signature of normalized text."""
+        hashes = shingles(normalized, self.shingle_size)
+        if not len(hashes):
+            return np.full(self.bands * self.rows, _MAX_HASH, dtype=np.uint64)
+        permuted = np.bitwise_and((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME, _MAX_HASH)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def add(self, clause: str) -> int:
+        """Add a clause to the library; returns its id."""
+        clause_id = len(self.clauses)
+        self.clauses.append(clause)
+        self._lowered.append(clause.lower())
+        for buckets, key in zip(self._buckets, self._band_keys(self.signature(normalize(clause)))):
+            buckets.setdefault(key, []).append(clause_id)
+        return clause_id
+
+    def add_many(self, clauses: Iterable[str]):
+        for clause in clauses:
+            self.add(clause)
+
+    def candidates(self, clause: str) -> List[int]:
+        """Ids of library clauses sharing at least one LSH bucket with the clause."""
+        return self._candidates(self.signature(normalize(clause)))
+
+    def _candidates(self, signature: np.ndarray) -> List[int]:
+        found = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            found.update(buckets.get(key, ()))
+        return sorted(found)
+
+    def query(self, clause: str, threshold: float = 0.7, top_k: Optional[int] = None) -> List[Dict]:
+        """Library clauses with a similarity score of at least ``threshold``,
+        best first, in the shape of ``ClauseSimilarity.find_similar_clauses``."""
+        matcher = SequenceMatcher(None, clause.lower())
+        results = []
+        for clause_id in self._candidates(self.signature(normalize(clause))):
+            matcher.set_seq2(self._lowered[clause_id])
+            # cheap upper bounds of ratio() first
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                results.append({"template_clause": self.clauses[clause_id], "similarity_score": score})
+        results.sort(key=lambda x: x["similarity_score"], reverse=True)
+        return results[:top_k] if top_k is not None else results
+
+    def query_many(self, clauses: Sequence[str], threshold: float = 0.7, top_k: Optional[int] = None) -> List[List[Dict]]:
+        """``query`` for every clause of a contract; repeated clauses are scored once."""
+        seen: Dict[str, List[Dict]] = {}
+        results = []
+        for clause in clauses:
+            if clause not in seen:
+                seen[clause] = self.query(clause, threshold, top_k)
+            results.append([dict(match) for match in seen[clause]])
+        return results
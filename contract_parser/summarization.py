@@ -0,0 +1,74 @@
+from typing import List
+import zlib
+
+from contract_parser.segmentation import segment_clauses
+
+CHARS_PER_TOKEN = 4  # rough average for English legal text
+SUMMARY_CHUNK_TOKENS = 1500
+# a chunk may end early at a content-defined boundary once it has this share of the budget
+MIN_CHUNK_SHARE = 0.25
+BOUNDARY_MODULUS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_long(piece: str, max_chars: int) -> List[str]:
+    """Cut a piece longer than ``max_chars`` at whitespace."""
+    parts = []
+    while len(piece) > max_chars:
+        cut = piece.rfind(" ", 0, max_chars) + 1 or max_chars
+        parts.append(piece[:cut])
+        piece = piece[cut:]
+    parts.append(piece)
+    return parts
+
+
+def clause_pieces(text: str) -> List[str]:
+    """The text cut at the start of the line of every clause; the pieces
+    concatenate back to the text."""
+    cuts = sorted({text.rfind("\n", 0, clause.start) + 1 for clause in segment_clauses(text)} | {0})
+    return [text[start:end] for start, end in zip(cuts, cuts[1:] + [len(text)]) if start < end]
+
+
+def summary_chunks(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS) -> List[str]:
+    """Split a contract along clause boundaries into chunks of at most
+    ``max_tokens`` (estimated) each, covering the whole text in order.
+
+    Besides closing a chunk when the next clause would overflow it, a chunk
+    also ends after any clause whose hash hits a fixed residue (once the
+    chunk holds ``MIN_CHUNK_SHARE`` of the budget). These content-defined
+    boundaries do not move when text elsewhere changes, so an edit only
+    changes the chunks around it and the other chunk summaries stay cached.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    min_chars = int(max_chars * MIN_CHUNK_SHARE)
+    chunks, current, size = [], [], 0
+    for clause_piece in clause_pieces(text):
+        for piece in _split_long(clause_piece, max_chars):
+            if current and size + len(piece) > max_chars:
+                chunks.append("".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece)
+            if size >= min_chars and zlib.crc32(piece.strip().encode("utf-8")) % BOUNDARY_MODULUS == 0:
+                chunks.append("".join(current))
+                current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def pack_texts(texts: List[str], max_tokens: int, separator: str = "\n\n") -> List[str]:
+    """Join consecutive texts into as few groups of at most ``max_tokens``
+    as possible (a single text over the budget stays alone)."""
+    groups, current = [], []
+    for text in texts:
+        if current and estimate_tokens(separator.join(current + [text])) > max_tokens:
+            groups.append(separator.join(current))
+            current = []
+        current.append(text)
+    if current:
+        groups.append(separator.join(current))
+    return groups
@@ -3,8 +3,8 @@ Integration Guide for Contract Analysis Bot
 This module shows how to use the bot programmatically (not just via Streamlit UI)
 """
 
-from contract_parser.parsers import parse_file
-from contract_parser.nlp import ContractNLP
+from contract_parser.parsers import parse_file, parse_bytes
+from contract_parser.segmentation import segment_clauses
 from contract_parser.advanced_nlp import (
     ContractClassifier,
     EntityExtractor,
@@ -15,6 +15,7 @@ from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
 from contract_parser.compliance_checker import ComplianceChecker
 from contract_parser.template_generator import TemplateGenerator
 from utils.audit import AuditLogger
+from utils.cache import shared_cache, text_kind
 import json
 
 
@@ -25,12 +26,24 @@ class ContractAnalysisAPI:
     """
 
     def __init__(self):
-        self.nlp = ContractNLP()
         self.classifier = ContractClassifier()
         self.entity_extractor = EntityExtractor()
         self.risk_assessor = AdvancedRiskAssessor()
         self.compliance_checker = ComplianceChecker()
         self.audit = AuditLogger("audit_logs.json")
+        self.cache = shared_cache()
+
+    def analyze_contract_file(self, data: bytes, filename: str, language: str = "English") -> dict:
+        """
+        Analyze contract from the raw bytes of a PDF, DOCX or TXT file.
+
+        Parsed text is cached by the SHA-256 of the bytes.
+        """
+        if self.cache is not None:
+            text = self.cache.get_or_compute(data, text_kind(filename), lambda: parse_bytes(data, filename))
+        else:
+            text = parse_bytes(data, filename)
+        return self.analyze_contract_text(text, language)
 
     def analyze_contract_text(self, text: str, language: str = "English") -> dict:
         """
@@ -41,8 +54,22 @@ class ContractAnalysisAPI:
             language: "English" or "Hindi"
         
         Returns:
-            dict with analysis results
+            dict with analysis results (cached by content hash and ruleset)
         """
+        if self.cache is not None:
+            result = self.cache.get_or_compute(text, f"api:{language}", lambda: self._analyze(text, language))
+        else:
+            result = self._analyze(text, language)
+
+        # Log event
+        self.audit.log_event("contract_analyzed", {
+            "contract_type": result["metadata"]["contract_type"],
+            "clause_count": result["metadata"]["total_clauses"],
+            "risk_level": result["risk_assessment"]["overall_risk"],
+        })
+        return result
+
+    def _analyze(self, text: str, language: str) -> dict:
         # Normalize if Hindi
         if language == "Hindi":
             text = HindiNormalizer.normalize(text)
@@ -54,22 +81,20 @@ class ContractAnalysisAPI:
         parties = self.entity_extractor.extract_parties(text)
         dates = self.entity_extractor.extract_dates(text)
         amounts = self.entity_extractor.extract_amounts(text)
-        obligations = self.entity_extractor.extract_obligations(text)
-        rights = self.entity_extractor.extract_rights(text)
-        prohibitions = self.entity_extractor.extract_prohibitions(text)
-
-        # Process NLP
-        doc = self.nlp.process_text(text)
-        clauses = self.nlp.extract_clauses(doc)
+        modalities = self.entity_extractor.extract_modalities(text)
+        obligations = modalities["obligations"]
+        rights = modalities["rights"]
+        prohibitions = modalities["prohibitions"]
 
         # Score clauses
         clause_results = []
-        for i, clause in enumerate(clauses):
-            detailed_score = self.risk_assessor.score_clause_detailed(clause)
-            ambiguities = self.risk_assessor.detect_ambiguities(clause)
+        for clause in segment_clauses(text):
+            detailed_score = self.risk_assessor.score_clause_detailed(clause.text)
+            ambiguities = self.risk_assessor.detect_ambiguities(clause.text)
             clause_results.append({
-                "clause_index": i,
-                "text": clause[:200],
+                "clause_index": clause.index,
+                "section": clause.section,
+                "text": clause.text[:200],
                 "risk_level": detailed_score["overall_risk"],
                 "issues_count": detailed_score["issues_found"],
                 "ambiguities_count": len(ambiguities),
@@ -83,18 +108,11 @@ class ContractAnalysisAPI:
         # Compliance
         compliance = self.compliance_checker.generate_compliance_report(text)
 
-        # Log event
-        self.audit.log_event("contract_analyzed", {
-            "contract_type": classification["type"],
-            "clause_count": len(clauses),
-            "risk_level": contract_risk,
-        })
-
         return {
             "metadata": {
                 "contract_type": classification["type"],
                 "confidence": classification["confidence"],
-                "total_clauses": len(clauses),
+                "total_clauses": len(clause_results),
                 "total_chars": len(text),
             },
             "entities": {
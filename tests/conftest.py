@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_analysis_cache(tmp_path, monkeypatch):
+    """Keep the shared analysis cache out of the working directory."""
+    monkeypatch.setenv("CONTRACT_CACHE_DIR", str(tmp_path / "analysis_cache"))
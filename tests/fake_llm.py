@@ -0,0 +1,116 @@
+"""Local stand-ins for the Gemini model, with injected latency and faults."""
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+
+def split_chunks(text: str, words: int = 3):
+    parts = text.split(" ")
+    return [" ".join(parts[i:i + words]) + (" " if i + words < len(parts) else "") for i in range(0, len(parts), words)]
+
+
+class FakeModel:
+    """Async model stub that answers every prompt after ``latency`` seconds.
+
+    ``failures`` is the number of calls that raise before the model starts
+    answering; ``hang`` makes every call sleep for that long instead. With
+    ``stream=True`` the answer arrives in chunks of a few words, the first
+    after ``latency`` and the others ``chunk_latency`` apart; ``break_after``
+    makes a stream fail after that many chunks. Tracks calls and the highest
+    number of calls in flight at once.
+    """
+
+    model_name = "fake-model"
+
+    def __init__(self, latency: float = 0.0, failures: int = 0, hang: float = 0.0,
+                 chunk_latency: float = 0.0, break_after: int = None):
+        self.latency = latency
+        self.failures = failures
+        self.hang = hang
+        self.chunk_latency = chunk_latency
+        self.break_after = break_after
+        self.prompts = []
+        self.call_times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def reply(self, prompt: str) -> str:
+        return f"answer to: {prompt}"
+
+    async def _answer(self, prompt: str):
+        self.prompts.append(prompt)
+        self.call_times.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.hang or self.latency)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("injected failure")
+            return self.reply(prompt)
+        finally:
+            self.in_flight -= 1
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if stream:
+            return self._stream(prompt)
+        return SimpleNamespace(text=await self._answer(prompt))
+
+    async def _stream(self, prompt: str):
+        text = await self._answer(prompt)
+        for i, chunk in enumerate(split_chunks(text)):
+            if i:
+                await asyncio.sleep(self.chunk_latency)
+            if i == self.break_after:
+                raise ConnectionError("injected stream failure")
+            yield SimpleNamespace(text=chunk)
+
+
+class BlockingFakeModel:
+    """Sync-only model stub, like a client without ``generate_content_async``."""
+
+    model_name = "blocking-fake-model"
+
+    def __init__(self, latency: float = 0.0, chunk_latency: float = 0.0):
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        self.prompts = []
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        self.prompts.append(prompt)
+        time.sleep(self.latency)
+        text = f"blocking answer to: {prompt}"
+        if stream:
+            return self._stream(text)
+        return SimpleNamespace(text=text)
+
+    def _stream(self, text: str):
+        for i, chunk in enumerate(split_chunks(text)):
+            if i:
+                time.sleep(self.chunk_latency)
+            yield SimpleNamespace(text=chunk)
+
+
+class FaultyModel(FakeModel):
+    """Fault-injecting model: while ``down`` every call fails (after
+    ``latency``); otherwise a seeded share ``error_rate`` of calls fails and
+    a share ``slow_rate`` takes ``slow_latency`` longer."""
+
+    def __init__(self, error_rate: float = 0.0, slow_rate: float = 0.0, slow_latency: float = 0.0,
+                 seed: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.down = False
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self._random = random.Random(seed)
+
+    async def _answer(self, prompt: str):
+        if self.down or self._random.random() < self.error_rate:
+            self.prompts.append(prompt)
+            await asyncio.sleep(self.latency)
+            raise ConnectionError("injected fault")
+        if self._random.random() < self.slow_rate:
+            await asyncio.sleep(self.slow_latency)
+        return await super()._answer(prompt)
@@ -7,6 +7,7 @@ from contract_parser.advanced_nlp import (
     ClauseSimilarity,
     ContractClassifier,
     EntityExtractor,
+    DocumentContext,
 )
 from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
 from contract_parser.compliance_checker import ComplianceChecker
@@ -74,6 +75,34 @@ class TestEntityExtractor:
         prohibitions = EntityExtractor.extract_prohibitions(text)
         assert len(prohibitions) > 0
 
+    def test_extract_modalities_segments_once(self, monkeypatch):
+        from contract_parser import advanced_nlp
+        calls = []
+        real_split = advanced_nlp.split_sentences
+        monkeypatch.setattr(advanced_nlp, "split_sentences", lambda text: calls.append(text) or real_split(text))
+        text = "Vendor shall deliver. Buyer may inspect. Vendor shall not subcontract. Segmented once."
+        modalities = EntityExtractor.extract_modalities(text)
+        assert EntityExtractor.extract_obligations(text) == modalities["obligations"]
+        assert EntityExtractor.extract_rights(text) == ["Buyer may inspect."]
+        assert EntityExtractor.extract_prohibitions(text) == ["Vendor shall not subcontract."]
+        assert len(calls) == 1
+
+
+class TestDocumentContext:
+    """Test the per-document context cache."""
+
+    def test_cached_by_content(self):
+        text = "First sentence. Second sentence."
+        context = DocumentContext.for_text(text)
+        assert DocumentContext.for_text(text[:5] + text[5:]) is context
+        assert context.sentences == ["First sentence.", "Second sentence."]
+
+    def test_cache_is_bounded(self):
+        first = DocumentContext.for_text("bounded 0")
+        for i in range(1, DocumentContext.CACHE_SIZE + 1):
+            DocumentContext.for_text(f"bounded {i}")
+        assert DocumentContext.for_text("bounded 0") is not first
+
 
 class TestClauseSimilarity:
     """Test clause similarity matching."""
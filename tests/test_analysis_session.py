@@ -0,0 +1,53 @@
+from contract_parser.advanced_nlp import ContractClassifier
+from contract_parser.analysis_session import AnalysisSession
+from utils.cache import AnalysisCache
+
+CONTRACT = (
+    b"This Agreement is made between Acme Pvt Ltd and Beta LLP on 01/04/2024.\n\n"
+    b"The Vendor shall deliver the goods within 30 days. Payment of Rs. 50,000 is due on delivery.\n\n"
+    b"Either party may terminate this Agreement with unlimited liability and without notice.\n\n"
+    b"This Agreement is governed by the laws of India and disputes go to arbitration in Mumbai."
+)
+
+
+class TestAnalysisSession:
+    """Test the per-upload memoized analysis."""
+
+    def test_stages(self):
+        session = AnalysisSession(CONTRACT, "contract.txt")
+        assert session.raw_text == CONTRACT.decode()
+        assert session.classification["type"]
+        assert set(session.entities) == {"parties", "dates", "amounts"}
+        assert session.clause_results
+        assert session.contract_risk in ("Low", "Medium", "High")
+        assert "overall_compliance_status" in session.compliance_report
+        assert len(session.clause_classes) == len(session.clause_results[:50])
+
+    def test_each_stage_runs_once(self, monkeypatch):
+        calls = []
+        classify = ContractClassifier.classify
+        monkeypatch.setattr(ContractClassifier, "classify", staticmethod(lambda text: calls.append(1) or classify(text)))
+        session = AnalysisSession(CONTRACT, "contract.txt")
+        first = session.classification
+        assert session.classification is first
+        assert len(calls) == 1
+        assert set(session.timings) == {"raw_text", "classification"}
+
+    def test_key_depends_on_content_and_language(self):
+        key = AnalysisSession.session_key(CONTRACT)
+        assert AnalysisSession(CONTRACT, "other_name.txt").key == key
+        assert AnalysisSession.session_key(CONTRACT, "Hindi") != key
+        assert AnalysisSession.session_key(CONTRACT + b" ") != key
+
+    def test_stages_shared_through_cache(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "c"), fingerprint="f1")
+        first = AnalysisSession(CONTRACT, "contract.txt", cache=cache)
+        results = first.clause_results.to_dicts()
+        second = AnalysisSession(CONTRACT, "contract.txt", cache=cache)
+        assert second.clause_results.to_dicts() == results
+
+    def test_first_time(self):
+        session = AnalysisSession(CONTRACT, "contract.txt")
+        assert session.first_time("upload_logged")
+        assert not session.first_time("upload_logged")
+        assert session.first_time("risk_analysis_logged")
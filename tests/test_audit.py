@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+
+from utils.audit import AuditLogger
+from utils.audit_store import SegmentedLogStore, migrate_legacy_json
+
+
+class TestSegmentedLogStore:
+    """Test the append-only segment store."""
+
+    def test_append_and_stream(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path / "log.d"), fsync="never")
+        for i in range(5):
+            store.append({"n": i})
+        assert [e["n"] for e in store.iter_entries()] == [0, 1, 2, 3, 4]
+
+    def test_rotates_by_size(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path / "log.d"), max_segment_bytes=64, fsync="never")
+        for i in range(20):
+            store.append({"n": i, "pad": "x" * 20})
+        assert len(store.segments()) > 1
+        assert [e["n"] for e in store.iter_entries()] == list(range(20))
+
+    def test_rotates_by_age(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path / "log.d"), max_segment_age=0, fsync="never")
+        store.append({"n": 1})
+        store.append({"n": 2})
+        assert len(store.segments()) == 2
+
+    def test_append_returns_position(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path / "log.d"), fsync="always")
+        store.append({"n": 1})
+        segment, start, end = store.append({"n": 2})
+        assert store.read_at(segment, start, end) == {"n": 2}
+
+    def test_ignores_torn_trailing_line(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path / "log.d"), fsync="never")
+        store.append({"n": 1})
+        store.close()
+        with open(store.segment_path(store.segments()[-1]), "ab") as f:
+            f.write(b'{"n": 2')
+        assert [e["n"] for e in store.iter_entries()] == [1]
+
+    def test_migrate_legacy_json(self, tmp_path):
+        legacy = tmp_path / "audit_logs.json"
+        legacy.write_text(json.dumps([{"event": "a"}, {"event": "b"}]), encoding="utf-8")
+        store = SegmentedLogStore(str(tmp_path / "audit_logs.d"), fsync="never")
+        assert migrate_legacy_json(str(legacy), store) == 2
+        assert not legacy.exists()
+        assert os.path.exists(str(legacy) + ".migrated")
+        assert [e["event"] for e in store.iter_entries()] == ["a", "b"]
+
+
+class TestAuditLogger:
+    """Test audit logging on top of the segment store."""
+
+    def test_log_and_report(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        audit.log_contract_upload("a.pdf", 100)
+        audit.log_error("boom")
+        assert len(audit.get_audit_report()) == 2
+        assert len(audit.get_audit_report({"severity": "ERROR"})) == 1
+
+    def test_compliance_summary(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        audit.log_contract_upload("a.pdf", 100)
+        audit.log_error("boom")
+        summary = audit.get_compliance_summary()
+        assert summary["total_events"] == 2
+        assert summary["total_errors"] == 1
+        assert summary["error_rate_percent"] == 50.0
+
+    def test_with_session_shares_the_store(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        other = audit.with_session("other-session")
+        audit.log_error("mine")
+        other.log_error("theirs")
+        assert [e["payload"]["message"] for e in other.get_session_events()] == ["theirs"]
+        assert audit.get_compliance_summary()["total_events"] == 2
+
+    def test_existing_log_is_migrated(self, tmp_path):
+        legacy = tmp_path / "audit_logs.json"
+        legacy.write_text(json.dumps([{"event": "old", "timestamp": "2025-01-01T00:00:00Z"}]), encoding="utf-8")
+        audit = AuditLogger(str(legacy), fsync="never")
+        audit.log_error("new")
+        assert [e["event"] for e in audit.iter_events()] == ["old", "error"]
+
+
+class TestAuditIndex:
+    """Test indexed audit queries."""
+
+    def test_session_filter_is_applied(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        audit.log_error("mine")
+        other = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        other.session_id = "other"
+        other.log_error("theirs")
+        events = audit.get_session_events()
+        assert [e["payload"]["message"] for e in events] == ["mine"]
+
+    def test_pagination_newest_first(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        for i in range(25):
+            audit.log_event("tick", {"n": i})
+        page = audit.query_events({"event_type": "tick"}, limit=10, offset=10, newest_first=True)
+        assert [e["payload"]["n"] for e in page] == list(range(14, 4, -1))
+        assert audit.count_events({"event_type": "tick"}) == 25
+
+    def test_streaming_picks_up_new_events(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        audit.log_event("a", {})
+        assert audit.count_events() == 1
+        audit.log_event("b", {})
+        assert [e["event"] for e in audit.iter_audit_report()] == ["a", "b"]
+        assert audit.get_event_types() == ["a", "b"]
+
+    def test_index_rebuilds_when_deleted(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        audit.log_event("a", {})
+        audit.close()
+        os.remove(audit.index.path)
+        reopened = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        assert reopened.count_events({"event_type": "a"}) == 1
+
+
+class TestAuditAggregates:
+    """Test incrementally maintained summary counters."""
+
+    def test_summary_matches_full_rebuild(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never", checkpoint_every=3)
+        for i in range(10):
+            audit.log_event("tick", {"n": i}, severity="ERROR" if i % 5 == 0 else "INFO")
+        incremental = audit.get_compliance_summary()
+        audit.rebuild_aggregates()
+        assert audit.get_compliance_summary() == incremental
+        assert incremental["total_events"] == 10
+        assert incremental["total_errors"] == 2
+
+    def test_checkpoint_catches_up_after_restart(self, tmp_path):
+        path = str(tmp_path / "audit_logs.json")
+        audit = AuditLogger(path, fsync="never", checkpoint_every=1000)
+        audit.log_event("a", {})
+        audit.close()
+        audit.store.append({"event": "b", "severity": "ERROR", "timestamp": "2026-01-01T10:00:00Z"})
+        reopened = AuditLogger(path, fsync="never")
+        summary = reopened.get_compliance_summary()
+        assert summary["total_events"] == 2
+        assert summary["event_types"] == {"a": 1, "b": 1}
+
+    def test_lost_checkpoint_is_rebuilt(self, tmp_path):
+        path = str(tmp_path / "audit_logs.json")
+        audit = AuditLogger(path, fsync="never")
+        audit.log_error("boom")
+        audit.close()
+        with open(audit.checkpoint_path, "w") as f:
+            f.write("{not json")
+        assert AuditLogger(path, fsync="never").get_compliance_summary()["total_errors"] == 1
+
+    def test_writes_from_another_logger_are_counted(self, tmp_path):
+        path = str(tmp_path / "audit_logs.json")
+        first = AuditLogger(path, fsync="never")
+        second = AuditLogger(path, fsync="never")
+        first.log_event("a", {})
+        second.log_event("b", {})
+        first.log_event("c", {})
+        assert first.get_compliance_summary()["total_events"] == 3
+
+    def test_rollups(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never")
+        for hour in (9, 9, 10):
+            audit.store.append({"event": "x", "severity": "INFO", "timestamp": f"2026-01-01T{hour:02d}:00:00Z"})
+        assert audit.get_activity_rollup("hour") == [
+            {"period": "2026-01-01T09", "events": 2, "errors": 0},
+            {"period": "2026-01-01T10", "events": 1, "errors": 0},
+        ]
+        assert audit.get_activity_rollup("day") == [{"period": "2026-01-01", "events": 3, "errors": 0}]
+
+    def test_failed_checkpoint_does_not_break_logging(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit_logs.json"), fsync="never", checkpoint_every=1)
+        audit.close()
+        os.remove(audit.checkpoint_path)
+        os.mkdir(audit.checkpoint_path)  # os.replace onto a directory fails
+        audit.log_event("a", {})
+        audit.log_event("b", {})
+        assert audit.get_compliance_summary()["total_events"] == 2
+        assert audit.aggregates.dirty == 2
+        assert not [name for name in os.listdir(audit.store.directory) if name.endswith(".tmp")]
+
+    def test_concurrent_checkpoints(self, tmp_path):
+        path = str(tmp_path / "audit_logs.json")
+        audit = AuditLogger(path, fsync="never", checkpoint_every=1)
+        threads = [threading.Thread(target=lambda: [audit.log_event("tick", {}) for _ in range(50)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        audit.close()
+        with open(audit.checkpoint_path, encoding="utf-8") as f:
+            assert json.load(f)["total_events"] == 200
+        assert AuditLogger(path, fsync="never").get_compliance_summary()["total_events"] == 200
@@ -0,0 +1,201 @@
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from contract_parser.batch_output import BatchSummary
+from contract_parser.batch_processor import BatchProcessor, default_workers
+
+CONTRACT = (
+    "This Service Agreement is made BETWEEN alpha services AND beta traders. "
+    "The Vendor shall deliver the services. Payment is due within 30 days of invoice. "
+    "Either party may terminate with 30 days written notice. Governed by the Indian Contract Act, 1872.\n\n"
+    "The Vendor shall indemnify the Client against all claims and unlimited liability.\n\n"
+)
+
+
+def make_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"contract_{i:03d}.txt"
+        path.write_text(CONTRACT * (i % 3 + 1), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+class TestBatchProcessor:
+    """Test pooled batch processing."""
+
+    def test_default_workers_follow_cpu_count(self):
+        assert BatchProcessor().workers == default_workers() == (os.cpu_count() or 1)
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            BatchProcessor(mode="gpu")
+
+    @pytest.mark.parametrize("mode", ["serial", "thread", "process"])
+    def test_results_in_submission_order_with_failures_isolated(self, tmp_path, mode):
+        paths = make_files(tmp_path, 7)
+        paths.insert(3, str(tmp_path / "missing.txt"))
+        results = list(BatchProcessor(workers=2, mode=mode, chunk_size=2).iter_results(paths))
+        assert [r["file"] for r in results] == [os.path.basename(p) for p in paths]
+        assert results[3]["status"] == "Failed"
+        assert all(r["status"] == "Processed" for i, r in enumerate(results) if i != 3)
+
+    def test_modes_agree(self, tmp_path):
+        paths = make_files(tmp_path, 4)
+        serial = list(BatchProcessor(mode="serial").iter_results(paths))
+        pooled = list(BatchProcessor(workers=2, mode="process").iter_results(paths))
+        assert pooled == serial
+
+    def test_per_file_timeout(self, tmp_path, monkeypatch):
+        paths = make_files(tmp_path, 2)
+        processor = BatchProcessor(mode="serial", timeout=0.2)
+        real = processor._process_single_contract
+
+        def slow_on_first(path):
+            if path == paths[0]:
+                time.sleep(5)
+            return real(path)
+
+        monkeypatch.setattr(processor, "_process_single_contract", slow_on_first)
+        results = list(processor.iter_results(paths))
+        assert results[0]["status"] == "Failed"
+        assert "Timed out" in results[0]["error"]
+        assert results[1]["status"] == "Processed"
+
+    def test_process_batch_counts(self, tmp_path):
+        paths = make_files(tmp_path, 3) + [str(tmp_path / "missing.txt")]
+        report = BatchProcessor(workers=2, mode="thread").process_batch(paths, output_dir=str(tmp_path / "out"))
+        assert report["processed_count"] == 3
+        assert report["failed_count"] == 1
+        assert report["summary"]["total_analyzed"] == 3
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs forked workers")
+    def test_worker_crash_only_fails_that_file(self, tmp_path, monkeypatch):
+        paths = make_files(tmp_path, 5)
+        real = BatchProcessor._process_single_contract
+
+        def crash_on_third(self, path):
+            if path == paths[2]:
+                os._exit(1)
+            return real(self, path)
+
+        # forked workers inherit the patched class
+        monkeypatch.setattr(BatchProcessor, "_process_single_contract", crash_on_third)
+        results = list(BatchProcessor(workers=2, mode="process", chunk_size=1).iter_results(paths))
+        assert [r["status"] for r in results] == ["Processed", "Processed", "Failed", "Processed", "Processed"]
+        assert "exited" in results[2]["error"]
+
+
+class TestBatchOutput:
+    """Test streamed, resumable batch results."""
+
+    def test_results_streamed_to_jsonl(self, tmp_path):
+        paths = make_files(tmp_path, 3)
+        report = BatchProcessor(mode="serial", batch_id="b1").process_batch(
+            paths, output_dir=str(tmp_path / "out"), keep_results=False
+        )
+        assert "contracts" not in report
+        lines = [json.loads(line) for line in open(report["results_file"], encoding="utf-8")]
+        assert [line["file"] for line in lines] == [os.path.basename(p) for p in paths]
+        assert lines[0]["source"]["path"] == os.path.abspath(paths[0])
+
+    def test_rerun_skips_done_files(self, tmp_path, monkeypatch):
+        paths = make_files(tmp_path, 4)
+        out = str(tmp_path / "out")
+        first = BatchProcessor(mode="serial", batch_id="nightly").process_batch(paths[:2], output_dir=out)
+        seen = []
+        real = BatchProcessor.process_file
+        monkeypatch.setattr(BatchProcessor, "process_file", lambda self, p: seen.append(p) or real(self, p))
+        second = BatchProcessor(mode="serial", batch_id="nightly").process_batch(paths, output_dir=out)
+        assert seen == paths[2:]
+        assert second["run"] == {"files": 4, "skipped_count": 2, "processed_count": 2, "failed_count": 0}
+        assert second["total_files"] == second["processed_count"] == 4
+        assert second["summary"]["total_analyzed"] == 4
+        assert [c["file"] for c in second["contracts"]] == [os.path.basename(p) for p in paths]
+        assert first["summary"]["total_analyzed"] == 2
+
+    def test_changed_file_is_redone_and_replaces_old_result(self, tmp_path):
+        paths = make_files(tmp_path, 2)
+        out = str(tmp_path / "out")
+        BatchProcessor(mode="serial", batch_id="b").process_batch(paths, output_dir=out)
+        with open(paths[0], "a", encoding="utf-8") as f:
+            f.write("Changed. " * 20)
+        report = BatchProcessor(mode="serial", batch_id="b").process_batch(paths, output_dir=out)
+        assert report["run"]["skipped_count"] == 1
+        assert report["summary"]["total_analyzed"] == 2
+        assert report["total_files"] == len(report["contracts"]) == 2
+
+    @pytest.mark.parametrize("checkpoint_key", ["stat", "hash"])
+    def test_failed_file_is_retried_on_resume(self, tmp_path, monkeypatch, checkpoint_key):
+        paths = make_files(tmp_path, 2)
+        out = str(tmp_path / "out")
+        real = BatchProcessor._process_single_contract
+
+        def fail_first(self, path):
+            if path == paths[0]:
+                raise RuntimeError("disk error")
+            return real(self, path)
+
+        monkeypatch.setattr(BatchProcessor, "_process_single_contract", fail_first)
+        first = BatchProcessor(mode="serial", batch_id="r").process_batch(
+            paths, output_dir=out, checkpoint_key=checkpoint_key
+        )
+        assert first["failed_count"] == 1
+        monkeypatch.setattr(BatchProcessor, "_process_single_contract", real)
+        second = BatchProcessor(mode="serial", batch_id="r").process_batch(
+            paths, output_dir=out, checkpoint_key=checkpoint_key
+        )
+        assert second["run"] == {"files": 2, "skipped_count": 1, "processed_count": 1, "failed_count": 0}
+        assert second["total_files"] == second["processed_count"] == 2
+        assert second["failed_count"] == 0
+        assert [c["status"] for c in second["contracts"]] == ["Processed", "Processed"]
+        third = BatchProcessor(mode="serial", batch_id="r").process_batch(
+            paths, output_dir=out, checkpoint_key=checkpoint_key
+        )
+        assert third["run"]["skipped_count"] == 2
+
+    def test_hash_checkpoint_skips_moved_file(self, tmp_path):
+        paths = make_files(tmp_path, 1)
+        out = str(tmp_path / "out")
+        BatchProcessor(mode="serial", batch_id="h").process_batch(paths, output_dir=out, checkpoint_key="hash")
+        moved = str(tmp_path / "moved.txt")
+        os.rename(paths[0], moved)
+        report = BatchProcessor(mode="serial", batch_id="h").process_batch([moved], output_dir=out, checkpoint_key="hash")
+        assert report["run"]["skipped_count"] == 1
+
+    def test_torn_line_is_dropped_on_resume(self, tmp_path):
+        paths = make_files(tmp_path, 2)
+        out = str(tmp_path / "out")
+        report = BatchProcessor(mode="serial", batch_id="t").process_batch(paths[:1], output_dir=out)
+        with open(report["results_file"], "a", encoding="utf-8") as f:
+            f.write('{"file": "half')
+        report = BatchProcessor(mode="serial", batch_id="t").process_batch(paths, output_dir=out)
+        lines = [json.loads(line) for line in open(report["results_file"], encoding="utf-8")]
+        assert len(lines) == 2
+
+    def test_incremental_summary_matches_full(self):
+        contracts = [
+            {"status": "Processed", "overall_risk": "High", "contract_type": "vendor", "compliance_issues": 2,
+             "parties_count": 2, "high_risk_clauses": 3},
+            {"status": "Processed", "overall_risk": "Low", "contract_type": "nda", "compliance_issues": 1,
+             "parties_count": 3, "high_risk_clauses": 0},
+            {"file": "x", "status": "Failed", "error": "boom"},
+        ]
+        summary = BatchSummary()
+        for contract in contracts:
+            summary.add(contract)
+        assert summary.summary() == {
+            "total_analyzed": 2,
+            "high_risk_contracts": 1,
+            "medium_risk_contracts": 0,
+            "low_risk_contracts": 1,
+            "contract_type_distribution": {"vendor": 1, "nda": 1},
+            "average_compliance_issues": 1.5,
+            "average_parties_per_contract": 2.5,
+            "total_high_risk_clauses": 3,
+        }
+        assert (summary.processed_count, summary.failed_count) == (2, 1)
@@ -0,0 +1,83 @@
+import os
+
+from contract_parser.batch_processor import BatchProcessor
+from contract_parser.compliance_checker import ComplianceChecker
+from contract_parser.ruleset import ruleset_fingerprint
+from utils.cache import AnalysisCache, shared_cache
+
+
+class TestAnalysisCache:
+    """Test the content-addressed analysis cache."""
+
+    def test_round_trip(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "c"), fingerprint="f1")
+        key = cache.key(b"contract bytes", "batch")
+        assert cache.get(key) is None
+        cache.put(key, {"risk": "High", "clauses": [1, 2]})
+        assert cache.get(key) == {"risk": "High", "clauses": [1, 2]}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_depends_on_content_kind_and_fingerprint(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "c"), fingerprint="f1")
+        other_rules = AnalysisCache(str(tmp_path / "c"), fingerprint="f2")
+        key = cache.key(b"abc", "batch")
+        assert key == cache.key("abc", "batch")
+        assert key != cache.key(b"abd", "batch")
+        assert key != cache.key(b"abc", "api:English")
+        assert key != other_rules.key(b"abc", "batch")
+
+    def test_get_or_compute_computes_once(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "c"), fingerprint="f1")
+        calls = []
+        for _ in range(3):
+            assert cache.get_or_compute(b"x", "text", lambda: calls.append(1) or "parsed") == "parsed"
+        assert len(calls) == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "c"), max_bytes=2500, fingerprint="f1")
+        keys = [cache.key(str(i), "batch") for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, "x" * 1000)
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+        assert cache.get(keys[0]) is not None  # now the most recently used
+        cache.put(keys[2], "x" * 1000)
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+
+    def test_rule_change_changes_fingerprint(self, monkeypatch):
+        before = ruleset_fingerprint()
+        rules = ComplianceChecker.COMPLIANCE_RULES + [{"name": "New Rule", "keywords": ["escrow"]}]
+        monkeypatch.setattr(ComplianceChecker, "COMPLIANCE_RULES", rules)
+        ruleset_fingerprint.cache_clear()
+        try:
+            assert ruleset_fingerprint() != before
+        finally:
+            monkeypatch.undo()
+            ruleset_fingerprint.cache_clear()
+        assert ruleset_fingerprint() == before
+
+    def test_shared_cache_can_be_disabled(self, monkeypatch):
+        assert shared_cache() is not None
+        monkeypatch.setenv("CONTRACT_CACHE", "off")
+        assert shared_cache() is None
+
+
+class TestBatchProcessorCache:
+    """Test that batch runs reuse cached analyses."""
+
+    def test_same_content_is_analyzed_once(self, tmp_path, monkeypatch):
+        text = "The Vendor shall deliver the goods. Payment is due within 30 days of invoice. " * 5
+        first, second = tmp_path / "a.txt", tmp_path / "copy of a.txt"
+        first.write_text(text, encoding="utf-8")
+        second.write_text(text, encoding="utf-8")
+        calls = []
+        real = BatchProcessor._analyze_contract
+        monkeypatch.setattr(BatchProcessor, "_analyze_contract", lambda self, d, p: calls.append(p) or real(self, d, p))
+        results = list(BatchProcessor(mode="serial").iter_results([str(first), str(second)]))
+        assert len(calls) == 1
+        assert [r["file"] for r in results] == ["a.txt", "copy of a.txt"]
+        assert {k: v for k, v in results[0].items() if k != "file"} == {k: v for k, v in results[1].items() if k != "file"}
+
+    def test_cache_can_be_turned_off(self, tmp_path):
+        assert BatchProcessor(use_cache=False).cache is None
@@ -0,0 +1,138 @@
+import time
+
+from contract_parser.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from contract_parser.llm_client import LLMClient
+from fake_llm import FaultyModel
+
+CLAUSE = "The Vendor may terminate this Agreement at any time without notice."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test the circuit breaker state machine."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure(0.1)
+        assert breaker.state == CLOSED
+        breaker.allow()
+        breaker.record_failure(0.1)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker(failure_threshold=100, error_rate_threshold=0.5, window=10, min_calls=10,
+                                 clock=FakeClock())
+        for i in range(9):
+            breaker.record_failure(0.1) if i % 2 else breaker.record_success(0.1)
+        assert breaker.state == CLOSED  # 4 of 9, and below min_calls
+        breaker.record_failure(0.1)
+        assert breaker.state == OPEN and breaker.snapshot()["error_rate"] == 0.5
+
+    def test_slow_calls_count_against_the_circuit(self):
+        breaker = CircuitBreaker(min_calls=4, slow_call_seconds=1.0, clock=FakeClock())
+        for latency in (0.2, 2.0, 0.3, 2.5):
+            breaker.record_success(latency)
+        assert breaker.state == OPEN and breaker.failures == 0
+
+    def test_half_open_probe_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, clock=clock)
+        breaker.record_failure(0.1)
+        clock.now = 9.9
+        assert not breaker.allow()
+        clock.now = 10.0
+        assert breaker.allow() and breaker.state == HALF_OPEN
+        assert not breaker.allow()  # one probe at a time
+        breaker.record_failure(0.1)
+        assert breaker.state == OPEN and breaker.times_opened == 2
+        clock.now = 20.0
+        assert breaker.allow()
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED and breaker.allow()
+
+    def test_abandoned_probe_frees_slot(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=1, clock=clock)
+        breaker.record_failure(0.1)
+        clock.now = 1.0
+        assert breaker.allow()
+        breaker.record_abandoned()
+        assert breaker.allow()
+
+    def test_snapshot_reports_latency_percentiles(self):
+        breaker = CircuitBreaker(window=100, clock=FakeClock())
+        for i in range(1, 101):
+            breaker.record_success(i / 100)
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == CLOSED and snapshot["calls"] == 100
+        assert 0.49 <= snapshot["latency"]["p50"] <= 0.51 and snapshot["latency"]["p99"] >= 0.98
+
+
+class TestLLMClientBreaker:
+    """Test fallback routing against a fault-injecting model."""
+
+    def test_outage_routes_to_fallback_and_recovers(self):
+        model = FaultyModel()
+        breaker = CircuitBreaker(failure_threshold=3, open_seconds=0.2)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_retries=0, cache=None, breaker=breaker)
+        model.down = True
+        results = [llm.explain_clause(CLAUSE) for _ in range(10)]
+        assert all(r["source"] == "Rule-based" for r in results)
+        assert len(model.prompts) == 3  # the rest never reached the model
+        assert breaker.snapshot()["state"] == OPEN and breaker.rejected == 7
+
+        model.down = False
+        assert llm.explain_clause(CLAUSE)["source"] == "Rule-based"  # still open
+        time.sleep(0.25)
+        assert llm.explain_clause(CLAUSE)["source"] == "Gemini API"  # the half-open probe
+        assert breaker.state == CLOSED
+        assert llm.explain_clause(CLAUSE)["source"] == "Gemini API"
+
+    def test_open_circuit_stops_retries(self):
+        model = FaultyModel()
+        model.down = True
+        breaker = CircuitBreaker(failure_threshold=2, open_seconds=60)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_retries=5, backoff_base=0.001, cache=None,
+                        breaker=breaker)
+        start = time.perf_counter()
+        assert llm.risk_reasoning(CLAUSE).endswith("(LLM error)")
+        assert len(model.prompts) == 2 and time.perf_counter() - start < 0.5
+
+    def test_concurrent_batch_during_outage(self):
+        model = FaultyModel(latency=0.02)
+        model.down = True
+        breaker = CircuitBreaker(failure_threshold=3, open_seconds=60)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_concurrency=2, max_retries=0, cache=None,
+                        breaker=breaker)
+        results = llm.explain_clauses([f"{CLAUSE} ({i})" for i in range(20)])
+        assert all(r["source"] == "Rule-based" for r in results)
+        assert len(model.prompts) <= 4
+
+    def test_streaming_respects_open_circuit(self):
+        model = FaultyModel()
+        model.down = True
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=60)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_retries=0, cache=None, breaker=breaker)
+        assert "".join(llm.stream_explanation(CLAUSE)).startswith("Clause excerpt:")
+        assert "".join(llm.stream_explanation(CLAUSE)).startswith("Clause excerpt:")
+        assert len(model.prompts) == 1 and breaker.rejected == 1
+
+    def test_flaky_model_error_rate_opens_circuit(self):
+        model = FaultyModel(error_rate=0.7, seed=3)
+        breaker = CircuitBreaker(failure_threshold=100, error_rate_threshold=0.5, min_calls=10, open_seconds=60)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_concurrency=1, max_retries=0, cache=None,
+                        breaker=breaker)
+        llm.explain_clauses([f"{CLAUSE} ({i})" for i in range(40)])
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == OPEN and snapshot["calls"] < 40 and snapshot["rejected"] > 0
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.clause_results import ClauseResults
+from contract_parser.segmentation import segment_clauses
+
+DOCUMENT = """1. Indemnity: The Vendor shall indemnify and hold harmless the Buyer against all claims.
+2. Renewal: This Agreement shall automatically renew unless terminated; either party may terminate at will.
+3. Notices: Notices shall be given promptly in writing to the registered office.
+"""
+
+
+def legacy_dicts(document, assessor):
+    results = []
+    for clause in segment_clauses(document):
+        detailed = assessor.score_clause_detailed(clause.text)
+        results.append({
+            "id": clause.index,
+            "text": clause.text[:100] + "...",
+            "full_text": clause.text,
+            "start": clause.start,
+            "end": clause.end,
+            "section": clause.section,
+            "heading": clause.heading,
+            "risk": detailed["overall_risk"],
+            "issues": detailed["detailed_issues"],
+            "ambiguities": assessor.detect_ambiguities(clause.text),
+        })
+    return results
+
+
+class TestClauseResults:
+    """Test the compact clause result model."""
+
+    def setup_method(self):
+        self.assessor = AdvancedRiskAssessor()
+        self.results = ClauseResults.score(DOCUMENT, self.assessor)
+
+    def test_serializes_to_clause_dicts(self):
+        assert self.results.to_dicts() == legacy_dicts(DOCUMENT, self.assessor)
+
+    def test_items_read_like_dicts(self):
+        first = self.results[0]
+        assert first["risk"] == first.risk == "High"
+        assert first["full_text"] == DOCUMENT[first.start:first.end]
+        assert first.get("missing", "default") == "default"
+        assert [issue["name"] for issue in first["issues"]] == ["Broad Indemnity"]
+        assert self.results[-1].id == len(self.results) - 1
+        assert [r.id for r in self.results[:2]] == [0, 1]
+
+    def test_items_are_immutable_and_slotted(self):
+        first = self.results[0]
+        assert first == self.results[0] and hash(first) == hash(self.results[0])
+        assert first != self.results[1]
+        other = ClauseResults.score(DOCUMENT, self.assessor)
+        assert first != other[0] and len({first, other[0]}) == 2
+        assert not hasattr(first, "__dict__")
+        with pytest.raises(AttributeError):
+            first.index = 3
+
+    def test_issue_dicts_are_copies(self):
+        self.results[0]["issues"][0]["name"] = "changed"
+        assert self.results[0]["issues"][0]["name"] == "Broad Indemnity"
+
+    def test_state_round_trip(self):
+        state = json.loads(json.dumps(self.results.to_state()))
+        restored = ClauseResults.from_state(DOCUMENT, state, self.assessor)
+        assert restored.to_dicts() == self.results.to_dicts()
+        assert restored.risk_levels() == self.results.risk_levels()
+
+    def test_labels_are_shared(self):
+        text = "PAYMENT TERMS\n" + "The Buyer shall pay the price within 30 days.\n" * 10
+        results = ClauseResults.score(text, self.assessor)
+        assert len(results) == 10
+        assert results.labels == ["PAYMENT TERMS"]
@@ -0,0 +1,77 @@
+from contract_parser.advanced_nlp import ContractClassifier
+from contract_parser.clause_classifier import ClauseClassifier
+from contract_parser.compliance_checker import ComplianceChecker
+from contract_parser.keyword_index import KeywordIndex, clear_keyword_indexes, keyword_index
+
+
+class TestKeywordIndex:
+    """Test shared per-document keyword lookups."""
+
+    def test_case_insensitive_substring_matching(self):
+        index = KeywordIndex("Auto-Renewal and LIMITATION OF LIABILITY apply.")
+        assert "renew" in index
+        assert "Limitation of Liability" in index
+        assert "indemnifi" not in index
+        assert index.any(["gst", "liability"])
+        assert not index.any(["gst", "arbitration"])
+
+    def test_count_matches_str_count(self):
+        text = "Net 30. Payment net of taxes; NET amounts are final. Network renewal renews. İİ aaaaa"
+        index = KeywordIndex(text)
+        for keyword in ["net", "network", "refund", "renew", "renewal", "ewal", "aa", "i̇i̇"]:
+            assert index.count(keyword) == text.lower().count(keyword)
+
+    def test_lookups_are_memoized(self):
+        index = KeywordIndex("Payment due in 30 days.")
+        assert "payment" in index
+        index._lowered = ""
+        assert "payment" in index
+        assert index.count("payment") == 0
+
+    def test_shared_between_checks_on_same_text(self):
+        text = "Governed by the Indian Contract Act, 1872."
+        first = keyword_index(text)
+        assert "1872" in first
+        second = keyword_index(text)
+        assert second.present is first.present and second.present == {"1872": True}
+        assert keyword_index(text + " ").present == {}
+
+    def test_cache_keeps_answers_not_texts(self):
+        clear_keyword_indexes()
+        text = "Force majeure applies."
+        index = keyword_index(text)
+        "force majeure" in index
+        del index
+        again = keyword_index(text)
+        assert again._lowered is None
+        assert "force majeure" in again
+        assert again._lowered is None
+
+    def test_clause_batch_after_length_changing_lowercase(self):
+        clauses = ["İİİİİİİİİİ Şirket", "The Client shall pay the invoice.", "Plain text."]
+        batch = ClauseClassifier.classify_clauses_batch(clauses)
+        assert [r["category"] for r in batch] == [ClauseClassifier.classify_clause(c)["category"] for c in clauses]
+        assert batch[1]["category"] == "payment_terms"
+
+
+class TestResultsOnSharedIndex:
+    """Test that classification and compliance results did not change."""
+
+    def test_contract_type(self):
+        result = ContractClassifier.classify("The employee receives a salary. Employment starts on joining.")
+        assert result["type"] == "employment"
+
+    def test_compliance_report(self):
+        report = ComplianceChecker.generate_compliance_report(
+            "Governed by the Indian Contract Act, 1872. Force majeure applies. GST extra."
+        )
+        present = {i["rule"] for i in report["issues"] if i["status"] == "Present"}
+        assert {"Force Majeure Clause", "GST Compliance Clause"} <= present
+        assert "Indian Contract Act" in report["law_references"]
+
+    def test_clause_categories(self):
+        clauses = ["The Vendor shall indemnify the Buyer against all claims.", "Plain text."]
+        results = ClauseClassifier.classify_clauses_batch(clauses)
+        assert results[0]["category"] == "liability_indemnity"
+        assert results[1]["category"] == "general"
+        assert results[0]["all_matches"] == ClauseClassifier.classify_clause(clauses[0])["all_matches"]
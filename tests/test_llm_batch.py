@@ -0,0 +1,131 @@
+import json
+
+from contract_parser.llm_batch import (
+    BATCH_PROMPTS,
+    EXPLAIN_BATCH_PROMPT,
+    pack_batches,
+    parse_batch_response,
+)
+from contract_parser.llm_cache import LLMResponseCache
+from contract_parser.llm_client import LLMClient
+from contract_parser.summarization import estimate_tokens
+from fake_llm import FakeModel
+
+CLAUSES = [f"Clause {i}: the Vendor shall deliver item {i} within {10 + i} days of the order." for i in range(30)]
+
+
+class BatchModel(FakeModel):
+    """Answers batched prompts with a JSON array; single prompts as usual.
+
+    ``drop`` lists clause ids left out of batched answers; ``fenced`` wraps
+    the array in a Markdown code fence; ``garbage`` answers batches with
+    text that is not JSON.
+    """
+
+    def __init__(self, drop=(), fenced=False, garbage=False, **kwargs):
+        super().__init__(**kwargs)
+        self.drop = set(drop)
+        self.fenced = fenced
+        self.garbage = garbage
+
+    def reply(self, prompt: str) -> str:
+        if "Clauses (JSON):" not in prompt:
+            return super().reply(prompt)
+        if self.garbage:
+            return "Sorry, here are the explanations: first clause is fine..."
+        field = next(field for template, field in BATCH_PROMPTS.values() if prompt.startswith(template[:40]))
+        items = json.loads(prompt.split("Clauses (JSON):\n", 1)[1])
+        answer = json.dumps([
+            {"id": item["id"], field: f"{field} of {item['clause']} ({item.get('risk_level', '-')})"}
+            for item in items if item["id"] not in self.drop
+        ])
+        return f"```json\n{answer}\n```" if self.fenced else answer
+
+
+def batched_prompts(model):
+    return [p for p in model.prompts if "Clauses (JSON):" in p]
+
+
+class TestBatchHelpers:
+    """Test packing and parsing of batched clause prompts."""
+
+    def test_pack_within_budget(self):
+        items = [{"id": f"c{i}", "clause": clause} for i, clause in enumerate(CLAUSES)]
+        batches = pack_batches(items, EXPLAIN_BATCH_PROMPT, max_tokens=600, max_items=8)
+        assert [item for batch in batches for item in batch] == items
+        assert all(len(batch) <= 8 for batch in batches)
+        assert all(estimate_tokens(EXPLAIN_BATCH_PROMPT.format(items=json.dumps(b, indent=1))) <= 600
+                   for b in batches)
+
+    def test_parse_validates_items(self):
+        text = 'Here you go:\n```json\n[{"id": "c0", "explanation": "ok"}, {"id": "c9", "explanation": "x"},' \
+               ' {"id": "c1", "explanation": ""}, {"id": "c0", "explanation": "again"}, "c2",' \
+               ' {"id": "c2", "explanation": 5}, {"id": "c3", "explanation": " fine "}]\n```'
+        assert parse_batch_response(text, "explanation", ["c0", "c1", "c2", "c3"]) == {"c0": "ok", "c3": "fine"}
+        assert parse_batch_response("not json [", "explanation", ["c0"]) == {}
+        assert parse_batch_response('[{"id": "c0", "explanation": "a"', "explanation", ["c0"]) == {}
+
+
+class TestBatchedLLMClient:
+    """Test batched multi-clause requests against a stub model."""
+
+    def test_batched_explanations_use_few_requests(self):
+        model = BatchModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None)
+        results = llm.explain_clauses(CLAUSES, batched=True)
+        assert len(model.prompts) == 2  # 30 clauses, at most 20 per batch
+        assert [r["explanation"] for r in results] == [f"explanation of {c} (-)" for c in CLAUSES]
+        assert all(r["source"] == "Gemini API" and r["available"] for r in results)
+
+    def test_alternatives_carry_risk_levels(self):
+        model = BatchModel(fenced=True)
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None)
+        levels = ["High", "Medium"] * 3
+        results = llm.suggest_alternatives(CLAUSES[:6], levels, batched=True)
+        assert len(model.prompts) == 1
+        assert [r["suggestion"] for r in results] == [f"suggestion of {c} ({l})" for c, l in zip(CLAUSES, levels)]
+
+    def test_missing_answers_retried_individually(self):
+        model = BatchModel(drop={"c1", "c4"})
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None)
+        results = llm.risk_reasonings(CLAUSES[:6], batched=True)
+        assert len(batched_prompts(model)) == 1 and len(model.prompts) == 3
+        assert results[1].startswith("answer to: Why is this legal clause risky?") and CLAUSES[1] in results[1]
+        assert results[0] == f"reasoning of {CLAUSES[0]} (-)"
+
+    def test_unparseable_batch_falls_back_to_single_requests(self):
+        model = BatchModel(garbage=True)
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None)
+        results = llm.explain_clauses(CLAUSES[:4], batched=True)
+        assert len(model.prompts) == 5
+        assert all(CLAUSES[i] in r["explanation"] for i, r in enumerate(results))
+
+    def test_batch_answers_are_cached_per_clause(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        model = BatchModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=cache)
+        llm.explain_clauses(CLAUSES[:5], batched=True)
+        results = llm.explain_clauses(CLAUSES[:7], batched=True)
+        assert len(model.prompts) == 2
+        assert "c0" not in model.prompts[1].split("Clauses (JSON):")[1]
+        assert [r["explanation"] for r in results[5:]] == [f"explanation of {c} (-)" for c in CLAUSES[5:7]]
+
+    def test_single_and_batched_requests_share_the_cache(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        model = BatchModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=cache)
+        single = llm.explain_clause(CLAUSES[0])["explanation"]
+        llm.suggest_alternatives(CLAUSES[1:3], ["High", "Low"], batched=True)
+        assert len(model.prompts) == 2
+        results = llm.explain_clauses(CLAUSES[:2], batched=True)
+        assert results[0]["explanation"] == single
+        assert "c0" not in model.prompts[2].split("Clauses (JSON):")[1]
+        assert llm.suggest_alternative(CLAUSES[1], "High")["suggestion"] == f"suggestion of {CLAUSES[1]} (High)"
+        assert llm.suggest_alternative(CLAUSES[2], "High")["suggestion"] != f"suggestion of {CLAUSES[2]} (Low)"
+        assert len(model.prompts) == 4
+
+    def test_unbatched_by_default(self):
+        model = BatchModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None)
+        llm.explain_clauses(CLAUSES[:3])
+        assert len(model.prompts) == 3 and not batched_prompts(model)
@@ -0,0 +1,94 @@
+import os
+
+from contract_parser.llm_cache import LLMResponseCache, shared_llm_cache
+from contract_parser.llm_client import EXPLAIN_PROMPT, LLMClient
+from fake_llm import FakeModel
+
+CONFIDENTIALITY = "Both parties shall keep all Confidential Information strictly confidential for 3 years."
+
+
+class TestLLMResponseCache:
+    """Test the persistent LLM response cache."""
+
+    def test_round_trip_with_normalized_text(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        namespace = cache.namespace("model-a", "explain", EXPLAIN_PROMPT)
+        assert cache.get(namespace, CONFIDENTIALITY) is None
+        cache.put(namespace, CONFIDENTIALITY, "explanation")
+        assert cache.get(namespace, "  " + CONFIDENTIALITY.upper().replace(" ", "\n  ")) == "explanation"
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_namespace_separates_model_template_and_variant(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        base = cache.namespace("model-a", "alternative", "template {clause}", "High")
+        cache.put(base, CONFIDENTIALITY, "answer")
+        for other in (
+            cache.namespace("model-b", "alternative", "template {clause}", "High"),
+            cache.namespace("model-a", "alternative", "reworded template {clause}", "High"),
+            cache.namespace("model-a", "alternative", "template {clause}", "Low"),
+        ):
+            assert cache.get(other, CONFIDENTIALITY) is None
+
+    def test_entries_expire(self, tmp_path):
+        now = [1000.0]
+        cache = LLMResponseCache(str(tmp_path / "llm"), ttl=60, clock=lambda: now[0])
+        cache.put("ns", CONFIDENTIALITY, "answer")
+        now[0] += 59
+        assert cache.get("ns", CONFIDENTIALITY) == "answer"
+        now[0] += 2
+        assert cache.get("ns", CONFIDENTIALITY) is None
+        assert cache.stats()["expired"] == 1
+
+    def test_size_bound_evicts_least_recently_used(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"), max_bytes=2500)
+        for i in range(3):
+            cache.put("ns", f"clause {i}", "x" * 1000)
+            key = cache.store.key(f"clause {i}", "ns")
+            os.utime(cache.store._path(key), (1000 + i, 1000 + i))
+        assert [cache.get("ns", f"clause {i}") is not None for i in range(3)] == [False, True, True]
+
+    def test_near_duplicate_lookup(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"), near_duplicate=0.9)
+        cache.put("ns", CONFIDENTIALITY, "answer")
+        reworded = CONFIDENTIALITY.replace("strictly ", "").replace("Both parties", "The parties")
+        assert cache.get("ns", reworded) == "answer"
+        assert cache.get("ns", "Payment is due within 30 days of the invoice date.") is None
+        assert cache.stats()["near_hits"] == 1
+        # a new process finds the same entry through the index loaded from disk
+        reopened = LLMResponseCache(str(tmp_path / "llm"), near_duplicate=0.9)
+        assert reopened.get("other-ns", reworded) is None
+        assert reopened.get("ns", reworded) == "answer"
+
+    def test_near_duplicate_off_by_default(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        cache.put("ns", CONFIDENTIALITY, "answer")
+        assert cache.get("ns", CONFIDENTIALITY.replace("3 years", "5 years")) is None
+
+    def test_shared_cache_can_be_disabled(self, monkeypatch):
+        assert shared_llm_cache() is not None
+        monkeypatch.setenv("LLM_CACHE", "off")
+        assert shared_llm_cache() is None
+
+
+class TestLLMClientCaching:
+    """Test that LLMClient answers recurring clauses from the cache."""
+
+    def test_recurring_clause_sent_once(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        model = FakeModel()
+        LLMClient(model=model, requests_per_minute=6000, cache=cache).explain_clause(CONFIDENTIALITY)
+        # a rerun with a fresh client (same disk cache) sends nothing
+        rerun = LLMClient(model=model, requests_per_minute=6000, cache=cache)
+        results = rerun.explain_clauses([CONFIDENTIALITY, CONFIDENTIALITY.lower()])
+        assert [r["source"] for r in results] == ["Gemini API", "Gemini API"]
+        assert len(model.prompts) == 1
+        assert cache.stats()["hits"] == 2
+
+    def test_fallbacks_are_not_cached(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        model = FakeModel(failures=1)
+        llm = LLMClient(model=model, requests_per_minute=6000, max_retries=0, cache=cache)
+        assert llm.risk_reasoning(CONFIDENTIALITY).endswith("(LLM error)")
+        assert llm.risk_reasoning(CONFIDENTIALITY).startswith("answer to")
+        assert llm.risk_reasoning(CONFIDENTIALITY).startswith("answer to")
+        assert len(model.prompts) == 2
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from contract_parser.llm_client import LLMClient, TokenBucket, run_sync
+from fake_llm import BlockingFakeModel, FakeModel
+
+CLAUSES = [f"Clause {i}: the Vendor shall deliver item {i} within 30 days." for i in range(8)]
+
+
+class TestTokenBucket:
+    """Test the token-bucket rate limiter."""
+
+    def test_burst_then_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0])
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        now[0] = 10.0
+        assert bucket.reserve() == 0.0
+
+
+class TestAsyncLLMClient:
+    """Test concurrency, rate limiting, timeouts and retries against stub models."""
+
+    def test_batch_runs_concurrently(self):
+        model = FakeModel(latency=0.1)
+        llm = LLMClient(model=model, max_concurrency=4, requests_per_minute=6000)
+        start = time.perf_counter()
+        results = llm.explain_clauses(CLAUSES)
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5  # 8 x 0.1 s in series would take 0.8 s
+        assert model.max_in_flight == 4
+        assert [r["source"] for r in results] == ["Gemini API"] * len(CLAUSES)
+
+    def test_results_keep_input_order(self):
+        llm = LLMClient(model=FakeModel(), requests_per_minute=6000)
+        results = llm.suggest_alternatives(CLAUSES[:3], ["High", "Medium", "High"])
+        assert all(clause in result["suggestion"] for clause, result in zip(CLAUSES, results))
+        assert "Medium-risk" in results[1]["suggestion"]
+
+    def test_rate_limit_spaces_requests(self):
+        model = FakeModel()
+        llm = LLMClient(model=model, max_concurrency=1, requests_per_minute=600)  # one per 0.1 s
+        llm.explain_clauses(CLAUSES[:4])
+        gaps = [b - a for a, b in zip(model.call_times, model.call_times[1:])]
+        assert min(gaps[1:]) >= 0.09
+
+    def test_retries_transient_failures(self):
+        model = FakeModel(failures=2)
+        llm = LLMClient(model=model, requests_per_minute=6000, max_retries=2, backoff_base=0.01)
+        assert llm.explain_clause(CLAUSES[0])["available"] is True
+        assert len(model.prompts) == 3
+
+    def test_gives_up_after_retries(self):
+        model = FakeModel(failures=5)
+        llm = LLMClient(model=model, requests_per_minute=6000, max_retries=1, backoff_base=0.01)
+        assert llm.explain_clause(CLAUSES[0])["source"] == "Rule-based"
+        assert llm.risk_reasoning(CLAUSES[0]).endswith("(LLM error)")
+        assert len(model.prompts) == 4
+
+    def test_timeout_falls_back(self):
+        model = FakeModel(hang=1.0)
+        llm = LLMClient(model=model, requests_per_minute=6000, timeout=0.05, max_retries=0)
+        start = time.perf_counter()
+        assert llm.suggest_alternative(CLAUSES[0], "High")["source"] == "Rule-based"
+        assert time.perf_counter() - start < 0.5
+
+    def test_blocking_model_runs_in_threads(self):
+        model = BlockingFakeModel(latency=0.1)
+        llm = LLMClient(model=model, max_concurrency=4, requests_per_minute=6000)
+        start = time.perf_counter()
+        results = llm.explain_clauses(CLAUSES[:4])
+        assert time.perf_counter() - start < 0.3
+        assert all(r["explanation"].startswith("blocking answer") for r in results)
+
+    def test_sync_wrapper_inside_running_loop(self):
+        llm = LLMClient(model=FakeModel(), requests_per_minute=6000)
+
+        async def caller():
+            return llm.summarize("A short contract.")
+
+        assert asyncio.run(caller()).startswith("answer to")
+        assert run_sync(llm.aexplain_clauses([])) == []
+
+    def test_unavailable_client_uses_fallbacks(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        llm = LLMClient()
+        assert llm.available is False
+        assert [r["source"] for r in llm.explain_clauses(CLAUSES[:2])] == ["Rule-based", "Rule-based"]
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from contract_parser.llm_cache import LLMResponseCache
+from contract_parser.llm_client import IncompleteAnswerError, LLMClient
+from fake_llm import BlockingFakeModel, FakeModel
+
+CLAUSE = "The Client shall indemnify the Vendor against all claims arising from the services."
+
+
+def timed_chunks(chunks):
+    """Chunks with the time each arrived, relative to the first request."""
+    start = time.perf_counter()
+    return [(chunk, time.perf_counter() - start) for chunk in chunks]
+
+
+class TestLLMStreaming:
+    """Test streamed LLM answers against fake streaming models."""
+
+    def test_chunks_arrive_incrementally(self):
+        model = FakeModel(latency=0.05, chunk_latency=0.05)
+        llm = LLMClient(model=model, requests_per_minute=6000, cache=None)
+        received = timed_chunks(llm.stream_explanation(CLAUSE))
+        assert len(received) > 3
+        assert "".join(chunk for chunk, _ in received) == model.reply(model.prompts[0])
+        first, last = received[0][1], received[-1][1]
+        assert first < 0.15 and last - first >= 0.05 * (len(received) - 2)
+        assert len(llm.first_token_times) == 1 and 0.04 < llm.first_token_times[0] < 0.15
+
+    def test_blocking_model_streams(self):
+        llm = LLMClient(model=BlockingFakeModel(chunk_latency=0.01), requests_per_minute=6000, cache=None)
+        text = "".join(llm.stream_summary("Payment is due within 30 days.", max_length=50))
+        assert text.startswith("blocking answer to: Summarize") and "max 50 words" in text
+
+    def test_streamed_answer_is_cached(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        model = FakeModel()
+        llm = LLMClient(model=model, requests_per_minute=6000, cache=cache)
+        streamed = "".join(llm.stream_explanation(CLAUSE))
+        assert list(llm.stream_explanation(CLAUSE)) == [streamed]
+        assert llm.explain_clause(CLAUSE)["explanation"] == streamed
+        assert len(model.prompts) == 1
+
+    def test_retries_before_first_chunk(self):
+        model = FakeModel(failures=1)
+        llm = LLMClient(model=model, requests_per_minute=6000, backoff_base=0.01, cache=None)
+        assert "".join(llm.stream_explanation(CLAUSE)).startswith("answer to")
+        assert len(model.prompts) == 2
+
+    def test_failure_falls_back_or_raises_after_partial_answer(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        failing = LLMClient(model=FakeModel(failures=5), requests_per_minute=6000, max_retries=0, cache=cache)
+        assert "".join(failing.stream_explanation(CLAUSE)).startswith("Clause excerpt:")
+        broken = FakeModel(break_after=2)
+        partial = []
+        with pytest.raises(IncompleteAnswerError):
+            for chunk in LLMClient(model=broken, requests_per_minute=6000, cache=cache).stream_explanation(CLAUSE):
+                partial.append(chunk)
+        assert len(partial) == 2 and len(broken.prompts) == 1
+        # neither the fallback nor the partial answer was cached
+        working = FakeModel()
+        LLMClient(model=working, requests_per_minute=6000, cache=cache).explain_clause(CLAUSE)
+        assert len(working.prompts) == 1
+
+    def test_timeout_between_chunks(self):
+        model = FakeModel(hang=1.0)
+        llm = LLMClient(model=model, requests_per_minute=6000, timeout=0.05, max_retries=0, cache=None)
+        start = time.perf_counter()
+        assert "".join(llm.stream_summary("Short text.")).startswith("📝 Summary (Rule-based")
+        assert time.perf_counter() - start < 0.5
+
+    def test_unavailable_client_streams_fallback(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        assert list(LLMClient().stream_explanation(CLAUSE)) == [LLMClient()._fallback_explain(CLAUSE)["explanation"]]
+
+    def test_stopping_early_closes_the_stream(self):
+        model = FakeModel(chunk_latency=0.01)
+        llm = LLMClient(model=model, requests_per_minute=6000, cache=None)
+        chunks = llm.stream_explanation(CLAUSE)
+        assert next(chunks)
+        chunks.close()
+        assert model.in_flight == 0
@@ -0,0 +1,56 @@
+import pytest
+
+from contract_parser.nlp import ContractNLP, split_text
+
+
+def _nlp(**kwargs):
+    contract_nlp = ContractNLP(model_name="not_installed", **kwargs)  # blank English model
+    ruler = contract_nlp.nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "ORG", "pattern": "Acme"}])
+    return contract_nlp
+
+
+class TestContractNLP:
+    """Test chunked, component-selective processing."""
+
+    def test_split_text_prefers_line_breaks(self):
+        text = "first line\nsecond line\nthird"
+        pieces = list(split_text(text, 15))
+        assert "".join(pieces) == text
+        assert pieces[0] == "first line\n"
+        assert all(len(p) <= 15 for p in pieces)
+
+    def test_chunked_doc_matches_whole_doc(self):
+        text = "Acme shall pay Rs. 5,000.\n" * 40
+        whole = _nlp().process_text(text)
+        chunked = _nlp(chunk_chars=100).process_text(text)
+        assert chunked.text == whole.text == text
+        assert [(e.start_char, e.end_char) for e in chunked.ents] == [(e.start_char, e.end_char) for e in whole.ents]
+        assert len(chunked.ents) == 40
+
+    def test_entity_offsets_refer_to_whole_text(self):
+        contract_nlp = _nlp(chunk_chars=50)
+        text = "Preamble text without parties.\n" * 5 + "Payment to Acme of Rs. 10,000."
+        doc = contract_nlp.process_text(text)
+        for entity in contract_nlp.extract_entities(doc):
+            assert text[entity["start"]:entity["end"]] == entity["text"]
+
+    def test_no_max_length_limit(self):
+        contract_nlp = _nlp(chunk_chars=100_000)
+        contract_nlp.nlp.max_length = 150_000
+        text = "The Vendor shall deliver the goods within thirty days.\n" * 5000
+        doc = contract_nlp.process_text(text, outputs=("clauses",))
+        assert len(doc.text) == len(text)
+
+    def test_disables_unneeded_components(self):
+        contract_nlp = _nlp()
+        contract_nlp.nlp.add_pipe("sentencizer")
+        assert contract_nlp.disabled_components(None) == []
+        assert contract_nlp.disabled_components(["clauses"]) == ["entity_ruler", "sentencizer"]
+        assert contract_nlp.disabled_components(["entities"]) == ["sentencizer"]
+        doc = contract_nlp.process_text("Acme signs.", outputs=["clauses"])
+        assert not doc.ents
+
+    def test_unknown_output(self):
+        with pytest.raises(ValueError):
+            _nlp().disabled_components(["summary"])
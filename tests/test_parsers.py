@@ -1,4 +1,9 @@
-from contract_parser.parsers import parse_txt
+import io
+
+import pytest
+
+from contract_parser import parsers
+from contract_parser.parsers import iter_chunks, join_chunks, parse_file, parse_txt
 
 
 def test_parse_txt_simple():
@@ -12,3 +17,96 @@ def test_parse_txt_simple():
     f = Dummy(sample.encode("utf-8"))
     out = parse_txt(f)
     assert "test contract" in out
+
+
+def _named_stream(data, name):
+    stream = io.BytesIO(data)
+    stream.name = name
+    return stream
+
+
+def _pdf_bytes(pages):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=11)
+    for i in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 5, f"Page {i + 1}. The Vendor shall deliver the goods within 30 days.")
+    return bytes(pdf.output())
+
+
+def test_pdf_chunks_are_pages_with_offsets():
+    data = _pdf_bytes(3)
+    text = parse_file(_named_stream(data, "c.pdf"))
+    chunks = list(iter_chunks(_named_stream(data, "c.pdf")))
+    assert [c.index for c in chunks] == [0, 1, 2]
+    assert all(c.kind == "page" for c in chunks)
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+    assert "Page 3." in chunks[2].text
+
+
+def test_parallel_pdf_matches_serial(monkeypatch):
+    monkeypatch.setattr(parsers, "PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(parsers, "PAGES_PER_TASK", 2)
+    data = _pdf_bytes(5)
+    assert parsers.parse_pdf(io.BytesIO(data), workers=2) == parsers.parse_pdf(io.BytesIO(data))
+
+
+def test_docx_chunks_are_paragraphs():
+    import docx
+    document = docx.Document()
+    for paragraph in ("Clause 1. Payment.", "", "Clause 2. Termination."):
+        document.add_paragraph(paragraph)
+    stream = io.BytesIO()
+    document.save(stream)
+    chunks = list(iter_chunks(_named_stream(stream.getvalue(), "c.docx")))
+    text = parse_file(_named_stream(stream.getvalue(), "c.docx"))
+    assert text == "Clause 1. Payment.\n\nClause 2. Termination."
+    assert [c.text for c in chunks] == ["Clause 1. Payment.", "", "Clause 2. Termination."]
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+
+
+def test_txt_chunks_join_to_original():
+    sample = "Clause 1.\r\nPayment terms.\n\n\nClause 2.\nTermination"
+    chunks = list(iter_chunks(_named_stream(sample.encode(), "c.txt")))
+    assert join_chunks(chunks) == sample
+    assert chunks[0].text == "Clause 1.\r\nPayment terms.\n\n"
+    assert all(sample[c.start:c.end] == c.text for c in chunks)
+
+
+def test_fast_backend_text_matches_pdfplumber():
+    pytest.importorskip("pypdfium2")
+    data = _pdf_bytes(3)
+    reference = parsers.parse_pdf(io.BytesIO(data), backend="pdfplumber")
+    assert parsers.parse_pdf(io.BytesIO(data), backend="pypdfium2").split() == reference.split()
+
+
+def test_auto_backend_uses_fast_backend_above_threshold(monkeypatch):
+    pytest.importorskip("pypdfium2")
+    used = []
+
+    def spy(backend):
+        page_texts = backend.page_texts
+
+        def recording(*args, **kwargs):
+            used.append(backend.name)
+            return page_texts(*args, **kwargs)
+        return staticmethod(recording)
+
+    for backend in parsers.PDF_BACKENDS.values():
+        monkeypatch.setattr(backend, "page_texts", spy(backend))
+    monkeypatch.setattr(parsers, "FAST_BACKEND_MIN_PAGES", 3)
+    parse_file(_named_stream(_pdf_bytes(2), "c.pdf"))
+    parse_file(_named_stream(_pdf_bytes(3), "c.pdf"))
+    assert used == ["pdfplumber", "pypdfium2"]
+
+
+def test_backend_setting(monkeypatch):
+    from utils.cache import text_kind
+    monkeypatch.setenv("CONTRACT_PDF_BACKEND", "pdfplumber")
+    assert parsers.pdf_backend_setting() == "pdfplumber"
+    assert text_kind("a.PDF") == "text.pdf:pdfplumber"
+    assert text_kind("a.docx") == "text.docx"
+    monkeypatch.setenv("CONTRACT_PDF_BACKEND", "nonesuch")
+    with pytest.raises(ValueError):
+        parse_file(_named_stream(_pdf_bytes(1), "c.pdf"))
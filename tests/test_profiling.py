@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from contract_parser.analysis_session import AnalysisSession
+from utils.profiling import StageTimer, profile, summarize_trace, timed, timer
+
+CONTRACT = b"""SERVICE AGREEMENT
+This Agreement is entered into between Alpha Pvt Ltd and Beta LLP on 01/04/2024.
+1. Payment. The Client shall pay Rs. 50,000 within 30 days of invoice.
+2. Termination. The Vendor may terminate this Agreement at any time without notice.
+3. Liability. The Vendor shall have unlimited liability for all losses.
+"""
+
+
+class TestStageTimer:
+    """Test stage timing, histograms and traces."""
+
+    def test_stage_records_histogram(self):
+        stage_timer = StageTimer()
+        for _ in range(3):
+            with stage_timer.stage("parse"):
+                pass
+        stats = stage_timer.snapshot()["parse"]
+        assert stats["count"] == 3
+        assert sum(stats["histogram"].values()) == 3
+        assert stats["p95_ms"] <= stats["max_ms"]
+
+    def test_disabled_records_nothing(self):
+        stage_timer = StageTimer(enabled=False)
+
+        @timed("work", stage_timer=stage_timer)
+        def work(value):
+            return value * 2
+
+        with stage_timer.trace() as trace:
+            with stage_timer.stage("parse"):
+                pass
+            assert work(2) == 4
+            assert list(stage_timer.iterate("split", [1, 2])) == [1, 2]
+        assert stage_timer.snapshot() == {}
+        assert trace == []
+
+    def test_timed_sync_and_async(self):
+        stage_timer = StageTimer()
+
+        @timed("sync", stage_timer=stage_timer)
+        def double(value):
+            return value * 2
+
+        @timed("async", stage_timer=stage_timer)
+        async def triple(value):
+            await asyncio.sleep(0)
+            return value * 3
+
+        assert double.__name__ == "double"
+        assert double(2) == 4
+        assert asyncio.run(triple(2)) == 6
+        assert set(stage_timer.snapshot()) == {"sync", "async"}
+
+    def test_timed_records_failures(self):
+        stage_timer = StageTimer()
+
+        @timed("broken", stage_timer=stage_timer)
+        def broken():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            broken()
+        assert stage_timer.snapshot()["broken"]["count"] == 1
+
+    def test_iterate_records_one_stage(self):
+        stage_timer = StageTimer()
+        assert list(stage_timer.iterate("split", iter("abc"))) == ["a", "b", "c"]
+        assert stage_timer.snapshot()["split"]["count"] == 1
+
+    def test_trace_collects_nested_context(self):
+        stage_timer = StageTimer()
+        with stage_timer.trace() as outer:
+            with stage_timer.stage("a"):
+                with stage_timer.trace() as inner:
+                    with stage_timer.stage("b"):
+                        pass
+                # re-entering an active trace does not record twice
+                with stage_timer.trace(outer):
+                    with stage_timer.stage("c"):
+                        pass
+        with stage_timer.stage("d"):
+            pass
+        assert [name for name, _ in outer] == ["b", "c", "a"]
+        assert [name for name, _ in inner] == ["b"]
+
+    def test_summarize_trace(self):
+        rows = summarize_trace([("parse", 0.01), ("llm", 0.5), ("parse", 0.02)])
+        assert rows == [{"stage": "parse", "calls": 2, "ms": 30.0}, {"stage": "llm", "calls": 1, "ms": 500.0}]
+
+
+class TestPipelineStages:
+    """Test the instrumented analysis pipeline."""
+
+    def test_session_trace_covers_stages(self):
+        session = AnalysisSession(CONTRACT, "contract.txt")
+        session.classification
+        session.entities
+        session.clause_results
+        session.compliance_report
+        stages = {row["stage"] for row in summarize_trace(session.trace)}
+        if timer.enabled:
+            assert {"parse", "classification", "entities.parties", "risk_scoring", "clause_split",
+                    "compliance"} <= stages
+        else:
+            assert stages == set()
+
+    def test_profile_reports_functions(self):
+        session = AnalysisSession(CONTRACT, "contract.txt")
+        with profile("cProfile", top=10) as result:
+            session.clause_results
+        assert "score" in result.text
+        assert result.seconds > 0
+
+    def test_unknown_profiler(self):
+        with pytest.raises(ValueError):
+            with profile("perf"):
+                pass
@@ -0,0 +1,70 @@
+import os
+
+from contract_parser.knowledge_base import ContractKnowledgeBase
+from contract_parser.reference_index import ReferenceIndex, reference_documents, tokenize
+
+
+class TestReferenceIndex:
+    """Test the TF-IDF index over templates, alternatives and known issues."""
+
+    def test_documents_cover_all_sources(self):
+        documents = reference_documents()
+        sources = {d["source"] for d in documents}
+        assert sources == {"template", "alternative", "issue"}
+        assert sum(d["source"] == "issue" for d in documents) == len(ContractKnowledgeBase.COMMON_ISSUES)
+
+    def test_stop_words_ignored(self):
+        assert tokenize("Termination of the Clause") == ["termination"]
+        index = ReferenceIndex.build()
+        assert index.search(["of the clause"]) == [[]]
+
+    def test_batch_matches_single_queries(self):
+        index = ReferenceIndex.build()
+        texts = [
+            "Client shall indemnify and hold harmless the Vendor from all claims",
+            "Payment terms net 30 days from invoice",
+            "",
+        ]
+        batch = index.search(texts, top_k=3)
+        assert batch == [index.search([text], top_k=3)[0] for text in texts]
+        assert batch[0][0]["key"] == "indemnity_overreach"
+        assert batch[1][0]["source"] == "template"
+        assert batch[2] == []
+
+    def test_sources_filter(self):
+        index = ReferenceIndex.build()
+        matches = index.search(["automatic renewal of the term"], top_k=5, sources=["alternative"])[0]
+        assert matches and all(m["source"] == "alternative" for m in matches)
+        assert matches[0]["key"] == "auto_renewal"
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "index.npz")
+        index = ReferenceIndex.build(fingerprint="abc")
+        index.save(path)
+        loaded = ReferenceIndex.load(path)
+        assert loaded.fingerprint == "abc"
+        query = ["Either party may terminate without notice"]
+        assert loaded.search(query) == index.search(query)
+
+    def test_load_or_build_rebuilds_stale_index(self, tmp_path):
+        path = str(tmp_path / "index.npz")
+        ReferenceIndex.build(fingerprint="stale").save(path)
+        index = ReferenceIndex.load_or_build(path)
+        assert index.fingerprint != "stale"
+        assert ReferenceIndex.load(path).fingerprint == index.fingerprint
+        assert os.listdir(tmp_path) == ["index.npz"]
+
+
+class TestKnowledgeBaseSearch:
+    """Test knowledge-base lookups through the reference index."""
+
+    def test_similar_issues_ignore_filler_words(self):
+        assert ContractKnowledgeBase.get_similar_issues("the terms of this clause") == []
+        similar = ContractKnowledgeBase.get_similar_issues("Client must indemnify vendor for all losses")
+        assert similar[0]["key"] == "indemnity_overreach"
+
+    def test_suggestions(self):
+        suggestions = ContractKnowledgeBase.suggest_from_knowledge_base(
+            "Vendor may terminate this agreement at any time without notice", [])
+        assert suggestions[0]["based_on"] == "Knowledge Base"
+        assert suggestions[0]["issue"] == ContractKnowledgeBase.COMMON_ISSUES["unilateral_termination"]["title"]
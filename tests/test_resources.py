@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from utils.resources import ResourceRegistry
+
+
+class TestResourceRegistry:
+    """Test lazily built, process-wide shared resources."""
+
+    def test_built_lazily_and_once(self):
+        registry = ResourceRegistry()
+        built = []
+        registry.register("model", lambda: built.append(1) or object())
+        assert not registry.is_loaded("model")
+        first = registry.get("model")
+        assert registry.get("model") is first
+        assert built == [1]
+        assert "model" in registry.build_times
+
+    def test_concurrent_first_use_builds_once(self):
+        registry = ResourceRegistry()
+        built = []
+
+        def slow_factory():
+            time.sleep(0.05)
+            built.append(1)
+            return object()
+
+        registry.register("model", slow_factory)
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(registry.get("model"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert built == [1]
+        assert len({id(i) for i in instances}) == 1
+
+    def test_reregistering_keeps_instance(self):
+        registry = ResourceRegistry()
+        registry.register("model", object)
+        first = registry.get("model")
+        registry.register("model", object)
+        assert registry.get("model") is first
+
+    def test_unknown_resource(self):
+        with pytest.raises(KeyError):
+            ResourceRegistry().get("missing")
+
+    def test_reset_rebuilds(self):
+        registry = ResourceRegistry()
+        registry.register("model", object)
+        first = registry.get("model")
+        registry.reset("model")
+        assert registry.get("model") is not first
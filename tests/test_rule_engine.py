@@ -0,0 +1,56 @@
+import random
+import re
+
+from contract_parser.advanced_risk_assessor import AdvancedRiskAssessor
+from contract_parser.risk_assessor import RiskAssessor
+from contract_parser.rule_engine import RuleEngine
+
+
+VOCABULARY = (
+    "The Vendor may terminate at will and shall INDEMNIFY hold harmless Client "
+    "for all damages; Non-Compete non compete auto-renew Automatically Renew "
+    "assigns all rights to Intellectual Property under Jurisdiction of courts "
+    "with a Lock-in minimum term possibly where applicable trade secret non-disclosure "
+    "penalty late fee unlimited liability no cap could might"
+).split()
+
+
+def make_clauses(count: int):
+    rng = random.Random(3)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(3, 25))) for _ in range(count)]
+
+
+class TestRuleEngine:
+    """Test single-fold rule matching."""
+
+    def test_matches_case_insensitively(self):
+        engine = RuleEngine([r"indemnif", r"non-?compete", r"\bsoon\b"])
+        assert engine.scan("The Vendor shall INDEMNIFY and respond SOON.") == [0, 2]
+
+    def test_uppercase_pattern_keeps_its_meaning(self):
+        engine = RuleEngine([r"\S+@\S+", r"notice"])
+        assert engine.scan("Send NOTICE to a@b.com") == [0, 1]
+        assert engine.scan("   ") == []
+
+    def test_same_hits_as_ignorecase_search(self):
+        assessor = AdvancedRiskAssessor()
+        for clause in make_clauses(300):
+            expected = [
+                i for i, rule in enumerate(assessor.detailed_rules)
+                if re.search(rule["pattern"], clause, re.IGNORECASE)
+            ]
+            assert assessor.rule_engine.scan(clause) == expected
+
+
+class TestRiskAssessor:
+    """Test the basic assessor on top of the rule engine."""
+
+    def test_score_clause(self):
+        level, reasons = RiskAssessor().score_clause("This agreement will auto-renew each year.")
+        assert level == "Medium"
+        assert reasons == ["Auto-renewal detected"]
+
+    def test_damages_escalates_to_high(self):
+        level, reasons = RiskAssessor().score_clause("Liquidated damages apply.")
+        assert level == "High"
+        assert reasons == []
@@ -0,0 +1,73 @@
+import re
+
+from contract_parser.nlp import ContractNLP
+from contract_parser.segmentation import clause_texts, heading_text, segment_clauses
+
+NUMBERED = """ARTICLE 5 PAYMENT TERMS
+5.1 The Buyer shall pay the price within 30 days; late payment attracts interest.
+5.2 All amounts are exclusive of applicable GST.
+
+CONFIDENTIALITY
+Each party shall keep the other party's information confidential.
+6. Termination: Either party may terminate on 30 days written notice.
+"""
+
+
+class TestSegmentation:
+    """Test the shared clause segmentation engine."""
+
+    def test_offsets_index_the_document(self):
+        clauses = list(segment_clauses(NUMBERED))
+        assert [c.index for c in clauses] == list(range(len(clauses)))
+        assert all(NUMBERED[c.start:c.end] == c.text for c in clauses)
+
+    def test_sections_and_headings(self):
+        clauses = [(c.section, c.heading, c.text[:12]) for c in segment_clauses(NUMBERED)]
+        assert clauses == [
+            ("5.1", "PAYMENT TERMS", "5.1 The Buye"),
+            ("5.1", "PAYMENT TERMS", "late payment"),
+            ("5.2", "PAYMENT TERMS", "5.2 All amou"),
+            (None, "CONFIDENTIALITY", "Each party s"),
+            ("6", "Termination", "6. Terminati"),
+        ]
+
+    def test_heading_detection(self):
+        assert heading_text("PAYMENT TERMS") == "PAYMENT TERMS"
+        assert heading_text("Limitation of Liability:") == "Limitation of Liability"
+        assert heading_text("The Vendor shall deliver the goods") is None
+        assert heading_text("DEFINITIONS.") is None
+        assert heading_text("NDA") == "NDA"
+
+    def test_long_heading_like_lines_are_still_clauses(self):
+        text = ("1. Liability\nVENDOR SHALL HAVE UNLIMITED LIABILITY FOR ALL DAMAGES\n"
+                "Client May Terminate This Agreement At Any Time\n2. Payment: The Client shall pay within 30 days.\n")
+        clauses = [(c.text, c.heading) for c in segment_clauses(text)]
+        assert clauses == [
+            ("VENDOR SHALL HAVE UNLIMITED LIABILITY FOR ALL DAMAGES", "VENDOR SHALL HAVE UNLIMITED LIABILITY FOR ALL DAMAGES"),
+            ("Client May Terminate This Agreement At Any Time", "Client May Terminate This Agreement At Any Time"),
+            ("2. Payment: The Client shall pay within 30 days.", "Payment"),
+        ]
+        assert clause_texts(text) == [p.strip() for p in re.split(r"\n{1,}|;|\.\s{2,}", text) if len(p.strip()) > 20]
+
+    def test_hindi_sentences_are_not_headings(self):
+        assert heading_text("भुगतान पार्टी A और पार्टी B के बीच") is None
+        assert heading_text("कुल राशि Rs 50,000 देय है") is None
+        assert heading_text("यह समझौता पार्टी A और पार्टी B के बीच किया गया है।") is None
+
+    def test_hindi_keeps_every_clause(self):
+        with open("data/sample_contract_hi.txt", "r", encoding="utf-8") as f:
+            text = f.read()
+        parts = [p.strip() for p in re.split(r"\n{1,}|;|\.\s{2,}", text) if len(p.strip()) > 20]
+        assert clause_texts(text) == parts
+
+    def test_matches_previous_split(self):
+        with open("data/sample_contract_en.txt", "r", encoding="utf-8") as f:
+            text = f.read()
+        parts = [p.strip() for p in re.split(r"\n{1,}|;|\.\s{2,}", text) if len(p.strip()) > 20]
+        assert clause_texts(text) == parts
+
+    def test_no_clause_cap(self):
+        text = "The Vendor shall deliver the goods within thirty days.\n" * 500
+        assert sum(1 for _ in segment_clauses(text)) == 500
+        nlp = ContractNLP(model_name="not_installed")
+        assert len(nlp.extract_clauses(nlp.process_text(text, outputs=["clauses"]))) == 500
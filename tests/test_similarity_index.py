@@ -0,0 +1,46 @@
+from contract_parser.advanced_nlp import ClauseSimilarity
+from contract_parser.similarity_index import ClauseIndex, normalize
+
+LIBRARY = [
+    "Both parties agree to maintain confidentiality of proprietary information.",
+    "Either party may terminate this Agreement with 30 days written notice.",
+    "Late payments attract 1.5% monthly interest, capped at 18% per annum.",
+    "The Vendor shall indemnify the Client against third party claims.",
+]
+
+
+class TestClauseIndex:
+    """Test the MinHash/LSH clause similarity index."""
+
+    def test_finds_near_duplicates(self):
+        index = ClauseIndex(LIBRARY)
+        matches = index.query("Either party may terminate this agreement with 60 days written notice.", 0.7)
+        assert [m["template_clause"] for m in matches] == [LIBRARY[1]]
+        assert index.candidates(LIBRARY[2]) == [2]
+
+    def test_scores_match_full_scan(self):
+        similarity = ClauseSimilarity(threshold=0.6)
+        index = similarity.build_index(LIBRARY)
+        clauses = [
+            "We shall maintain confidentiality of proprietary information.",
+            "The Vendor shall indemnify the Client against all third party claims.",
+            "Unrelated text about delivery schedules.",
+        ]
+        bulk = similarity.find_similar_clauses_bulk(clauses, index)
+        assert bulk == [similarity.find_similar_clauses(clause, LIBRARY) for clause in clauses]
+        assert bulk[2] == []
+
+    def test_query_many_reuses_repeated_clauses(self):
+        index = ClauseIndex(LIBRARY)
+        results = index.query_many([LIBRARY[0], LIBRARY[0]], 0.9, top_k=1)
+        assert results[0] == results[1]
+        assert results[0][0]["similarity_score"] == 1.0
+        results[0][0]["similarity_score"] = 0
+        assert results[1][0]["similarity_score"] == 1.0
+
+    def test_signature_is_deterministic(self):
+        first, second = ClauseIndex(), ClauseIndex()
+        text = normalize("  Confidential   INFORMATION ")
+        assert text == "confidential information"
+        assert (first.signature(text) == second.signature(text)).all()
+        assert len(first.signature("")) == first.bands * first.rows
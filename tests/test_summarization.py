@@ -0,0 +1,116 @@
+import random
+import zlib
+
+from contract_parser.llm_cache import LLMResponseCache
+from contract_parser.llm_client import LLMClient
+from contract_parser.summarization import estimate_tokens, pack_texts, summary_chunks
+from fake_llm import FakeModel
+
+WORDS = ("vendor client shall pay invoice days notice terminate confidential information liability "
+         "damages indemnify warranty services deliver goods period term renewal").split()
+
+
+def long_contract(sections: int = 40, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for s in range(1, sections + 1):
+        lines.append(f"{s}. SECTION {s}")
+        for k in range(rng.randint(2, 5)):
+            lines.append(f"{s}.{k + 1} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 50))) + ".")
+    return "\n".join(lines)
+
+
+class ShortAnswerModel(FakeModel):
+    """Answers with a short digest of the prompt, like a real summary."""
+
+    def reply(self, prompt: str) -> str:
+        kind = "combined" if prompt.startswith("These are summaries") else "part"
+        return f"{kind} summary {zlib.crc32(prompt.encode()):08x}"
+
+
+class TestSummaryChunks:
+    """Test splitting long contracts into token-budgeted chunks."""
+
+    def test_chunks_cover_text_within_budget(self):
+        text = long_contract()
+        chunks = summary_chunks(text, max_tokens=400)
+        assert "".join(chunks) == text
+        assert len(chunks) > 5
+        assert all(estimate_tokens(chunk) <= 400 for chunk in chunks)
+        # cuts fall at line starts
+        assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+
+    def test_overlong_clause_is_split(self):
+        text = "1. " + "word " * 2000
+        chunks = summary_chunks(text, max_tokens=300)
+        assert "".join(chunks) == text and all(estimate_tokens(c) <= 300 for c in chunks)
+
+    def test_edit_changes_only_nearby_chunks(self):
+        text = long_contract()
+        position = text.index(" ", len(text) // 2)
+        edited = text[:position] + " and the supplier" + text[position:]
+        before, after = summary_chunks(text, 400), summary_chunks(edited, 400)
+        assert len(set(before) - set(after)) <= 2
+
+    def test_pack_texts(self):
+        assert pack_texts(["a" * 40, "b" * 40, "c" * 40], max_tokens=25) == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+        assert pack_texts(["x" * 400], max_tokens=25) == ["x" * 400]
+
+
+class TestMapReduceSummary:
+    """Test map-reduce summarization of long contracts."""
+
+    def test_long_contract_is_summarized_in_chunks(self):
+        text = long_contract()
+        model = ShortAnswerModel(latency=0.02)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_concurrency=8, cache=None,
+                        summary_chunk_tokens=400)
+        summary = llm.summarize(text)
+        chunks = summary_chunks(text, 400)
+        assert summary.startswith("combined summary")
+        assert len(model.prompts) == len(chunks) + 1
+        assert model.max_in_flight > 1
+        # the final prompt covers the last part of the contract too
+        assert all(chunk in "".join(model.prompts[:-1]) for chunk in chunks)
+
+    def test_short_text_is_one_request(self):
+        model = ShortAnswerModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=None, summary_chunk_tokens=400)
+        assert llm.summarize("Payment within 30 days.").startswith("part summary")
+        assert len(model.prompts) == 1
+
+    def test_summaries_are_reduced_in_rounds(self):
+        text = long_contract(sections=120)
+        model = ShortAnswerModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, max_concurrency=8, cache=None,
+                        summary_chunk_tokens=150)
+        chunks = summary_chunks(text, 150)
+        llm.summarize(text)
+        combines = [p for p in model.prompts if p.startswith("These are summaries")]
+        assert len(model.prompts) - len(combines) == len(chunks)
+        assert len(combines) > 1
+        assert all(estimate_tokens(p) <= 150 + 60 for p in combines)
+
+    def test_edit_only_resummarizes_changed_chunks(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        text = long_contract()
+        model = ShortAnswerModel()
+        llm = LLMClient(model=model, requests_per_minute=60000, cache=cache, summary_chunk_tokens=400)
+        llm.summarize(text)
+        first = len(model.prompts)
+        position = text.index(" ", len(text) // 2)
+        llm.summarize(text[:position] + " and the supplier" + text[position:])
+        assert 2 <= len(model.prompts) - first <= 3  # changed chunk(s) plus the final combination
+
+    def test_failed_chunk_keeps_rest_of_summary(self):
+        text = long_contract()
+        model = ShortAnswerModel(failures=1)
+        llm = LLMClient(model=model, requests_per_minute=60000, max_concurrency=1, max_retries=0, cache=None,
+                        summary_chunk_tokens=400)
+        assert llm.summarize(text).startswith("combined summary")
+        assert summary_chunks(text, 400)[0].strip()[:100] in model.prompts[-1]
+
+    def test_streamed_summary_of_long_contract(self):
+        text = long_contract()
+        llm = LLMClient(model=ShortAnswerModel(), requests_per_minute=60000, cache=None, summary_chunk_tokens=400)
+        assert "".join(llm.stream_summary(text)) == llm.summarize(text)
@@ -1,17 +1,47 @@
-import json
+import os
+import copy
 import datetime
-from threading import Lock
-from typing import Dict, List
+from typing import Dict, Iterator, List
 import hashlib
+from utils.audit_store import SegmentedLogStore, migrate_legacy_json, segment_directory
+from utils.audit_index import AuditIndex
+from utils.audit_stats import AuditAggregates, CHECKPOINT_FILENAME
 
 
 class AuditLogger:
-    """Advanced audit logging with detailed event tracking and compliance."""
+    """Advanced audit logging with detailed event tracking and compliance.
+
+    Events are appended to a segment-rotated JSON-Lines store next to ``path``
+    (``audit_logs.json`` -> ``audit_logs.d/``). An existing legacy JSON array at
+    ``path`` is migrated into the store on first use. Queries go through a
+    SQLite sidecar index (``audit_logs.d/index.sqlite3``) kept on timestamp,
+    event type, severity and session. Counters for the compliance summary are
+    maintained on every write and checkpointed to ``audit_logs.d/summary.json``.
+    """
     
-    def __init__(self, path: str = "audit_logs.json"):
+    def __init__(
+        self,
+        path: str = "audit_logs.json",
+        max_segment_bytes: int = 8 * 1024 * 1024,
+        max_segment_age: float = 24 * 3600,
+        fsync: str = "interval",
+        checkpoint_every: int = 100,
+    ):
         self.path = path
-        self.lock = Lock()
+        self.store = SegmentedLogStore(
+            segment_directory(path),
+            max_segment_bytes=max_segment_bytes,
+            max_segment_age=max_segment_age,
+            fsync=fsync,
+        )
+        self.lock = self.store.lock
         self.session_id = hashlib.md5(datetime.datetime.utcnow().isoformat().encode()).hexdigest()[:12]
+        migrate_legacy_json(path, self.store)
+        self.index = AuditIndex(self.store)
+        self.checkpoint_path = os.path.join(self.store.directory, CHECKPOINT_FILENAME)
+        self.checkpoint_every = checkpoint_every
+        self.aggregates = AuditAggregates.load(self.checkpoint_path, self.store)
+        self.aggregates.save(self.checkpoint_path, min_dirty=1)
 
     def log_event(self, event_type: str, payload: dict, severity: str = "INFO", user: str = "anonymous"):
         """Log an event with detailed metadata."""
@@ -26,18 +56,25 @@ class AuditLogger:
             "payload": payload,
         }
         
-        with self.lock:
-            try:
-                existing = []
-                with open(self.path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-            except Exception:
-                existing = []
-            
-            existing.append(entry)
-            
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(existing, f, indent=2, ensure_ascii=False)
+        segment, start, end = self.store.append(entry)
+        self.aggregates.record(entry, segment, start, end, self.store)
+        self.aggregates.save(self.checkpoint_path, min_dirty=self.checkpoint_every)
+
+    def with_session(self, session_id: str) -> "AuditLogger":
+        """A logger for another session that shares this one's store, index and counters."""
+        logger = copy.copy(self)
+        logger.session_id = session_id
+        return logger
+
+    def close(self):
+        """Checkpoint the aggregates, then close the active log segment and the query index."""
+        self.aggregates.save(self.checkpoint_path)
+        self.store.close()
+        self.index.close()
+
+    def iter_events(self) -> Iterator[Dict]:
+        """Stream all logged events, oldest first."""
+        return self.store.iter_entries()
 
     def _generate_event_id(self) -> str:
         """Generate unique event ID."""
@@ -129,31 +166,27 @@ class AuditLogger:
         )
 
     def get_audit_report(self, filters: Dict = None) -> List[Dict]:
-        """Get audit logs with optional filtering."""
-        try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        except Exception:
-            return []
+        """Get audit logs with optional filtering.
 
-        if not filters:
-            return logs
+        Supported filters: event_type, severity, session_id, user, start_date, end_date.
+        """
+        return list(self.index.iter_query(filters))
 
-        filtered = logs
-        
-        if "event_type" in filters:
-            filtered = [log for log in filtered if log.get("event") == filters["event_type"]]
-        
-        if "severity" in filters:
-            filtered = [log for log in filtered if log.get("severity") == filters["severity"]]
-        
-        if "start_date" in filters:
-            filtered = [log for log in filtered if log.get("timestamp") >= filters["start_date"]]
-        
-        if "end_date" in filters:
-            filtered = [log for log in filtered if log.get("timestamp") <= filters["end_date"]]
+    def query_events(self, filters: Dict = None, limit: int = 100, offset: int = 0, newest_first: bool = False) -> List[Dict]:
+        """Get one page of audit logs matching the filters."""
+        return self.index.query(filters, limit=limit, offset=offset, newest_first=newest_first)
 
-        return filtered
+    def iter_audit_report(self, filters: Dict = None, newest_first: bool = False) -> Iterator[Dict]:
+        """Stream audit logs matching the filters without loading them all."""
+        return self.index.iter_query(filters, newest_first=newest_first)
+
+    def count_events(self, filters: Dict = None) -> int:
+        """Count audit logs matching the filters."""
+        return self.index.count(filters)
+
+    def get_event_types(self) -> List[str]:
+        """List the distinct event types that have been logged."""
+        return self.index.distinct("event")
 
     def get_session_events(self, session_id: str = None) -> List[Dict]:
         """Get all events for a session."""
@@ -161,30 +194,16 @@ class AuditLogger:
         return self.get_audit_report({"session_id": session})
 
     def get_compliance_summary(self) -> Dict:
-        """Get compliance audit summary."""
-        try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        except Exception:
-            return {"status": "No logs available"}
-
-        total_events = len(logs)
-        events_by_type = {}
-        errors_count = 0
-        
-        for log in logs:
-            event_type = log.get("event", "unknown")
-            events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
-            
-            if log.get("severity") == "ERROR":
-                errors_count += 1
-
-        return {
-            "total_events": total_events,
-            "total_errors": errors_count,
-            "event_types": events_by_type,
-            "error_rate_percent": round((errors_count / total_events * 100), 2) if total_events > 0 else 0,
-            "first_event": logs[0].get("timestamp") if logs else None,
-            "last_event": logs[-1].get("timestamp") if logs else None,
-        }
-
+        """Get compliance audit summary from the running aggregates."""
+        self.aggregates.catch_up(self.store)
+        return self.aggregates.summary()
+
+    def get_activity_rollup(self, granularity: str = "day", last: int = 30) -> List[Dict]:
+        """Event and error counts per hour or day, oldest first."""
+        self.aggregates.catch_up(self.store)
+        return self.aggregates.rollup(granularity, last)
+
+    def rebuild_aggregates(self):
+        """Recompute the summary counters from the raw log and checkpoint them."""
+        self.aggregates.rebuild(self.store)
+        self.aggregates.save(self.checkpoint_path)
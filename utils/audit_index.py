@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.audit_store import SegmentedLogStore
+
+
+INDEX_FILENAME = "index.sqlite3"
+
+# filter key -> indexed column
+FILTER_COLUMNS = {
+    "event_type": "event",
+    "severity": "severity",
+    "session_id": "session_id",
+    "user": "user",
+}
+
+
+class AuditIndex:
+    """SQLite sidecar index over a SegmentedLogStore.
+
+    Only the position of each event plus its timestamp, event type, severity,
+    session and user are indexed; the event bodies stay in the segments. The
+    index catches up lazily from a stored cursor before every query, so
+    ``log_event`` never touches it. Deleting the index file rebuilds it.
+    """
+
+    def __init__(self, store: SegmentedLogStore, path: str = None):
+        self.store = store
+        self.path = path or os.path.join(store.directory, INDEX_FILENAME)
+        self.lock = Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS events (
+                    seq INTEGER PRIMARY KEY,
+                    timestamp TEXT,
+                    event TEXT,
+                    severity TEXT,
+                    session_id TEXT,
+                    user TEXT,
+                    segment TEXT,
+                    start INTEGER,
+                    end INTEGER
+                )"""
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS cursor (id INTEGER PRIMARY KEY CHECK (id = 0), segment TEXT, offset INTEGER)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_event ON events (event, timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_severity ON events (severity, timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_id, timestamp)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------ indexing
+
+    def sync(self, batch_size: int = 5000) -> int:
+        """Index events appended since the last sync. Returns the number indexed."""
+        with self.lock:
+            row = self.conn.execute("SELECT segment, offset FROM cursor WHERE id = 0").fetchone()
+            segment, offset = row if row else (None, 0)
+            indexed = 0
+            batch = []
+            for name, start, end, entry in self.store.iter_records(segment, offset):
+                batch.append((
+                    entry.get("timestamp"),
+                    entry.get("event"),
+                    entry.get("severity"),
+                    entry.get("session_id"),
+                    entry.get("user"),
+                    name,
+                    start,
+                    end,
+                ))
+                segment, offset = name, end
+                if len(batch) >= batch_size:
+                    indexed += self._flush(batch, segment, offset)
+                    batch = []
+            if batch:
+                indexed += self._flush(batch, segment, offset)
+            return indexed
+
+    def _flush(self, batch: List[Tuple], segment: str, offset: int) -> int:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO events (timestamp, event, severity, session_id, user, segment, start, end) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cursor (id, segment, offset) VALUES (0, ?, ?)",
+                (segment, offset),
+            )
+        return len(batch)
+
+    # ------------------------------------------------------------------ querying
+
+    @staticmethod
+    def _where(filters: Optional[Dict]) -> Tuple[str, List]:
+        clauses, params = [], []
+        for key, column in FILTER_COLUMNS.items():
+            if filters and key in filters:
+                clauses.append(f"{column} = ?")
+                params.append(filters[key])
+        if filters and "start_date" in filters:
+            clauses.append("timestamp >= ?")
+            params.append(filters["start_date"])
+        if filters and "end_date" in filters:
+            clauses.append("timestamp <= ?")
+            params.append(filters["end_date"])
+        return (" AND ".join(clauses) or "1"), params
+
+    def count(self, filters: Dict = None) -> int:
+        self.sync()
+        where, params = self._where(filters)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM events WHERE {where}", params).fetchone()[0]
+
+    def query(self, filters: Dict = None, limit: int = 100, offset: int = 0, newest_first: bool = False) -> List[Dict]:
+        """One page of matching events."""
+        self.sync()
+        where, params = self._where(filters)
+        order = "DESC" if newest_first else "ASC"
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT segment, start, end FROM events WHERE {where} ORDER BY seq {order} LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return self._load(rows)
+
+    def iter_query(self, filters: Dict = None, batch_size: int = 1000, newest_first: bool = False) -> Iterator[Dict]:
+        """Stream all matching events using keyset pagination."""
+        self.sync()
+        where, params = self._where(filters)
+        order, op = ("DESC", "<") if newest_first else ("ASC", ">")
+        last_seq = None
+        while True:
+            keyset = f" AND seq {op} ?" if last_seq is not None else ""
+            keyset_params = [last_seq] if last_seq is not None else []
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT seq, segment, start, end FROM events WHERE {where}{keyset} ORDER BY seq {order} LIMIT ?",
+                    params + keyset_params + [batch_size],
+                ).fetchall()
+            if not rows:
+                return
+            last_seq = rows[-1][0]
+            yield from self._load([r[1:] for r in rows])
+
+    def distinct(self, column: str) -> List[str]:
+        """Distinct values of an indexed filter column (e.g. event types for a dropdown)."""
+        if column not in FILTER_COLUMNS.values():
+            raise ValueError(f"Unknown column '{column}'")
+        self.sync()
+        with self.lock:
+            rows = self.conn.execute(f"SELECT DISTINCT {column} FROM events WHERE {column} IS NOT NULL ORDER BY {column}").fetchall()
+        return [r[0] for r in rows]
+
+    def _load(self, rows: List[Tuple[str, int, int]]) -> List[Dict]:
+        """Read event bodies, keeping one open handle per segment."""
+        handles = {}
+        events = []
+        try:
+            for segment, start, end in rows:
+                handle = handles.get(segment)
+                if handle is None:
+                    try:
+                        handle = handles[segment] = open(self.store.segment_path(segment), "rb")
+                    except FileNotFoundError:
+                        continue
+                handle.seek(start)
+                try:
+                    events.append(json.loads(handle.read(end - start)))
+                except ValueError:
+                    continue
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return events
+
@@ -0,0 +1,198 @@
+import json
+import os
+import datetime
+import tempfile
+from threading import Lock
+from typing import Dict, List, Optional
+from utils.audit_store import SegmentedLogStore
+
+
+CHECKPOINT_FILENAME = "summary.json"
+
+
+class AuditAggregates:
+    """Running audit counters with hourly/daily rollups, checkpointed to disk.
+
+    The checkpoint records the log position it covers, so after a restart (or
+    writes from another process) only the tail of the log is replayed. If the
+    checkpoint is lost or unreadable it is rebuilt from the raw segments.
+    """
+
+    def __init__(self, hourly_retention_days: int = 14):
+        self.hourly_retention_days = hourly_retention_days
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.total_events = 0
+        self.total_errors = 0
+        self.event_types: Dict[str, int] = {}
+        self.severities: Dict[str, int] = {}
+        self.first_event: Optional[str] = None
+        self.last_event: Optional[str] = None
+        self.hourly: Dict[str, Dict[str, int]] = {}
+        self.daily: Dict[str, Dict[str, int]] = {}
+        self.segment: Optional[str] = None
+        self.offset = 0
+        self.dirty = 0
+
+    # ------------------------------------------------------------------ updates
+
+    def apply(self, entry: Dict):
+        """Fold one event into the aggregates."""
+        self.total_events += 1
+        is_error = entry.get("severity") == "ERROR"
+        if is_error:
+            self.total_errors += 1
+
+        event_type = entry.get("event", "unknown")
+        self.event_types[event_type] = self.event_types.get(event_type, 0) + 1
+        severity = entry.get("severity", "INFO")
+        self.severities[severity] = self.severities.get(severity, 0) + 1
+
+        timestamp = entry.get("timestamp")
+        if timestamp:
+            if self.first_event is None:
+                self.first_event = timestamp
+            self.last_event = timestamp
+            self._bump(self.daily, timestamp[:10], is_error)
+            hour = timestamp[:13]
+            if hour not in self.hourly:
+                self._prune_hourly(timestamp[:10])
+            self._bump(self.hourly, hour, is_error)
+        self.dirty += 1
+
+    def record(self, entry: Dict, segment: str, start: int, end: int, store: SegmentedLogStore):
+        """Account for an entry just appended at (segment, start, end).
+
+        Applied directly when it directly follows the covered position;
+        otherwise someone else wrote in between and the tail is replayed.
+        """
+        with self.lock:
+            if self.segment == segment and self.offset == start:
+                self.apply(entry)
+                self.offset = end
+            else:
+                self._catch_up(store)
+
+    def catch_up(self, store: SegmentedLogStore):
+        """Replay events appended after the covered position."""
+        with self.lock:
+            self._catch_up(store)
+
+    def _catch_up(self, store: SegmentedLogStore):
+        for name, _, end, entry in store.iter_records(self.segment, self.offset):
+            self.apply(entry)
+            self.segment, self.offset = name, end
+
+    def rebuild(self, store: SegmentedLogStore):
+        """Recompute everything from the raw log."""
+        with self.lock:
+            self.reset()
+            self._catch_up(store)
+            self.dirty = max(self.dirty, 1)
+
+    @staticmethod
+    def _bump(buckets: Dict[str, Dict[str, int]], key: str, is_error: bool):
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {"events": 0, "errors": 0}
+        bucket["events"] += 1
+        if is_error:
+            bucket["errors"] += 1
+
+    def _prune_hourly(self, day: str):
+        try:
+            cutoff = (datetime.date.fromisoformat(day) - datetime.timedelta(days=self.hourly_retention_days)).isoformat()
+        except ValueError:
+            return
+        for key in [k for k in self.hourly if k < cutoff]:
+            del self.hourly[key]
+
+    # ------------------------------------------------------------------ views
+
+    def summary(self) -> Dict:
+        """Compliance summary in the shape returned by AuditLogger.get_compliance_summary."""
+        with self.lock:
+            if not self.total_events:
+                return {"status": "No logs available"}
+            return {
+                "total_events": self.total_events,
+                "total_errors": self.total_errors,
+                "event_types": dict(self.event_types),
+                "error_rate_percent": round((self.total_errors / self.total_events * 100), 2),
+                "first_event": self.first_event,
+                "last_event": self.last_event,
+            }
+
+    def rollup(self, granularity: str = "day", last: int = 30) -> List[Dict]:
+        """Most recent time buckets, oldest first."""
+        if granularity not in ("hour", "day"):
+            raise ValueError("granularity must be 'hour' or 'day'")
+        with self.lock:
+            buckets = self.hourly if granularity == "hour" else self.daily
+            keys = sorted(buckets)[-last:]
+            return [{"period": k, **buckets[k]} for k in keys]
+
+    # ------------------------------------------------------------------ persistence
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_events": self.total_events,
+            "total_errors": self.total_errors,
+            "event_types": self.event_types,
+            "severities": self.severities,
+            "first_event": self.first_event,
+            "last_event": self.last_event,
+            "hourly": self.hourly,
+            "daily": self.daily,
+            "cursor": {"segment": self.segment, "offset": self.offset},
+        }
+
+    def save(self, path: str, min_dirty: int = 0) -> bool:
+        """Atomically write the checkpoint if at least ``min_dirty`` events are
+        not in it yet. Returns False if skipped or if the write failed; a
+        failed checkpoint is retried on the next save."""
+        with self.lock:
+            if self.dirty < min_dirty:
+                return False
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.to_dict(), f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError:
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                return False
+            self.dirty = 0
+            return True
+
+    @classmethod
+    def load(cls, path: str, store: SegmentedLogStore, hourly_retention_days: int = 14) -> "AuditAggregates":
+        """Load the checkpoint and catch up with the log, rebuilding if it is missing or stale."""
+        aggregates = cls(hourly_retention_days)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            cursor = data["cursor"]
+            if cursor["segment"] is not None and cursor["segment"] not in store.segments():
+                raise ValueError("checkpoint refers to a missing segment")
+            aggregates.total_events = data["total_events"]
+            aggregates.total_errors = data["total_errors"]
+            aggregates.event_types = data["event_types"]
+            aggregates.severities = data["severities"]
+            aggregates.first_event = data["first_event"]
+            aggregates.last_event = data["last_event"]
+            aggregates.hourly = data["hourly"]
+            aggregates.daily = data["daily"]
+            aggregates.segment = cursor["segment"]
+            aggregates.offset = cursor["offset"]
+            aggregates.catch_up(store)
+        except (OSError, ValueError, KeyError, TypeError):
+            aggregates.rebuild(store)
+        return aggregates
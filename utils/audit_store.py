@@ -0,0 +1,232 @@
+import json
+import os
+import re
+import time
+import datetime
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+FSYNC_POLICIES = ("always", "interval", "never")
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+
+def segment_directory(path: str) -> str:
+    """Directory holding the segments for a legacy-style log path (audit_logs.json -> audit_logs.d)."""
+    root, _ = os.path.splitext(path)
+    return root + ".d"
+
+
+class SegmentedLogStore:
+    """Append-only JSON-Lines log split into size/time-rotated segment files.
+
+    Each append is a single write to the tail segment, so logging cost does not
+    grow with the size of the log. Readers stream segments in order.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 8 * 1024 * 1024,
+        max_segment_age: float = 24 * 3600,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got '{fsync}'")
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.lock = Lock()
+        self._handle = None
+        self._segment = None
+        self._segment_started = 0.0
+        self._last_fsync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------------ writing
+
+    def append(self, entry: Dict) -> Tuple[str, int, int]:
+        """Append one entry; returns (segment name, start offset, end offset)."""
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            handle = self._writable_handle(len(line))
+            handle.write(line)
+            # O_APPEND leaves our file position at the end of our own write,
+            # even when another process appended to the same segment.
+            end = handle.tell()
+            self._maybe_fsync(handle)
+            return self._segment, end - len(line), end
+
+    def close(self) -> None:
+        with self.lock:
+            self._close_handle()
+
+    def _writable_handle(self, incoming: int):
+        if self._handle is None:
+            latest = self._latest_segment()
+            if latest is None:
+                self._open_segment(self._segment_name(1))
+            else:
+                self._open_segment(latest)
+
+        size = self._handle.tell()
+        too_big = size > 0 and size + incoming > self.max_segment_bytes
+        too_old = size > 0 and time.time() - self._segment_started > self.max_segment_age
+        if too_big or too_old:
+            self._rotate()
+        return self._handle
+
+    def _rotate(self) -> None:
+        current = self._segment
+        self._close_handle()
+        latest = self._latest_segment()
+        if latest is not None and latest != current:
+            # another writer already rotated; follow it unless it is full too
+            self._open_segment(latest)
+            if not self._is_full(self._handle.tell()):
+                return
+            self._close_handle()
+        seq = self._segment_seq(latest) + 1 if latest else 1
+        self._open_segment(self._segment_name(seq))
+
+    def _is_full(self, size: int) -> bool:
+        return size >= self.max_segment_bytes or time.time() - self._segment_started > self.max_segment_age
+
+    def _open_segment(self, name: str) -> None:
+        path = os.path.join(self.directory, name)
+        self._handle = open(path, "ab", buffering=0)
+        self._segment = name
+        self._segment_started = self._segment_start_time(path)
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            if self.fsync != "never":
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+            self._handle = None
+            self._segment = None
+
+    def _maybe_fsync(self, handle) -> None:
+        if self.fsync == "always":
+            os.fsync(handle.fileno())
+        elif self.fsync == "interval":
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(handle.fileno())
+                self._last_fsync = now
+
+    @staticmethod
+    def _segment_start_time(path: str) -> float:
+        """Timestamp of the first record in a segment (now for an empty one)."""
+        try:
+            with open(path, "rb") as f:
+                first = f.readline()
+            timestamp = json.loads(first).get("timestamp", "")
+            parsed = datetime.datetime.fromisoformat(timestamp.rstrip("Z"))
+            return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+        except Exception:
+            return time.time()
+
+    # ------------------------------------------------------------------ reading
+
+    def segments(self) -> List[str]:
+        """Segment file names in log order."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if SEGMENT_PATTERN.match(n))
+
+    def segment_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def iter_records(self, segment: str = None, offset: int = 0) -> Iterator[Tuple[str, int, int, Dict]]:
+        """Stream (segment, start, end, entry) from a position to the end of the log.
+
+        A trailing line without a newline is a write still in progress (or torn
+        by a crash) and is not returned.
+        """
+        names = self.segments()
+        if segment is not None:
+            names = [n for n in names if n >= segment]
+        for name in names:
+            start = offset if name == segment else 0
+            try:
+                f = open(self.segment_path(name), "rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                f.seek(start)
+                pos = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    end = pos + len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        entry = None
+                    if entry is not None:
+                        yield name, pos, end, entry
+                    pos = end
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Stream every entry in the log, oldest first."""
+        for _, _, _, entry in self.iter_records():
+            yield entry
+
+    def read_at(self, segment: str, start: int, end: int) -> Optional[Dict]:
+        """Read a single entry by its position."""
+        try:
+            with open(self.segment_path(segment), "rb") as f:
+                f.seek(start)
+                return json.loads(f.read(end - start))
+        except (OSError, ValueError):
+            return None
+
+    def _latest_segment(self) -> Optional[str]:
+        names = self.segments()
+        return names[-1] if names else None
+
+    @staticmethod
+    def _segment_name(seq: int) -> str:
+        return f"segment-{seq:06d}.jsonl"
+
+    @staticmethod
+    def _segment_seq(name: str) -> int:
+        return int(SEGMENT_PATTERN.match(name).group(1))
+
+
+def migrate_legacy_json(legacy_path: str, store: SegmentedLogStore) -> int:
+    """One-time import of a legacy ``audit_logs.json`` array into the segment store.
+
+    Entries are written to the reserved segment ``segment-000000.jsonl`` so they
+    sort before anything logged afterwards, and the legacy file is renamed to
+    ``<path>.migrated``. Safe to re-run after a crash mid-migration.
+    Returns the number of migrated entries.
+    """
+    if not os.path.exists(legacy_path):
+        return 0
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(entries, list):
+        return 0
+
+    target = store.segment_path(store._segment_name(0))
+    if not os.path.exists(target):
+        tmp_path = target + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+
+    os.replace(legacy_path, legacy_path + ".migrated")
+    return len(entries)
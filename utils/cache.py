@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import tempfile
+from threading import Lock
+from typing import Any, Callable, Optional, Union
+
+
+DEFAULT_DIRECTORY = "analysis_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class AnalysisCache:
+    """Content-addressed cache of parsed text and analysis results on disk.
+
+    Entries are keyed by the SHA-256 of the input bytes, a ``kind`` naming
+    what was computed (``"text"``, ``"batch"``, ...) and the ruleset
+    fingerprint, so a changed rule table never serves stale results. Values
+    are stored as JSON files. Reads refresh an entry's mtime, and once the
+    directory outgrows ``max_bytes`` the least recently used entries are
+    deleted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES,
+                 fingerprint: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._fingerprint = fingerprint
+        self._total: Optional[int] = None
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            from contract_parser.ruleset import ruleset_fingerprint
+            self._fingerprint = ruleset_fingerprint()
+        return self._fingerprint
+
+    @staticmethod
+    def content_hash(data: Union[bytes, str]) -> str:
+        if isinstance(data, str):
+            data = data.encode("utf-8", "surrogatepass")
+        return hashlib.sha256(data).hexdigest()
+
+    def key(self, data: Union[bytes, str], kind: str) -> str:
+        """Cache key for the input bytes (or text) and kind of result."""
+        kind_digest = hashlib.sha256(f"{kind}\0{self.fingerprint}".encode("utf-8")).hexdigest()[:16]
+        return f"{self.content_hash(data)}-{kind_digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a JSON-serializable value, evicting old entries if needed."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self.lock:
+            if self._total is None:
+                self._total = self._scan_size()
+            else:
+                self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def get_or_compute(self, data: Union[bytes, str], kind: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for the input, computing and storing it on a miss."""
+        key = self.key(data, kind)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            try:
+                self.put(key, value)
+            except OSError:
+                pass  # a full or read-only disk only costs the cache
+        return value
+
+    def _entries(self):
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".json"):
+                        yield entry
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries down to 90% of max_bytes."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+    def clear(self):
+        with self.lock:
+            for entry in list(self._entries()):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            self._total = 0
+
+
+def text_kind(filename: str) -> str:
+    """Cache kind for the parsed text of a file; the parser depends on the
+    extension and, for PDFs, the configured backend."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".pdf":
+        from contract_parser.parsers import pdf_backend_setting
+        return f"text.pdf:{pdf_backend_setting()}"
+    return "text" + extension
+
+
+_shared = None
+_shared_lock = Lock()
+
+
+def shared_cache() -> Optional[AnalysisCache]:
+    """Process-wide cache, configured by environment variables.
+
+    ``CONTRACT_CACHE_DIR`` (default ``analysis_cache``) and
+    ``CONTRACT_CACHE_MAX_MB`` (default 256); ``CONTRACT_CACHE=off`` disables
+    caching, in which case None is returned.
+    """
+    global _shared
+    if os.environ.get("CONTRACT_CACHE", "").lower() in ("off", "0", "false"):
+        return None
+    with _shared_lock:
+        directory = os.environ.get("CONTRACT_CACHE_DIR", DEFAULT_DIRECTORY)
+        if _shared is None or _shared.directory != directory:
+            max_mb = float(os.environ.get("CONTRACT_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+            _shared = AnalysisCache(directory, int(max_mb * 1024 * 1024))
+        return _shared
@@ -48,6 +48,9 @@ TRANSLATIONS = {
         "overall_risk": "Overall Contract Risk",
         "high_risk_clauses": "High-Risk Clauses",
         "full_text": "Full Text",
+        "ai_summary": "AI Summary",
+        "generate_summary": "✨ Generate summary",
+        "explain_clause": "✨ Explain this clause",
         "issues": "Issues",
         "ambiguities": "Ambiguities Detected",
         "recommendation": "Recommendation",
@@ -158,6 +161,11 @@ TRANSLATIONS = {
         "recent_logs": "Display recent logs",
         "download_logs": "Download Audit Logs",
         "no_logs": "No audit logs yet.",
+        "filter_event_type": "Filter by event type",
+        "audit_page": "Page",
+        "total_errors": "Errors",
+        "error_rate": "Error rate",
+        "daily_activity": "Daily activity",
         
         # Help
         "help_header": "❓ Help & Documentation",
@@ -174,6 +182,25 @@ TRANSLATIONS = {
         "settings": "⚙️ Settings",
         "risk_threshold": "Risk Threshold",
         "language": "Contract Language",
+        "performance": "⏱️ Performance",
+        "resource_load_times": "Model and engine load times (once per process)",
+        "last_rerun": "Last rerun",
+        "avg_rerun": "Average rerun",
+        "reruns": "Reruns",
+        "analysis_stage_times": "Analysis stage times (first computation)",
+        "last_first_token": "LLM first token (last)",
+        "avg_first_token": "LLM first token (avg)",
+        "llm_circuit": "LLM circuit",
+        "llm_error_rate": "LLM error rate",
+        "llm_p95": "LLM p95 latency",
+        "llm_incomplete": "The AI answer was cut off. Click the button again to retry.",
+        "debug_panel": "🐞 Debug: pipeline stages",
+        "stage_breakdown": "Stage breakdown for this contract",
+        "stage_histograms": "All stages since start (per call)",
+        "profiler": "Profiler",
+        "profile_analysis": "Profile a full analysis",
+        "profiling": "Profiling the analysis...",
+        "timing_disabled": "Stage timing is off (CONTRACT_TIMING=off).",
     },
     
     "hindi": {
@@ -223,6 +250,9 @@ TRANSLATIONS = {
         "overall_risk": "समग्र अनुबंध जोखिम",
         "high_risk_clauses": "उच्च जोखिम खंड",
         "full_text": "पूरा पाठ",
+        "ai_summary": "AI सारांश",
+        "generate_summary": "✨ सारांश बनाएं",
+        "explain_clause": "✨ इस खंड को समझाएं",
         "issues": "समस्याएँ",
         "ambiguities": "पहचाना गया अस्पष्टता",
         "recommendation": "सिफारिश",
@@ -333,6 +363,11 @@ TRANSLATIONS = {
         "recent_logs": "हाल के लॉग दिखाएँ",
         "download_logs": "ऑडिट लॉग्स डाउनलोड करें",
         "no_logs": "अभी कोई ऑडिट लॉग नहीं।",
+        "filter_event_type": "इवेंट प्रकार से फ़िल्टर करें",
+        "audit_page": "पृष्ठ",
+        "total_errors": "त्रुटियाँ",
+        "error_rate": "त्रुटि दर",
+        "daily_activity": "दैनिक गतिविधि",
         
         # Help
         "help_header": "❓ सहायता और दस्तावेज़ीकरण",
@@ -349,6 +384,25 @@ TRANSLATIONS = {
         "settings": "⚙️ सेटिंग्स",
         "risk_threshold": "जोखिम थ्रेसहोल्ड",
         "language": "अनुबंध भाषा",
+        "performance": "⏱️ प्रदर्शन",
+        "resource_load_times": "मॉडल और इंजन लोड समय (प्रति प्रक्रिया एक बार)",
+        "last_rerun": "पिछला रीरन",
+        "avg_rerun": "औसत रीरन",
+        "reruns": "रीरन",
+        "analysis_stage_times": "विश्लेषण चरण समय (पहली गणना)",
+        "last_first_token": "LLM पहला टोकन (पिछला)",
+        "avg_first_token": "LLM पहला टोकन (औसत)",
+        "llm_circuit": "LLM सर्किट",
+        "llm_error_rate": "LLM त्रुटि दर",
+        "llm_p95": "LLM p95 विलंब",
+        "llm_incomplete": "AI उत्तर बीच में कट गया। फिर से प्रयास करने के लिए बटन दोबारा दबाएँ।",
+        "debug_panel": "🐞 डिबग: पाइपलाइन चरण",
+        "stage_breakdown": "इस अनुबंध के चरणों का विवरण",
+        "stage_histograms": "शुरुआत से सभी चरण (प्रति कॉल)",
+        "profiler": "प्रोफाइलर",
+        "profile_analysis": "पूरे विश्लेषण को प्रोफाइल करें",
+        "profiling": "विश्लेषण प्रोफाइल हो रहा है...",
+        "timing_disabled": "चरण समय मापन बंद है (CONTRACT_TIMING=off)।",
     }
 }
 
@@ -0,0 +1,260 @@
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# histogram bucket upper bounds in milliseconds; the last bucket is unbounded
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+RECENT_SAMPLES = 1000
+
+# every trace list the current request is collecting into (stage, seconds) pairs
+_traces = ContextVar("stage_traces", default=())  # type: ContextVar[Tuple[list, ...]]
+
+
+class _NoopStage:
+    """What ``stage()`` returns while timing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageHistogram:
+    """Duration histogram of one stage: counts per bucket plus recent samples
+    for percentiles."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, seconds * 1000)] += 1
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict:
+        p50, p95 = np.percentile(np.fromiter(self.recent, dtype=float), [50, 95]) if self.recent else (0.0, 0.0)
+        labels = [f"<={bound}ms" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(float(p50) * 1000, 2),
+            "p95_ms": round(float(p95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "histogram": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class StageTimer:
+    """Process-wide timing of the analysis pipeline stages.
+
+    Stages are timed with ``with timer.stage("parse"):``, the ``@timed``
+    decorator (plain and async functions) or ``timer.iterate`` for the time
+    spent inside a generator. Durations go into one ``StageHistogram`` per
+    stage and into every ``trace()`` active in the current context, which
+    collects the breakdown of one request. Stages may nest; a stage's time
+    includes its children. While ``enabled`` is False, ``stage`` returns a
+    shared no-op context manager and ``timed`` wrappers call straight
+    through, so the instrumentation costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, StageHistogram] = {}
+        self._lock = Lock()
+
+    def stage(self, name: str):
+        return _Stage(self, name) if self.enabled else _NOOP
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = StageHistogram()
+            histogram.add(seconds)
+        for trace in _traces.get():
+            trace.append((name, seconds))
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from ``iterable``, recording the time spent producing its
+        items (not the caller's work between them) as one ``name`` stage."""
+        if not self.enabled:
+            return iter(iterable)
+        return self._iterate(name, iter(iterable))
+
+    def _iterate(self, name: str, iterator: Iterator) -> Iterator:
+        spent = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    spent += time.perf_counter() - start
+                    return
+                spent += time.perf_counter() - start
+                yield item
+        finally:
+            self.record(name, spent)
+
+    @contextmanager
+    def trace(self, into: Optional[List[Tuple[str, float]]] = None):
+        """Collect the (stage, seconds) pairs recorded in this context, e.g.
+        during one request, into a list (new, or ``into``)."""
+        collected = [] if into is None else into
+        active = _traces.get()
+        if any(trace is collected for trace in active):
+            # already collecting into it further up, e.g. a stage that needs another
+            yield collected
+            return
+        token = _traces.set(active + (collected,))
+        try:
+            yield collected
+        finally:
+            _traces.reset(token)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-stage summaries of the histograms, by stage name."""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+
+def summarize_trace(trace: Iterable[Tuple[str, float]]) -> List[Dict]:
+    """Calls and total milliseconds per stage of a trace, in first-seen order."""
+    totals: Dict[str, List] = {}
+    for name, seconds in trace:
+        entry = totals.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+    return [{"stage": name, "calls": calls, "ms": round(seconds * 1000, 2)} for name, (calls, seconds) in totals.items()]
+
+
+# on unless CONTRACT_TIMING=off
+timer = StageTimer(enabled=os.environ.get("CONTRACT_TIMING", "on").lower() not in ("off", "0", "false"))
+
+
+def timed(name: Optional[str] = None, stage_timer: Optional[StageTimer] = None) -> Callable:
+    """Decorator recording every call of a function (or coroutine function)
+    as a stage, named ``name`` or after the function."""
+
+    def decorate(func: Callable) -> Callable:
+        stage_name = name or func.__qualname__
+        owner = stage_timer or timer
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not owner.enabled:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    owner.record(stage_name, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not owner.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                owner.record(stage_name, time.perf_counter() - start)
+        return wrapper
+
+    return decorate
+
+
+def available_profilers() -> List[str]:
+    profilers = ["cProfile"]
+    try:
+        import pyinstrument  # noqa: F401
+        profilers.append("pyinstrument")
+    except ImportError:
+        pass
+    return profilers
+
+
+class ProfileResult:
+    """Report of one ``profile()`` block, filled in when the block exits."""
+
+    def __init__(self, profiler: str):
+        self.profiler = profiler
+        self.text = ""
+        self.seconds = 0.0
+
+
+@contextmanager
+def profile(profiler: str = "cProfile", top: int = 30):
+    """Profile the block with cProfile (``top`` functions by cumulative
+    time) or, if installed, pyinstrument (call tree). Opt-in and meant for
+    one request at a time."""
+    result = ProfileResult(profiler)
+    start = time.perf_counter()
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+        sampler = Profiler()
+        sampler.start()
+        try:
+            yield result
+        finally:
+            sampler.stop()
+            result.seconds = time.perf_counter() - start
+            result.text = sampler.output_text(unicode=True, color=False)
+        return
+    if profiler != "cProfile":
+        raise ValueError(f"Unknown profiler: {profiler} (available: {', '.join(available_profilers())})")
+    tracer = cProfile.Profile()
+    tracer.enable()
+    try:
+        yield result
+    finally:
+        tracer.disable()
+        result.seconds = time.perf_counter() - start
+        out = io.StringIO()
+        pstats.Stats(tracer, stream=out).sort_stats("cumulative").print_stats(top)
+        result.text = out.getvalue()
@@ -8,6 +8,8 @@ from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 
+from utils.profiling import timed
+
 
 class ReportGenerator:
     """Generate comprehensive reports in multiple formats."""
@@ -47,6 +49,7 @@ class ReportGenerator:
         }
 
     @staticmethod
+    @timed("report.markdown")
     def generate_markdown_report(report: Dict) -> str:
         """Convert report to Markdown format."""
         md = "# Contract Analysis Report\n\n"
@@ -79,6 +82,7 @@ class ReportGenerator:
         return md
 
     @staticmethod
+    @timed("report.html")
     def generate_html_report(report: Dict) -> str:
         """Convert report to HTML format."""
         html = """<!DOCTYPE html>
@@ -125,6 +129,7 @@ class ReportGenerator:
         return html
 
     @staticmethod
+    @timed("report.pdf")
     def generate_pdf_report(report: Dict, filename: str = None) -> bytes:
         """Generate PDF report using ReportLab."""
         
@@ -0,0 +1,58 @@
+import time
+from threading import Lock
+from typing import Any, Callable, Dict
+
+
+class ResourceRegistry:
+    """Process-wide registry of expensive shared objects (models, engines).
+
+    Each resource is built lazily by its factory the first time it is asked
+    for, exactly once per process even when several threads (e.g. Streamlit
+    sessions) ask at the same time, and the same instance is returned from
+    then on. Build times are recorded for monitoring.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, Lock] = {}
+        self._lock = Lock()
+        self.build_times: Dict[str, float] = {}
+        self.created_at = time.time()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Declare a resource; re-registering an existing name is a no-op."""
+        with self._lock:
+            if name not in self._factories:
+                self._factories[name] = factory
+                self._locks[name] = Lock()
+
+    def get(self, name: str) -> Any:
+        """The shared instance, built on first use."""
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Unknown resource: {name}")
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = self._factories[name]()
+                self.build_times[name] = time.perf_counter() - start
+        return self._instances[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: str = None):
+        """Drop built instances (all, or one) so they are rebuilt on next use."""
+        with self._lock:
+            names = [name] if name else list(self._instances)
+            for key in names:
+                self._instances.pop(key, None)
+                self.build_times.pop(key, None)
+
+
+# imported modules outlive Streamlit reruns, so this is built once per process
+registry = ResourceRegistry()